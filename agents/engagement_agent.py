@@ -1,7 +1,7 @@
 import pandas as pd
 from crewai import Agent, Task
 from utils.llm import get_llm
-from utils.database import get_candidates, get_jobs, update_candidates
+from utils.database import get_candidates, get_jobs
 
 class EngagementAgent:
     def __init__(self):
@@ -1,7 +1,7 @@
 import pandas as pd
 from crewai import Agent, Task
 from utils.llm import get_llm
-from utils.database import get_candidates, get_jobs, update_candidates
+from utils.database import get_candidates, get_jobs, get_candidate_by_id, get_job_by_id, get_candidates_for_job, update_candidate_fields, patch_candidates
 from datetime import datetime, timedelta
 import random
 
@@ -98,12 +98,9 @@ class SchedulingAgent:
     
     def schedule_interview(self, candidate_id, job_id, slot_date, slot_time):
         """Schedule an interview for a candidate at a specific time"""
-        candidates = get_candidates()
-        jobs = get_jobs()
-        
         # Find the candidate and job by ID
-        candidate = next((c for c in candidates if str(c['id']) == str(candidate_id)), None)
-        job = next((j for j in jobs if str(j['id']) == str(job_id)), None)
+        candidate = get_candidate_by_id(candidate_id)
+        job = get_job_by_id(job_id)
         
         if not candidate:
             return {"error": f"Candidate with ID {candidate_id} not found"}
@@ -137,7 +134,7 @@ class SchedulingAgent:
         
         # Update candidate status
         candidate['status'] = "Interview Scheduled"
-        update_candidates(candidates)
+        update_candidate_fields(candidate['id'], status=candidate['status'])
         
         # Skip using Task to avoid validation errors
         # Generate interview details directly
@@ -267,11 +264,8 @@ I recommend reaching out to the candidate with these options and allowing them t
     
     def schedule_batch_interviews(self, job_id, date):
         """Schedule multiple interviews for a job on a specific date"""
-        candidates = get_candidates()
-        jobs = get_jobs()
-        
         # Find the job by ID
-        job = next((j for j in jobs if str(j['id']) == str(job_id)), None)
+        job = get_job_by_id(job_id)
         
         if not job:
             return {"error": f"Job with ID {job_id} not found"}
@@ -284,10 +278,8 @@ I recommend reaching out to the candidate with these options and allowing them t
         
         # Get candidates in screening stage for this job
         screening_candidates = [
-            c for c in candidates 
-            if c['status'] == 'Screening' 
-            and 'matched_jobs' in c 
-            and str(job_id) in c['matched_jobs'].split(', ')
+            c for c in get_candidates_for_job(job_id)
+            if c['status'] == 'Screening'
         ]
         
         # Sort by score
@@ -307,6 +299,7 @@ I recommend reaching out to the candidate with these options and allowing them t
         
         # Schedule interviews for each candidate
         scheduled_interviews = []
+        changes = {}
         
         for i, candidate in enumerate(top_candidates):
             if i >= len(available_slots):
@@ -317,6 +310,7 @@ I recommend reaching out to the candidate with these options and allowing them t
             
             # Update candidate status
             candidate['status'] = "Interview Scheduled"
+            changes[candidate['id']] = {"status": candidate['status']}
             
             scheduled_interviews.append({
                 "candidate": {
@@ -329,8 +323,8 @@ I recommend reaching out to the candidate with these options and allowing them t
                 "interviewer": slot["interviewer"]
             })
         
-        # Update candidates in the database
-        update_candidates(candidates)
+        # Write back only the scheduled candidates
+        patch_candidates(changes)
         
         return {
             "job": {
@@ -1,9 +1,9 @@
 import pandas as pd
-import re
 from crewai import Agent, Task
 from utils.llm import get_llm
-from utils.embeddings import compare_resume_with_job
-from utils.database import get_candidates, get_jobs, update_candidates
+from utils.embeddings import compare_resume_with_job, score_resumes_for_job
+from utils import records
+from utils.database import get_candidate_by_id, get_job_by_id, get_job_record, get_candidate_records_for_job, update_candidate_fields, patch_candidates, add_match
 
 class ScreeningAgent:
     def __init__(self):
@@ -25,12 +25,9 @@ class ScreeningAgent:
     
     def screen_candidate(self, candidate_id, job_id):
         """Screen a candidate for a specific job"""
-        candidates = get_candidates()
-        jobs = get_jobs()
-        
         # Find the candidate and job by ID
-        candidate = next((c for c in candidates if str(c['id']) == str(candidate_id)), None)
-        job = next((j for j in jobs if str(j['id']) == str(job_id)), None)
+        candidate = get_candidate_by_id(candidate_id)
+        job = get_job_by_id(job_id)
         
         if not candidate:
             return {"error": f"Candidate with ID {candidate_id} not found"}
@@ -94,14 +91,15 @@ class ScreeningAgent:
         # Update score based on comparison (in a real implementation, parse the agent's result)
         candidate['score'] = max(comparison_result['score'], float(candidate.get('score', 0)))
         
-        # Add job to matched_jobs if not already there
-        if 'matched_jobs' not in candidate or not candidate['matched_jobs']:
-            candidate['matched_jobs'] = str(job_id)
-        elif str(job_id) not in candidate['matched_jobs'].split(', '):
-            candidate['matched_jobs'] = f"{candidate['matched_jobs']}, {job_id}"
+        # Write back only the fields that changed
+        update_candidate_fields(
+            candidate['id'],
+            status=candidate['status'],
+            score=candidate['score']
+        )
         
-        # Update candidates in the database
-        update_candidates(candidates)
+        # Record the match with this job (or refresh its score)
+        add_match(candidate['id'], job_id, comparison_result['score'])
         
         return {
             "candidate": {
@@ -122,97 +120,54 @@ class ScreeningAgent:
     
     def batch_screen_candidates(self, job_id):
         """Screen multiple candidates for a specific job"""
-        candidates = get_candidates()
-        jobs = get_jobs()
-        
         # Find the job by ID
-        job = next((j for j in jobs if str(j['id']) == str(job_id)), None)
+        job = get_job_by_id(job_id)
         
         if not job:
             return {"error": f"Job with ID {job_id} not found"}
         
+        job_record = get_job_record(job_id)
+        
         # Get candidates that match this job
-        matching_candidates = [c for c in candidates if 'matched_jobs' in c and str(job_id) in c['matched_jobs'].split(', ')]
+        matching_candidates = get_candidate_records_for_job(job_id)
         
         # Sort by preliminary score
-        matching_candidates.sort(key=lambda x: float(x.get('score', 0)), reverse=True)
+        matching_candidates.sort(key=lambda x: x.score, reverse=True)
         
         # Take top 10 for detailed screening
         top_candidates = matching_candidates[:10]
         
+        # Resume similarity of every candidate to the job, in one pass
+        resume_scores = score_resumes_for_job(job)
+        
         results = []
+        changes = {}
         for candidate in top_candidates:
             # Skip the Task to avoid validation errors
             # For simulation purposes, calculate a score directly
             # In a real implementation, we would parse the agent's response
-            required_skills = set(job['skills_required'].lower().replace(',', '').split())
-            candidate_skills = set(candidate['skills'].lower().replace(',', '').split())
-            
-            skill_match = len(required_skills.intersection(candidate_skills)) / len(required_skills) if required_skills else 0
-            
-            # Parse candidate experience with better handling
-            candidate_exp_str = str(candidate['years_experience'])
-            candidate_exp = 0
-            if candidate_exp_str.isdigit():
-                candidate_exp = int(candidate_exp_str)
-            else:
-                # Extract digits from strings like "5 years"
-                exp_digits = re.findall(r'\d+', candidate_exp_str)
-                if exp_digits:
-                    candidate_exp = int(exp_digits[0])
-                else:
-                    candidate_exp = 1  # Default if no number found
-            
-            # Parse job experience requirement with better handling
-            exp_required = str(job['experience_required'])
-            min_exp = 0
-            max_exp = 10  # Default max if not specified
-            
-            # Check if it's a range like "3-5"
-            if '-' in exp_required:
-                req_exp_range = exp_required.split('-')
-                # Extract digits from each part
-                min_digits = re.findall(r'\d+', req_exp_range[0])
-                min_exp = int(min_digits[0]) if min_digits else 0
-                
-                max_digits = re.findall(r'\d+', req_exp_range[1])
-                max_exp = int(max_digits[0]) if max_digits else 10
-            else:
-                # Single value like "5 years"
-                exp_digits = re.findall(r'\d+', exp_required)
-                if exp_digits:
-                    min_exp = int(exp_digits[0])
-                    max_exp = min_exp + 2  # Assume a reasonable range
-            
-            # Calculate match
-            if candidate_exp < min_exp:
-                exp_match = 0.5 * (candidate_exp / min_exp) if min_exp > 0 else 0.5
-            elif candidate_exp > max_exp:
-                exp_match = 0.8  # Overqualified but still good
-            else:
-                exp_match = 1.0  # Perfect match
+            skill_match = records.skill_match(candidate, job_record)
+            exp_match = records.experience_match(candidate, job_record)
             
             score = (skill_match * 0.7) + (exp_match * 0.3)
             score = round(score, 2)
             
-            # Update candidate score
-            candidate['score'] = max(score, float(candidate.get('score', 0)))
-            
-            # Update status to "Screening"
-            candidate['status'] = "Screening"
+            # Update candidate score and status to "Screening"
+            changes[candidate.id] = {"score": max(score, candidate.score), "status": "Screening"}
             
             # Collect results
             results.append({
-                "id": candidate['id'],
-                "name": candidate['name'],
-                "current_role": candidate['current_role'],
+                "id": candidate.id,
+                "name": candidate.name,
+                "current_role": candidate.current_role,
                 "score": score,
                 "skill_match": skill_match,
-                "exp_match": exp_match
+                "exp_match": exp_match,
+                "resume_match": round(resume_scores.get(str(candidate.id), 0.0), 2)
             })
         
-        # Update candidates in the database
-        update_candidates(candidates)
+        # Write back only the screened candidates
+        patch_candidates(changes)
         
         return {
             "job": {
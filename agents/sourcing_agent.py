@@ -1,8 +1,8 @@
 import pandas as pd
-import re
 from crewai import Agent, Task
 from utils.llm import get_llm
-from utils.database import get_candidates, get_jobs, update_candidates
+from utils.database import get_jobs, get_job_by_id, get_job_record, get_candidate_records, record_match_results, top_candidates
+from utils.records import fit_score
 
 class SourcingAgent:
     def __init__(self):
@@ -24,13 +24,11 @@ class SourcingAgent:
     
     def search_candidates(self, job_id):
         """Search for candidates matching a specific job"""
-        candidates = get_candidates()
-        jobs = get_jobs()
-        
-        # Find the job by ID
-        job = next((j for j in jobs if str(j['id']) == str(job_id)), None)
+        # Typed records carry parsed experience and tokenized skills
+        job = get_job_by_id(job_id)
+        job_record = get_job_record(job_id)
         
-        if not job:
+        if not job or not job_record:
             return {"error": f"Job with ID {job_id} not found"}
         
         # Skip using CrewAI Task to avoid validation errors
@@ -46,87 +44,41 @@ class SourcingAgent:
         # For now, we'll simulate this with a direct calculation
         
         matched_candidates = []
-        for candidate in candidates:
+        changes = {}
+        new_matches = []
+        # Open jobs have every candidate's fit already scored; others are scored here
+        stored_scores = dict(top_candidates(job_id, None))
+        for candidate in get_candidate_records():
             # Simple matching logic (would be more sophisticated in real implementation)
-            required_skills = set(job['skills_required'].lower().replace(',', '').split())
-            candidate_skills = set(candidate['skills'].lower().replace(',', '').split())
-            
-            # Calculate overlap in skills
-            skill_match = len(required_skills.intersection(candidate_skills)) / len(required_skills) if required_skills else 0
-            
-            # Extract years of experience with better parsing
-            # Parse candidate experience - handle different formats
-            candidate_exp_str = str(candidate['years_experience'])
-            candidate_exp = 0
-            if candidate_exp_str.isdigit():
-                candidate_exp = int(candidate_exp_str)
-            else:
-                # Extract digits from strings like "5 years"
-                exp_digits = re.findall(r'\d+', candidate_exp_str)
-                if exp_digits:
-                    candidate_exp = int(exp_digits[0])
-                else:
-                    candidate_exp = 1  # Default if no number found
-            
-            # Parse job experience requirement - handle different formats
-            exp_required = str(job['experience_required'])
-            min_exp = 0
-            max_exp = 10  # Default max if not specified
-            
-            # Check if it's a range like "3-5"
-            if '-' in exp_required:
-                req_exp_range = exp_required.split('-')
-                # Extract digits from each part
-                min_digits = re.findall(r'\d+', req_exp_range[0])
-                min_exp = int(min_digits[0]) if min_digits else 0
-                
-                max_digits = re.findall(r'\d+', req_exp_range[1])
-                max_exp = int(max_digits[0]) if max_digits else 10
-            else:
-                # Single value like "5 years"
-                exp_digits = re.findall(r'\d+', exp_required)
-                if exp_digits:
-                    min_exp = int(exp_digits[0])
-                    max_exp = min_exp + 2  # Assume a reasonable range
-            
-            # Calculate experience match
-            if candidate_exp < min_exp:
-                exp_match = 0.5 * (candidate_exp / min_exp) if min_exp > 0 else 0.5
-            elif candidate_exp > max_exp:
-                exp_match = 0.8  # Overqualified but still good
-            else:
-                exp_match = 1.0  # Perfect match
-            
-            # Calculate overall score
-            score = (skill_match * 0.7) + (exp_match * 0.3)
-            score = round(score, 2)
+            score = stored_scores.get(str(candidate.id))
+            if score is None:
+                score = fit_score(candidate, job_record)
             
-            # Update matched_jobs field for candidate if score is good
+            # Record a match with this job if score is good
             if score > 0.6:
-                if 'matched_jobs' not in candidate or not candidate['matched_jobs']:
-                    candidate['matched_jobs'] = str(job_id)
-                elif str(job_id) not in candidate['matched_jobs'].split(', '):
-                    candidate['matched_jobs'] = f"{candidate['matched_jobs']}, {job_id}"
+                new_matches.append((candidate.id, job_id, score))
             
-            # Update score
-            candidate['score'] = max(score, float(candidate.get('score', 0)))
+            # Remember only the candidates whose score actually changed
+            new_score = max(score, candidate.score)
+            if new_score != candidate.score:
+                changes[candidate.id] = {'score': new_score}
             
             # Add to matched candidates if score is good enough
             if score > 0.65:
                 matched_candidates.append({
-                    "id": candidate['id'],
-                    "name": candidate['name'],
-                    "current_role": candidate['current_role'],
-                    "skills": candidate['skills'],
-                    "years_experience": candidate['years_experience'],
+                    "id": candidate.id,
+                    "name": candidate.name,
+                    "current_role": candidate.current_role,
+                    "skills": candidate.skills,
+                    "years_experience": candidate.years_experience,
                     "score": score
                 })
         
         # Sort by score
         matched_candidates.sort(key=lambda x: x['score'], reverse=True)
         
-        # Update candidates in the database
-        update_candidates(candidates)
+        # Write back only the changed candidates and the new matches, together
+        record_match_results(new_matches, changes)
         
         return {
             "job": job,
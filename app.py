@@ -1,10 +1,11 @@
 import streamlit as st
 import pandas as pd
-from utils.database import setup_database, get_candidates, get_jobs
+from utils.database import setup_database, get_candidates_snapshot, get_jobs_snapshot
 from agents.sourcing_agent import SourcingAgent
 from agents.screening_agent import ScreeningAgent
 from agents.engagement_agent import EngagementAgent
 from agents.scheduling_agent import SchedulingAgent
+from utils.embeddings import warm_up_embedding_model
 
 # Set page configuration
 st.set_page_config(
@@ -18,8 +19,11 @@ st.set_page_config(
 if 'initialized' not in st.session_state:
     # Setup database and load initial data
     setup_database()
-    st.session_state.candidates = get_candidates()
-    st.session_state.jobs = get_jobs()
+    st.session_state.candidates = get_candidates_snapshot()
+    st.session_state.jobs = get_jobs_snapshot()
+
+    # Load the embedding model in the background so startup does not wait on Ollama
+    warm_up_embedding_model()
     
     # Initialize agents
     st.session_state.sourcing_agent = SourcingAgent()
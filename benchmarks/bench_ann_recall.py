@@ -0,0 +1,84 @@
+"""Recall vs. latency of the FAISS candidate index against exact top-k search.
+
+Embeddings are synthetic: points scattered around ``--clusters`` random
+centres, which is closer to real text embeddings than uniform noise. The
+exact answer comes from EmbeddingMatrix. Each index type is built once and
+searched with a range of HNSW efSearch / IVF nprobe settings; recall@k is
+the share of the exact top-k the index returned.
+
+Usage:
+    python benchmarks/bench_ann_recall.py [--size 200000] [--dim 768] [--k 10] [--queries 200]
+"""
+import os
+import sys
+import time
+import argparse
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.embeddings import EmbeddingMatrix
+from utils.candidate_index import CandidateIndex
+
+def clustered_embeddings(count, dim, clusters, seed):
+    """float32 points around random centres, generated in chunks to bound peak memory"""
+    rng = np.random.default_rng(seed)
+    centres = rng.standard_normal((clusters, dim), dtype=np.float32)
+    matrix = np.empty((count, dim), dtype=np.float32)
+    for start in range(0, count, 100000):
+        end = min(count, start + 100000)
+        assigned = rng.integers(0, clusters, end - start)
+        matrix[start:end] = centres[assigned] + 0.8 * rng.standard_normal((end - start, dim), dtype=np.float32)
+    return matrix
+
+def measure(search, queries, truth, k):
+    """Mean recall@k and milliseconds per query"""
+    hits = 0
+    start = time.perf_counter()
+    results = [search(query) for query in queries]
+    elapsed = time.perf_counter() - start
+    for result, expected in zip(results, truth):
+        hits += len({candidate_id for candidate_id, _ in result} & expected)
+    return hits / (k * len(queries)), elapsed / len(queries) * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--size', type=int, default=200000)
+    parser.add_argument('--dim', type=int, default=768)
+    parser.add_argument('--k', type=int, default=10)
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--clusters', type=int, default=1000)
+    args = parser.parse_args()
+
+    data = clustered_embeddings(args.size + args.queries, args.dim, args.clusters, seed=1)
+    matrix, queries = data[:args.size], data[args.size:]
+    ids = [str(i) for i in range(args.size)]
+    items = [(candidate_id, matrix[row], '') for row, candidate_id in enumerate(ids)]
+
+    exact = EmbeddingMatrix.from_arrays(ids, matrix)
+    truth = [{candidate_id for candidate_id, _ in exact.top_k(query, args.k)} for query in queries]
+    _, exact_ms = measure(lambda query: exact.top_k(query, args.k), queries, truth, args.k)
+
+    print(f"candidates={args.size} dim={args.dim} k={args.k} queries={args.queries}")
+    print(f"{'index':<8} {'setting':<12} {'build (s)':>10} {'recall@k':>9} {'ms/query':>9} {'speedup':>8}")
+    print(f"{'exact':<8} {'numpy':<12} {'-':>10} {1.0:>9.3f} {exact_ms:>9.2f} {1.0:>7.1f}x")
+
+    settings = {
+        'flat': [('', {})],
+        'hnsw': [(f"efSearch={ef}", {'ef_search': ef}) for ef in (16, 32, 64, 128, 256)],
+        'ivf': [(f"nprobe={nprobe}", {'nprobe': nprobe}) for nprobe in (1, 4, 16, 64)],
+    }
+    for kind, options in settings.items():
+        index = CandidateIndex()
+        start = time.perf_counter()
+        index.build(items, kind=kind)
+        build = time.perf_counter() - start
+        for label, params in options:
+            for name, value in params.items():
+                setattr(index, name, value)
+            recall, ms = measure(lambda query: index.top_k(query, args.k), queries, truth, args.k)
+            print(f"{kind:<8} {label:<12} {build:>10.1f} {recall:>9.3f} {ms:>9.2f} {exact_ms / ms:>7.1f}x")
+        del index
+
+if __name__ == '__main__':
+    main()
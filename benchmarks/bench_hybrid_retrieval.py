@@ -0,0 +1,86 @@
+"""Latency of hybrid (BM25 + dense, reciprocal rank fusion) candidate retrieval.
+
+Candidates are synthetic: skill and summary words drawn from a Zipf-like
+vocabulary, and clustered random embeddings searched through the FAISS
+CandidateIndex (IVF at 1M). Queries look like job postings: a few skills
+plus common requirement words. Reports build times, then per-query latency
+of BM25 alone, dense alone and the full hybrid_top_k call.
+
+Usage:
+    python benchmarks/bench_hybrid_retrieval.py [--size 1000000] [--dim 128] [--k 20] [--queries 50]
+"""
+import os
+import sys
+import time
+import argparse
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.bm25_index import BM25Index
+from utils.candidate_index import CandidateIndex
+from utils.embeddings import hybrid_top_k
+
+def synthetic_candidates(count, vocabulary, rng):
+    """Candidate rows with ~8 skills and a ~30-word summary each"""
+    weights = 1.0 / np.arange(1, vocabulary + 1)
+    weights /= weights.sum()
+    skills = rng.choice(vocabulary, size=(count, 8), p=weights)
+    summary = rng.choice(vocabulary, size=(count, 30), p=weights)
+    for row in range(count):
+        yield {
+            'id': row,
+            'skills': ', '.join(f"skill{term}" for term in skills[row]),
+            'resume_summary': ' '.join(f"word{term}" for term in summary[row]),
+        }
+
+def per_query(function, queries):
+    start = time.perf_counter()
+    for query in queries:
+        function(query)
+    return (time.perf_counter() - start) / len(queries) * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--size', type=int, default=1000000)
+    parser.add_argument('--dim', type=int, default=128)
+    parser.add_argument('--k', type=int, default=20)
+    parser.add_argument('--queries', type=int, default=50)
+    parser.add_argument('--vocabulary', type=int, default=50000)
+    args = parser.parse_args()
+    rng = np.random.default_rng(0)
+
+    start = time.perf_counter()
+    keyword_index = BM25Index()
+    batch = []
+    for candidate in synthetic_candidates(args.size, args.vocabulary, rng):
+        batch.append(candidate)
+        if len(batch) == 100000:
+            keyword_index.update(batch)
+            batch = []
+    keyword_index.update(batch)
+    bm25_build = time.perf_counter() - start
+
+    centres = rng.standard_normal((1000, args.dim), dtype=np.float32)
+    vectors = centres[rng.integers(0, 1000, args.size)] + rng.standard_normal((args.size, args.dim), dtype=np.float32)
+    start = time.perf_counter()
+    dense_index = CandidateIndex()
+    dense_index.build([(str(row), vectors[row], '') for row in range(args.size)])
+    dense_build = time.perf_counter() - start
+
+    texts = [
+        ' '.join(f"skill{term}" for term in rng.integers(0, 2000, 6)) + ' ' + ' '.join(f"word{term}" for term in rng.integers(0, 200, 10))
+        for _ in range(args.queries)
+    ]
+    embeddings = centres[rng.integers(0, 1000, args.queries)] + rng.standard_normal((args.queries, args.dim), dtype=np.float32)
+    pairs = list(zip(texts, embeddings))
+    pool = max(100, 5 * args.k)
+
+    print(f"candidates={args.size} dim={args.dim} k={args.k} queries={args.queries} dense index={dense_index.kind}")
+    print(f"build: bm25 {bm25_build:.1f}s, dense {dense_build:.1f}s")
+    print(f"bm25 top-{pool}:   {per_query(lambda text: keyword_index.top_k(text, pool), texts):8.2f} ms/query")
+    print(f"dense top-{pool}:  {per_query(lambda vector: dense_index.top_k(vector, pool), embeddings):8.2f} ms/query")
+    print(f"hybrid top-{args.k}:  {per_query(lambda pair: hybrid_top_k(pair[0], pair[1], dense_index, keyword_index, args.k), pairs):8.2f} ms/query")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+"""Accuracy and memory of float16 / int8 EmbeddingMatrix storage against float32.
+
+Embeddings are synthetic, scattered around random centres like text
+embeddings cluster by topic. For each storage mode the report shows the
+memory held by the vectors, the largest similarity error, recall@k of
+``top_k``, and how often the matching functions' output would change: the
+share of threshold hits that differ and of hit scores that round (to two
+decimals, as find_matching_candidates_for_job reports them) differently.
+
+Usage:
+    python benchmarks/bench_quantized_accuracy.py [--size 200000] [--dim 768] [--k 10] [--queries 100] [--threshold 0.6]
+"""
+import os
+import sys
+import time
+import argparse
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.embeddings import EmbeddingMatrix, STORAGE_TYPES
+
+def clustered_embeddings(count, dim, clusters, seed):
+    """float32 points around random centres, generated in chunks to bound peak memory"""
+    rng = np.random.default_rng(seed)
+    centres = rng.standard_normal((clusters, dim), dtype=np.float32)
+    matrix = np.empty((count, dim), dtype=np.float32)
+    for start in range(0, count, 100000):
+        end = min(count, start + 100000)
+        assigned = rng.integers(0, clusters, end - start)
+        matrix[start:end] = centres[assigned] + rng.standard_normal((end - start, dim), dtype=np.float32)
+    return matrix
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--size', type=int, default=200000)
+    parser.add_argument('--dim', type=int, default=768)
+    parser.add_argument('--k', type=int, default=10)
+    parser.add_argument('--queries', type=int, default=100)
+    parser.add_argument('--threshold', type=float, default=0.6)
+    parser.add_argument('--clusters', type=int, default=1000)
+    args = parser.parse_args()
+
+    data = clustered_embeddings(args.size + args.queries, args.dim, args.clusters, seed=1)
+    ids = list(range(args.size))
+    queries = data[args.size:]
+
+    reference = EmbeddingMatrix.from_arrays(ids, data[:args.size], storage='float32')
+    ref_scores = [reference.similarities(query) for query in queries]
+    ref_top = [{key for key, _ in reference.top_k(query, args.k)} for query in queries]
+    ref_hits = [dict(reference.top_k(query, None, args.threshold)) for query in queries]
+
+    print(f"candidates={args.size} dim={args.dim} k={args.k} queries={args.queries} threshold={args.threshold}")
+    print(f"{'storage':<8} {'MB':>8} {'ms/query':>9} {'max error':>10} {'recall@k':>9} {'hits changed':>13} {'score changed':>14}")
+
+    for storage in STORAGE_TYPES:
+        matrix = EmbeddingMatrix.from_arrays(ids, data[:args.size], storage=storage)
+        start = time.perf_counter()
+        scores = [matrix.similarities(query) for query in queries]
+        elapsed = (time.perf_counter() - start) / len(queries)
+
+        max_error = max(float(np.abs(s - r).max()) for s, r in zip(scores, ref_scores))
+        found = sum(len({key for key, _ in matrix.top_k(query, args.k)} & expected) for query, expected in zip(queries, ref_top))
+        changed_hits = changed_scores = total_hits = 0
+        for query, expected in zip(queries, ref_hits):
+            hits = dict(matrix.top_k(query, None, args.threshold))
+            total_hits += len(expected)
+            changed_hits += len(hits.keys() ^ expected.keys())
+            changed_scores += sum(round(hits[key], 2) != round(score, 2) for key, score in expected.items() if key in hits)
+
+        print(
+            f"{storage:<8} {matrix.nbytes / 2**20:>8.1f} {elapsed * 1000:>9.2f} {max_error:>10.5f} "
+            f"{found / (args.k * len(queries)):>9.4f} {changed_hits / max(1, total_hits):>12.4%} "
+            f"{changed_scores / max(1, total_hits):>13.4%}"
+        )
+        del matrix
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+"""Benchmark of candidate matching: per-candidate loop vs. EmbeddingMatrix top-k.
+
+Uses random embeddings, so no model is needed. The loop version is the
+previous find_matching_candidates_for_job inner loop (one cosine_similarity
+call per candidate, then a linear scan for each hit). It is timed on at most
+``--legacy-limit`` candidates and extrapolated linearly beyond that.
+
+Usage:
+    python benchmarks/bench_topk.py [--sizes 10000 100000 1000000] [--dim 768] [--k 10] [--queries 20]
+
+1M x 768 float32 embeddings take about 3 GB; pass a smaller --dim on small machines.
+"""
+import os
+import sys
+import time
+import argparse
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sklearn.metrics.pairwise import cosine_similarity
+from utils.embeddings import EmbeddingMatrix
+
+def legacy_match(job_embedding, candidate_embeddings, candidates, threshold):
+    """The previous matching loop"""
+    job_embedding = job_embedding.reshape(1, -1)
+    matches = []
+    for candidate_id, candidate_embedding in candidate_embeddings.items():
+        candidate_embedding = candidate_embedding.reshape(1, -1)
+        similarity = cosine_similarity(job_embedding, candidate_embedding)[0][0]
+        if similarity >= threshold:
+            candidate = next((c for c in candidates if str(c['id']) == str(candidate_id)), None)
+            if candidate:
+                matches.append({"candidate_id": candidate_id, "score": round(similarity, 2)})
+    matches.sort(key=lambda x: x['score'], reverse=True)
+    return matches
+
+def random_embeddings(count, dim, seed):
+    """Random float32 embeddings, generated in chunks to bound peak memory"""
+    rng = np.random.default_rng(seed)
+    matrix = np.empty((count, dim), dtype=np.float32)
+    for start in range(0, count, 100000):
+        end = min(count, start + 100000)
+        matrix[start:end] = rng.standard_normal((end - start, dim), dtype=np.float32)
+    return matrix
+
+def time_call(function, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return (time.perf_counter() - start) / repeat
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000, 1000000])
+    parser.add_argument('--dim', type=int, default=768)
+    parser.add_argument('--k', type=int, default=10)
+    parser.add_argument('--queries', type=int, default=20)
+    parser.add_argument('--threshold', type=float, default=0.6)
+    parser.add_argument('--legacy-limit', type=int, default=10000)
+    args = parser.parse_args()
+
+    print(f"dim={args.dim} k={args.k} queries={args.queries}")
+    print(f"{'candidates':>10} {'build (s)':>10} {'top-k (ms)':>11} {'loop (ms)':>12} {'speedup':>9}")
+
+    for size in args.sizes:
+        matrix = random_embeddings(size, args.dim, seed=size)
+        queries = random_embeddings(args.queries, args.dim, seed=0)
+        ids = list(range(size))
+
+        start = time.perf_counter()
+        index = EmbeddingMatrix.from_arrays(ids, matrix)
+        build = time.perf_counter() - start
+
+        query_iter = iter(queries)
+        fast = time_call(lambda: index.top_k(next(query_iter), args.k), args.queries)
+
+        # The loop version is far slower; time it on a slice and scale up
+        legacy_size = min(size, args.legacy_limit)
+        legacy_embeddings = {i: matrix[i] for i in range(legacy_size)}
+        legacy_candidates = [{'id': i} for i in range(legacy_size)]
+        slow = time_call(lambda: legacy_match(queries[0], legacy_embeddings, legacy_candidates, args.threshold), 1)
+        slow *= size / legacy_size
+        estimated = '*' if legacy_size < size else ' '
+
+        print(f"{size:>10} {build:>10.2f} {fast * 1000:>11.2f} {slow * 1000:>11.0f}{estimated} {slow / fast:>8.0f}x")
+        del index, matrix
+
+    print("* extrapolated from --legacy-limit candidates")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,240 @@
+"""Stress test for concurrent writes to the talent database.
+
+Runs several worker processes with several threads each against a scratch
+copy of ``data/``. Every thread owns a disjoint slice of candidate rows and
+repeatedly patches them, updates single fields, records matches and adds new
+candidates, while the others do the same. Afterwards the files are re-read
+from scratch and checked for lost updates, duplicate ids and leftover
+temporary files. Finally the candidates are re-imported from a file whose
+matched_jobs column points every row at one job, and the match relation is
+checked against that column, including after the files are re-read with
+only single ids and blanks in that column (which pandas would read as
+floats).
+
+``update_candidates`` is left out on purpose: it replaces the whole table
+with the caller's copy, so concurrent callers overwrite each other by design.
+
+Usage:
+    python benchmarks/stress_concurrent_writes.py [--backend csv|sqlite] [--processes 4] [--threads 4] [--rounds 25]
+"""
+import os
+import sys
+import glob
+import time
+import shutil
+import argparse
+import tempfile
+import threading
+import multiprocessing
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def worker_rows(candidate_ids, worker, workers):
+    """The candidate ids a worker is allowed to touch"""
+    return [candidate_id for position, candidate_id in enumerate(candidate_ids) if position % workers == worker]
+
+def run_thread(db, worker, rows, rounds, job_ids, errors):
+    """Patch, update, match and insert rows owned by one worker"""
+    try:
+        for round_number in range(rounds):
+            # Row-level patches
+            db.patch_candidates({
+                candidate_id: {'status': f"w{worker}-r{round_number}", 'score': round_number / rounds}
+                for candidate_id in rows
+            })
+
+            # Single-field updates
+            for candidate_id in rows:
+                db.update_candidate_fields(candidate_id, location=f"w{worker}-r{round_number}")
+
+            # Matches all land in the shared match relation
+            for candidate_id in rows:
+                db.add_match(candidate_id, job_ids[round_number % len(job_ids)], round_number / rounds)
+
+            # New candidate with a name that identifies the writer
+            success, _ = db.add_custom_candidate({'name': f"stress-w{worker}-r{round_number}", 'email': f"w{worker}r{round_number}@example.com"})
+            if not success:
+                errors.append(f"worker {worker}: insert failed in round {round_number}")
+    except Exception as e:
+        errors.append(f"worker {worker}: {e!r}")
+
+def run_process(workdir, backend_name, process_index, threads, workers, candidate_ids, job_ids, rounds, queue):
+    """Entry point of one worker process"""
+    db = open_database(workdir, backend_name)
+
+    errors = []
+    pool = []
+    for thread_index in range(threads):
+        worker = process_index * threads + thread_index
+        rows = {str(candidate_id) for candidate_id in worker_rows(candidate_ids, worker, workers)}
+        thread = threading.Thread(target=run_thread, args=(db, worker, rows, rounds, job_ids, errors))
+        thread.start()
+        pool.append(thread)
+    for thread in pool:
+        thread.join()
+    queue.put(errors)
+
+def open_database(workdir, backend_name):
+    """Import the database module against the scratch copy"""
+    os.chdir(workdir)
+    os.environ['TALENT_DB_BACKEND'] = backend_name
+    sys.path.insert(0, REPO_ROOT)
+    from utils import database as db
+    return db
+
+def verify(db, candidate_ids, job_ids, workers, rounds):
+    """Re-read everything from disk and return a list of problems"""
+    problems = []
+    candidates = db.get_candidates()
+    by_id = {}
+    for candidate in candidates:
+        if str(candidate['id']) in by_id:
+            problems.append(f"duplicate id {candidate['id']}")
+        by_id[str(candidate['id'])] = candidate
+
+    last_round = rounds - 1
+    for worker in range(workers):
+        for candidate_id in worker_rows(candidate_ids, worker, workers):
+            candidate = by_id.get(str(candidate_id))
+            if candidate is None:
+                problems.append(f"candidate {candidate_id} disappeared")
+                continue
+            expected = f"w{worker}-r{last_round}"
+            for field in ('status', 'location'):
+                if candidate[field] != expected:
+                    problems.append(f"candidate {candidate_id}: {field} is {candidate[field]!r}, expected {expected!r}")
+
+            matched = {str(match['job_id']) for match in db.get_matches_for_candidate(candidate_id)}
+            expected_jobs = {str(job_ids[round_number % len(job_ids)]) for round_number in range(rounds)}
+            if not expected_jobs <= matched:
+                problems.append(f"candidate {candidate_id}: matches {sorted(expected_jobs - matched)} were lost")
+
+    names = {candidate['name'] for candidate in candidates}
+    for worker in range(workers):
+        for round_number in range(rounds):
+            if f"stress-w{worker}-r{round_number}" not in names:
+                problems.append(f"insert from worker {worker} round {round_number} is missing")
+
+    leftovers = glob.glob(os.path.join('data', '**', '*.tmp'), recursive=True)
+    if leftovers:
+        problems.append(f"temporary files left behind: {leftovers}")
+    return problems
+
+def verify_import(db, workdir, job_ids):
+    """Import candidates that all match one job and check the match relation follows; returns problems"""
+    import pandas as pd
+    problems = []
+    job_id = str(job_ids[-1])
+    path = os.path.join(workdir, 'import.csv')
+    candidates = pd.DataFrame(db.get_candidates())
+    candidates['matched_jobs'] = job_id
+    candidates.to_csv(path, index=False)
+    if not db.import_table_file('candidates', path):
+        return ["import_table_file failed"]
+
+    for candidate in db.get_candidates():
+        expected = db.split_ids(candidate['matched_jobs'])
+        matched = [str(job['id']) for job in db.get_jobs_for_candidate(candidate['id'])]
+        if expected != [job_id] or matched != expected:
+            problems.append(f"candidate {candidate['id']}: matched_jobs {candidate['matched_jobs']!r}, relation {matched}")
+    matched_ids = {str(candidate['id']) for candidate in db.get_candidates_for_job(job_id)}
+    if len(matched_ids) != len(candidates):
+        problems.append(f"job {job_id} has {len(matched_ids)} matches after the import, expected {len(candidates)}")
+    for other in job_ids[:-1]:
+        if db.get_matches_for_job(other):
+            problems.append(f"job {other} kept matches the import removed")
+    return problems
+
+def verify_single_id_column(db, workdir, job_id):
+    """Re-read a matched_jobs column holding only single ids and blanks from disk; returns problems"""
+    import pandas as pd
+    problems = []
+    job_id = str(job_id)
+    path = os.path.join(workdir, 'single_ids.csv')
+    candidates = pd.DataFrame(db.get_candidates())
+    candidates['matched_jobs'] = [job_id if position % 2 == 0 else '' for position in range(len(candidates))]
+    candidates.to_csv(path, index=False)
+    if not db.import_table_file('candidates', path):
+        return ["import_table_file failed"]
+    expected = {str(candidate_id) for candidate_id, matched in zip(candidates['id'], candidates['matched_jobs']) if matched}
+
+    # Start over from the CSV itself (no Arrow snapshot); the match relation is then seeded from matched_jobs
+    if isinstance(db.backend, db.CsvBackend):
+        os.remove(db.MATCHES_FILE)
+        shutil.rmtree(db.SNAPSHOT_DIR, ignore_errors=True)
+    db.set_backend(db.create_backend())
+
+    for candidate in db.get_candidates():
+        if str(candidate['id']) in expected and candidate['matched_jobs'] != job_id:
+            problems.append(f"candidate {candidate['id']}: matched_jobs read back as {candidate['matched_jobs']!r}")
+    matched = {str(candidate['id']) for candidate in db.get_candidates_for_job(job_id)}
+    if matched != expected:
+        problems.append(f"job {job_id}: get_candidates_for_job has {len(matched)} candidates, expected {len(expected)}")
+    page, total = db.query_candidates(job_id=job_id, limit=None)
+    if total != len(expected):
+        problems.append(f"job {job_id}: query_candidates found {total} candidates, expected {len(expected)}")
+    return problems
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--backend', default='csv', choices=['csv', 'sqlite'])
+    parser.add_argument('--processes', type=int, default=4)
+    parser.add_argument('--threads', type=int, default=4)
+    parser.add_argument('--rounds', type=int, default=25)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='talent-stress-')
+    shutil.copytree(os.path.join(REPO_ROOT, 'data'), os.path.join(workdir, 'data'))
+    for generated in ('talent.db', 'talent.db-wal', 'talent.db-shm', 'snapshots'):
+        path = os.path.join(workdir, 'data', generated)
+        if os.path.isdir(path):
+            shutil.rmtree(path)
+        elif os.path.exists(path):
+            os.remove(path)
+
+    import pandas as pd
+    candidate_ids = [str(candidate_id) for candidate_id in pd.read_csv(os.path.join(workdir, 'data', 'candidates.csv'))['id']]
+    job_ids = [str(job_id) for job_id in pd.read_csv(os.path.join(workdir, 'data', 'jobs.csv'))['id']]
+    workers = args.processes * args.threads
+
+    # Migrates the CSV data when running against SQLite
+    db = open_database(workdir, args.backend)
+    db.setup_database()
+
+    ctx = multiprocessing.get_context('spawn')
+    queue = ctx.Queue()
+    processes = [
+        ctx.Process(
+            target=run_process,
+            args=(workdir, args.backend, index, args.threads, workers, candidate_ids, job_ids, args.rounds, queue)
+        )
+        for index in range(args.processes)
+    ]
+
+    start = time.perf_counter()
+    for process in processes:
+        process.start()
+    errors = []
+    for _ in processes:
+        errors.extend(queue.get())
+    for process in processes:
+        process.join()
+    elapsed = time.perf_counter() - start
+
+    problems = errors + verify(db, candidate_ids, job_ids, workers, args.rounds)
+    problems += verify_import(db, workdir, job_ids)
+    problems += verify_single_id_column(db, workdir, job_ids[1])
+    writes = workers * args.rounds + 3 * len(candidate_ids) * args.rounds
+    print(f"{args.backend}: {workers} writers, {writes} write operations in {elapsed:.1f}s")
+    if problems:
+        print(f"FAILED with {len(problems)} problems:")
+        for problem in problems[:50]:
+            print(f"  {problem}")
+        sys.exit(1)
+
+    os.chdir(REPO_ROOT)
+    shutil.rmtree(workdir)
+    print("OK: no lost updates, no duplicate ids, no partial files, imports rebuild the match relation")
+
+if __name__ == '__main__':
+    main()
@@ -1,20 +1,20 @@
 import streamlit as st
 import pandas as pd
 import time
-from utils.database import get_candidates, get_jobs, get_candidates_by_status
+from utils.database import get_jobs_snapshot, get_candidate_status_counts, get_candidate_skill_counts, get_candidates_for_job
 
 def show_dashboard():
     st.title("Talent Acquisition Dashboard")
     
-    # Fetch latest data
-    candidates = get_candidates()
-    jobs = get_jobs()
+    # Fetch latest data; the counts are kept up to date from the change feed
+    jobs = get_jobs_snapshot()
+    status_counts = get_candidate_status_counts()
     
     # Calculate metrics
-    total_candidates = len(candidates)
+    total_candidates = sum(status_counts.values())
     open_positions = len(jobs)
-    screening_candidates = len(get_candidates_by_status("Screening"))
-    scheduled_interviews = len(get_candidates_by_status("Interview Scheduled"))
+    screening_candidates = status_counts.get("Screening", 0)
+    scheduled_interviews = status_counts.get("Interview Scheduled", 0)
     
     # Display key metrics
     col1, col2, col3, col4 = st.columns(4)
@@ -38,27 +38,20 @@ def show_dashboard():
     
     with col1:
         st.subheader("Candidates by Status")
-        # Calculate the count of candidates by status
-        status_counts = pd.DataFrame(candidates).groupby('status').size().reset_index(name='count')
+        # Count of candidates by status
+        status_df = pd.DataFrame(sorted(status_counts.items()), columns=['status', 'count'])
         
         # Check if the dataframe is empty
-        if not status_counts.empty:
+        if not status_df.empty:
             # Create a bar chart
-            st.bar_chart(status_counts.set_index('status'))
+            st.bar_chart(status_df.set_index('status'))
         else:
             st.write("No status data available")
     
     with col2:
         st.subheader("Top Skills in Candidate Pool")
-        # Extract and count skills
-        all_skills = []
-        for candidate in candidates:
-            if 'skills' in candidate and candidate['skills']:
-                skills = [skill.strip() for skill in candidate['skills'].split(',')]
-                all_skills.extend(skills)
-        
-        # Count occurrence of each skill
-        skill_counts = pd.Series(all_skills).value_counts().reset_index()
+        # Occurrences of each skill
+        skill_counts = pd.Series(get_candidate_skill_counts(), dtype=int).sort_values(ascending=False).reset_index()
         skill_counts.columns = ['skill', 'count']
         
         # Display top 10 skills
@@ -91,7 +84,7 @@ def show_dashboard():
     # Calculate the progress for each job
     for job in jobs:
         job_id = job['id']
-        matched_candidates = [c for c in candidates if 'matched_jobs' in c and c['matched_jobs'] and str(job_id) in c['matched_jobs'].split(', ')]
+        matched_candidates = get_candidates_for_job(job_id)
         interviewed_candidates = [c for c in matched_candidates if c['status'] == 'Interview Scheduled']
         
         col1, col2 = st.columns([3, 1])
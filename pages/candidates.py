@@ -1,7 +1,9 @@
 import streamlit as st
 import pandas as pd
 import time
-from utils.database import get_candidates, get_jobs, update_candidates, export_candidates_csv, add_custom_candidate
+from utils.database import get_jobs, get_candidate_by_id, query_candidates, get_candidate_statuses, update_candidate_fields, iter_candidates_export, add_custom_candidate, import_candidates, get_jobs_for_candidate, set_candidate_matches
+from utils.storage import TABLE_COLUMNS
+from utils.export import EXPORT_FORMATS, spool_export
 from agents.sourcing_agent import SourcingAgent
 from utils.embeddings import compare_resume_with_job, find_matching_jobs_for_candidate
 
@@ -21,9 +23,7 @@ def show_candidates_page():
         show_export_options()
 
 def show_candidate_database():
-    # Fetch candidates
-    candidates = get_candidates()
-    jobs = get_jobs()
+    jobs = get_jobs(columns=['id', 'title'])
     
     # Filter options
     st.subheader("Filter Candidates")
@@ -31,12 +31,12 @@ def show_candidate_database():
     col1, col2, col3 = st.columns(3)
     
     with col1:
-        # Create a multiselect for filtering by status
-        status_options = ["All"] + sorted(list(set(c.get('status', '') for c in candidates)))
+        # Create a dropdown for filtering by status
+        status_options = ["All"] + get_candidate_statuses()
         selected_status = st.selectbox("Status", status_options)
     
     with col2:
-        # Create a multiselect for filtering by job
+        # Create a dropdown for filtering by job
         job_options = ["All"] + [f"{j['id']} - {j['title']}" for j in jobs]
         selected_job = st.selectbox("Job", job_options)
     
@@ -44,47 +44,49 @@ def show_candidate_database():
         # Create a search box
         search_query = st.text_input("Search by name, skills, or role")
     
-    # Apply filters
-    filtered_candidates = candidates.copy()
+    # Sorting and page size
+    col1, col2 = st.columns(2)
     
-    # Filter by status
-    if selected_status != "All":
-        filtered_candidates = [c for c in filtered_candidates if c.get('status', '') == selected_status]
+    with col1:
+        sort_labels = {"File order": None, "Score (high to low)": "-score", "Name": "name", "Experience (high to low)": "-years_experience"}
+        selected_sort = st.selectbox("Sort by", list(sort_labels), key="candidate_sort")
+    
+    with col2:
+        page_size = st.selectbox("Rows per page", [25, 50, 100], key="candidate_page_size")
     
-    # Filter by job
-    if selected_job != "All":
-        job_id = selected_job.split(" - ")[0]
-        filtered_candidates = [c for c in filtered_candidates if 'matched_jobs' in c and c['matched_jobs'] and str(job_id) in c['matched_jobs'].split(', ')]
+    # Fetch only the current page
+    display_columns = ['id', 'name', 'current_role', 'years_experience', 'skills', 'status', 'score']
+    page_number = st.session_state.get("candidate_page", 1)
+    filters = {
+        'status': None if selected_status == "All" else selected_status,
+        'job_id': None if selected_job == "All" else selected_job.split(" - ")[0],
+        'text': search_query or None,
+        'sort': sort_labels[selected_sort],
+    }
+    page_candidates, total = query_candidates(**filters, offset=(page_number - 1) * page_size, limit=page_size, columns=display_columns)
     
-    # Filter by search query
-    if search_query:
-        search_query = search_query.lower()
-        filtered_candidates = [
-            c for c in filtered_candidates 
-            if search_query in c.get('name', '').lower() 
-            or search_query in c.get('skills', '').lower() 
-            or search_query in c.get('current_role', '').lower()
-        ]
+    # Filters changed and the page is now past the end: start over
+    page_count = max(1, -(-total // page_size))
+    if page_number > page_count:
+        page_number = 1
+        st.session_state["candidate_page"] = 1
+        page_candidates, total = query_candidates(**filters, offset=0, limit=page_size, columns=display_columns)
     
     # Display candidates
-    st.subheader(f"Candidates ({len(filtered_candidates)})")
+    st.subheader(f"Candidates ({total})")
     
-    if not filtered_candidates:
+    if not page_candidates:
         st.info("No candidates match the selected filters")
     else:
-        # Convert to DataFrame for easier handling
-        df = pd.DataFrame(filtered_candidates)
-        
-        # Select columns to display in the table
-        display_columns = ['id', 'name', 'current_role', 'years_experience', 'skills', 'status', 'score']
-        
-        # Ensure all columns exist
-        for col in display_columns:
-            if col not in df.columns:
-                df[col] = ""
-        
         # Display the table
-        st.dataframe(df[display_columns], use_container_width=True)
+        st.dataframe(pd.DataFrame(page_candidates, columns=display_columns), use_container_width=True)
+        
+        # Pagination controls
+        col1, col2 = st.columns([1, 3])
+        with col1:
+            page_number = st.number_input("Page", min_value=1, max_value=page_count, key="candidate_page")
+        with col2:
+            st.caption(f"Page {page_number} of {page_count}")
         
         # Candidate details
         st.subheader("Candidate Details")
@@ -92,15 +94,15 @@ def show_candidate_database():
         # Select a candidate to view details
         selected_candidate_id = st.selectbox(
             "Select a candidate to view details",
-            options=[f"{c['id']} - {c['name']}" for c in filtered_candidates]
+            options=[f"{c['id']} - {c['name']}" for c in page_candidates]
         )
         
         if selected_candidate_id:
             candidate_id = selected_candidate_id.split(" - ")[0]
-            candidate = next((c for c in filtered_candidates if str(c['id']) == candidate_id), None)
+            candidate = get_candidate_by_id(candidate_id)
             
             if candidate:
-                show_candidate_details(candidate, jobs)
+                show_candidate_details(candidate, get_jobs())
 
 def show_candidate_details(candidate, jobs):
     # Create two columns for candidate info
@@ -144,10 +146,8 @@ def show_candidate_details(candidate, jobs):
         # Show matched jobs
         st.subheader("Matched Jobs")
         
-        if 'matched_jobs' in candidate and candidate['matched_jobs']:
-            matched_job_ids = candidate['matched_jobs'].split(', ')
-            matched_jobs = [j for j in jobs if str(j['id']) in matched_job_ids]
-            
+        matched_jobs = get_jobs_for_candidate(candidate['id'])
+        if matched_jobs:
             for job in matched_jobs:
                 st.markdown(f"- **{job['title']}** ({job['department']})")
         else:
@@ -167,18 +167,8 @@ def show_candidate_details(candidate, jobs):
                 # Find matches
                 matches = find_matching_jobs_for_candidate(candidate, job_embeddings, jobs)
                 
-                # Update candidate's matched_jobs
-                matched_job_ids = [str(match['job_id']) for match in matches]
-                candidate['matched_jobs'] = ', '.join(matched_job_ids)
-                
-                # Get all candidates and update the specific one
-                all_candidates = get_candidates()
-                for i, c in enumerate(all_candidates):
-                    if str(c['id']) == str(candidate['id']):
-                        all_candidates[i] = candidate
-                        break
-                
-                update_candidates(all_candidates)
+                # Replace the candidate's matches with the new ones
+                set_candidate_matches(candidate['id'], [(match['job_id'], match['score']) for match in matches])
                 
                 st.success(f"Found {len(matches)} matching jobs!")
                 time.sleep(1)
@@ -191,14 +181,8 @@ def show_candidate_details(candidate, jobs):
         
         if st.button("Update Status"):
             with st.spinner("Updating status..."):
-                # Get all candidates and update the specific one
-                all_candidates = get_candidates()
-                for i, c in enumerate(all_candidates):
-                    if str(c['id']) == str(candidate['id']):
-                        all_candidates[i]['status'] = new_status
-                        break
-                
-                update_candidates(all_candidates)
+                # Update only this candidate's status
+                update_candidate_fields(candidate['id'], status=new_status)
                 st.success(f"Status updated to {new_status}")
                 time.sleep(1)
                 st.rerun()
@@ -273,20 +257,57 @@ def show_add_candidate_form():
                     st.success("Candidate added successfully!")
                 else:
                     st.error("Failed to add candidate")
+    
+    # Bulk import from a file
+    st.subheader("Bulk Import")
+    st.write("Upload a CSV or JSONL file with one candidate per row. Columns follow the candidate export; name and email are required.")
+    
+    uploaded_file = st.file_uploader("Candidate file", type=["csv", "jsonl"], key="candidate_import_file")
+    
+    if uploaded_file is not None and st.button("Import Candidates"):
+        with st.spinner("Importing candidates..."):
+            result = import_candidates(uploaded_file)
+        
+        if result['imported']:
+            st.success(f"Imported {result['imported']} candidates (IDs {result['ids'][0]}-{result['ids'][-1]})")
+        if result['ignored_columns']:
+            st.warning(f"Ignored unknown columns: {', '.join(result['ignored_columns'])}")
+        if result['errors']:
+            st.error(f"{len(result['errors'])} rows were rejected")
+            st.dataframe(pd.DataFrame(result['errors'], columns=["Row", "Error"]), use_container_width=True)
 
 def show_export_options():
     st.subheader("Export Candidate Data")
     
-    if st.button("Export to CSV"):
-        # Get CSV data
-        csv_data = export_candidates_csv()
+    # Export settings
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        format_labels = {"CSV": "csv", "CSV (gzip)": "csv.gz", "Excel": "xlsx"}
+        selected_format = st.selectbox("Format", list(format_labels), key="candidate_export_format")
+        fmt = format_labels[selected_format]
+    
+    with col2:
+        status_options = get_candidate_statuses()
+        selected_statuses = st.multiselect("Status (empty for all)", status_options, key="candidate_export_status")
+    
+    all_columns = list(TABLE_COLUMNS['candidates'])
+    selected_columns = st.multiselect("Columns", all_columns, default=all_columns, key="candidate_export_columns")
+    
+    if st.button("Prepare Export"):
+        with st.spinner("Preparing export..."):
+            # Stream the export in chunks into a temporary file
+            filters = {'status': selected_statuses} if selected_statuses else None
+            export_file = spool_export(iter_candidates_export(fmt, columns=selected_columns or None, filters=filters))
+        
+        extension, mime = EXPORT_FORMATS[fmt]
         
-        # Create a download button
+        # Create a download button (Streamlit needs the finished file as bytes)
         st.download_button(
-            label="Download CSV",
-            data=csv_data,
-            file_name="candidates_export.csv",
-            mime="text/csv"
+            label=f"Download {selected_format}",
+            data=export_file.read(),
+            file_name=f"candidates_export.{extension}",
+            mime=mime
         )
         
         st.success("Export ready for download!")
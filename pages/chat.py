@@ -3,8 +3,8 @@ import google.generativeai as genai
 import re
 
 from utils.database import (
-    get_candidates,
-    get_jobs,
+    get_candidates_snapshot,
+    get_jobs_snapshot,
     get_candidates_for_job,
     get_candidate_by_id,
     get_job_by_id,
@@ -99,8 +99,8 @@ def process_query(prompt, role):
 def process_manager_query(prompt):
     """Handle manager-specific queries"""
     query_lower = prompt.lower()
-    candidates = get_candidates()
-    jobs = get_jobs()
+    candidates = get_candidates_snapshot()
+    jobs = get_jobs_snapshot()
     
     # Job-specific candidates
     if re.search(r'candidate(?:s)? for job (\d+)', query_lower) or (('candidate' in query_lower or 'candidates' in query_lower) and 'job' in query_lower and any(str(i) in query_lower for i in range(1, 10))):
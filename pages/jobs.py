@@ -1,7 +1,9 @@
 import streamlit as st
 import pandas as pd
 import time
-from utils.database import get_candidates, get_jobs, get_candidates_for_job, export_jobs_csv
+from utils.database import get_jobs, query_jobs, get_job_departments, get_candidates_for_job, iter_jobs_export
+from utils.storage import TABLE_COLUMNS
+from utils.export import EXPORT_FORMATS, spool_export
 from agents.sourcing_agent import SourcingAgent
 
 def show_jobs_page():
@@ -20,9 +22,6 @@ def show_jobs_page():
         show_export_options()
 
 def show_job_listings():
-    # Fetch jobs
-    jobs = get_jobs()
-    
     # Filter options
     st.subheader("Filter Jobs")
     
@@ -30,31 +29,32 @@ def show_job_listings():
     
     with col1:
         # Create a dropdown for filtering by department
-        dept_options = ["All"] + sorted(list(set(j['department'] for j in jobs)))
+        dept_options = ["All"] + get_job_departments()
         selected_dept = st.selectbox("Department", dept_options)
     
     with col2:
         # Create a search box
         search_query = st.text_input("Search by title or skills")
     
-    # Apply filters
-    filtered_jobs = jobs.copy()
+    page_size = st.selectbox("Rows per page", [25, 50, 100], key="job_page_size")
     
-    # Filter by department
-    if selected_dept != "All":
-        filtered_jobs = [j for j in filtered_jobs if j['department'] == selected_dept]
+    # Fetch only the current page
+    page_number = st.session_state.get("job_page", 1)
+    filters = {
+        'department': None if selected_dept == "All" else selected_dept,
+        'text': search_query or None,
+    }
+    filtered_jobs, total = query_jobs(**filters, offset=(page_number - 1) * page_size, limit=page_size)
     
-    # Filter by search query
-    if search_query:
-        search_query = search_query.lower()
-        filtered_jobs = [
-            j for j in filtered_jobs 
-            if search_query in j['title'].lower() 
-            or search_query in j.get('skills_required', '').lower()
-        ]
+    # Filters changed and the page is now past the end: start over
+    page_count = max(1, -(-total // page_size))
+    if page_number > page_count:
+        page_number = 1
+        st.session_state["job_page"] = 1
+        filtered_jobs, total = query_jobs(**filters, offset=0, limit=page_size)
     
     # Display jobs
-    st.subheader(f"Job Positions ({len(filtered_jobs)})")
+    st.subheader(f"Job Positions ({total})")
     
     if not filtered_jobs:
         st.info("No jobs match the selected filters")
@@ -68,6 +68,13 @@ def show_job_listings():
         # Display the table
         st.dataframe(df[display_columns], use_container_width=True)
         
+        # Pagination controls
+        col1, col2 = st.columns([1, 3])
+        with col1:
+            page_number = st.number_input("Page", min_value=1, max_value=page_count, key="job_page")
+        with col2:
+            st.caption(f"Page {page_number} of {page_count}")
+        
         # Job details
         st.subheader("Job Details")
         
@@ -193,8 +200,8 @@ def show_job_details(job):
 def show_candidate_matching():
     st.subheader("Match Candidates to Jobs")
     
-    # Fetch jobs
-    jobs = get_jobs()
+    # Fetch only the job columns the selector needs
+    jobs = get_jobs(columns=['id', 'title'])
     
     # Select a job for matching
     selected_job_id = st.selectbox(
@@ -245,16 +252,35 @@ def show_candidate_matching():
 def show_export_options():
     st.subheader("Export Job Data")
     
-    if st.button("Export to CSV"):
-        # Get CSV data
-        csv_data = export_jobs_csv()
+    # Export settings
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        format_labels = {"CSV": "csv", "CSV (gzip)": "csv.gz", "Excel": "xlsx"}
+        selected_format = st.selectbox("Format", list(format_labels), key="job_export_format")
+        fmt = format_labels[selected_format]
+    
+    with col2:
+        dept_options = get_job_departments()
+        selected_depts = st.multiselect("Department (empty for all)", dept_options, key="job_export_department")
+    
+    all_columns = list(TABLE_COLUMNS['jobs'])
+    selected_columns = st.multiselect("Columns", all_columns, default=all_columns, key="job_export_columns")
+    
+    if st.button("Prepare Export"):
+        with st.spinner("Preparing export..."):
+            # Stream the export in chunks into a temporary file
+            filters = {'department': selected_depts} if selected_depts else None
+            export_file = spool_export(iter_jobs_export(fmt, columns=selected_columns or None, filters=filters))
+        
+        extension, mime = EXPORT_FORMATS[fmt]
         
-        # Create a download button
+        # Create a download button (Streamlit needs the finished file as bytes)
         st.download_button(
-            label="Download CSV",
-            data=csv_data,
-            file_name="jobs_export.csv",
-            mime="text/csv"
+            label=f"Download {selected_format}",
+            data=export_file.read(),
+            file_name=f"jobs_export.{extension}",
+            mime=mime
         )
         
         st.success("Export ready for download!")
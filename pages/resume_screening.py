@@ -6,6 +6,7 @@ import google.generativeai as genai
 
 from utils.database import get_candidates, get_jobs, get_candidate_by_id, get_job_by_id
 from agents.screening_agent import ScreeningAgent
+from utils.embeddings import compare_documents
 from typing import Tuple
 
 # Set page configuration
@@ -46,8 +47,8 @@ def show_resume_screening():
 def show_individual_screening():
     st.subheader("Screen Individual Candidate")
     
-    candidates = get_candidates()
-    jobs = get_jobs()
+    candidates = get_candidates(columns=['id', 'name'])
+    jobs = get_jobs(columns=['id', 'title'])
     
     preselected_candidate = st.session_state.get('selected_candidate', None)
     preselected_job = st.session_state.get('selected_job', None)
@@ -226,6 +227,10 @@ def show_resume_analysis():
             st.metric("Score", f"{int(ats_score * 100)}%")
             color = "green" if ats_score >= 0.8 else "orange" if ats_score >= 0.5 else "red"
             st.markdown(f"<div style='background-color:{color}; height:10px; width:100%; border-radius:5px;'></div>", unsafe_allow_html=True)
+            # Embedding similarity over the whole resume, chunked to fit the embedding model
+            semantic_score = compare_documents(resume_text, job_description)
+            if semantic_score:
+                st.metric("Semantic Similarity", f"{int(semantic_score * 100)}%")
 
 # ---------------------------
 # MAIN
@@ -23,9 +23,9 @@ def show_scheduling_page():
 def show_individual_scheduling():
     st.subheader("Schedule Individual Interview")
     
-    # Load candidates and jobs
-    candidates = get_candidates()
-    jobs = get_jobs()
+    # Load only the columns the selectors need
+    candidates = get_candidates(columns=['id', 'name'])
+    jobs = get_jobs(columns=['id', 'title'])
     
     # Check if we have a pre-selected candidate or job from another page
     preselected_candidate = st.session_state.get('selected_candidate', None)
@@ -251,8 +251,8 @@ def show_calendar_view():
 def show_batch_scheduling():
     st.subheader("Batch Schedule Interviews")
     
-    # Load jobs
-    jobs = get_jobs()
+    # Load only the columns the selector needs
+    jobs = get_jobs(columns=['id', 'title'])
     
     # Check if we have a pre-selected job from another page
     preselected_job = st.session_state.get('selected_job', None)
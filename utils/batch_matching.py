@@ -0,0 +1,121 @@
+import os
+import time
+import argparse
+import multiprocessing
+import numpy as np
+from utils import database
+from utils.records import Job, JobMatrix
+
+# Score above which a candidate is recorded as a match, as in SourcingAgent.search_candidates
+MATCH_THRESHOLD = 0.6
+# Candidates scored per block; a block holds rows x open jobs float64 scores
+BLOCK_ROWS = 4096
+# Smaller pools are scored in this process, since starting workers costs more than it saves
+PARALLEL_MIN_CANDIDATES = 20000
+
+_worker_jobs = None
+
+def _init_worker(jobs):
+    global _worker_jobs
+    _worker_jobs = jobs
+
+def _score_block(args):
+    """Matches and best score of one block of candidates against every open job"""
+    start, skill_sets, years, threshold = args
+    scores = _worker_jobs.scores(skill_sets, years)
+    rows, columns = np.nonzero(scores > threshold)
+    matches = [(start + row, column, scores[row, column]) for row, column in zip(rows.tolist(), columns.tolist())]
+    best = scores.max(axis=1) if scores.shape[1] else np.full(len(years), -np.inf)
+    return start, matches, best
+
+def _blocks(candidates, threshold, block_rows):
+    for start in range(0, len(candidates), block_rows):
+        block = candidates[start:start + block_rows]
+        yield start, [candidate.skill_set for candidate in block], [candidate.years for candidate in block], threshold
+
+def score_all(candidates, jobs, threshold=MATCH_THRESHOLD, processes=None, block_rows=BLOCK_ROWS):
+    """Score every candidate against every job in blocks, in worker processes for large pools.
+
+    Returns ``(matches, best)``: ``(candidate index, job index, score)`` for
+    every pair scoring above ``threshold``, and each candidate's best score
+    (-inf when there are no jobs).
+    """
+    job_matrix = JobMatrix(jobs)
+    best = np.full(len(candidates), -np.inf)
+    matches = []
+    if processes is None:
+        processes = (os.cpu_count() or 1) if len(candidates) >= PARALLEL_MIN_CANDIDATES else 1
+    blocks = _blocks(candidates, threshold, block_rows)
+
+    if processes > 1 and len(candidates) > block_rows:
+        with multiprocessing.Pool(processes, initializer=_init_worker, initargs=(job_matrix,)) as pool:
+            results = list(pool.imap_unordered(_score_block, blocks))
+    else:
+        _init_worker(job_matrix)
+        results = [_score_block(block) for block in blocks]
+
+    for start, block_matches, block_best in sorted(results, key=lambda result: result[0]):
+        matches.extend(block_matches)
+        best[start:start + len(block_best)] = block_best
+    return matches, best
+
+def match_all(threshold=MATCH_THRESHOLD, processes=None, block_rows=BLOCK_ROWS, open_statuses=('Open',)):
+    """Refresh matches and candidate scores for every open job in one pass.
+
+    Like running SourcingAgent.search_candidates for each open job: pairs
+    scoring above ``threshold`` become matches, and a candidate's score is
+    raised to its best fit. Everything is written in one transaction.
+    Returns counts and timings, including scored pairs per second.
+    """
+    start = time.perf_counter()
+    candidates = database.get_candidate_records()
+    jobs = [
+        Job(job) for job in database.get_jobs()
+        if job.get('status') in open_statuses
+    ]
+    loaded = time.perf_counter()
+
+    pair_matches, best = score_all(candidates, jobs, threshold, processes, block_rows)
+    scored = time.perf_counter()
+
+    matches = [(candidates[row].id, jobs[column].id, float(score)) for row, column, score in pair_matches]
+    changes = {
+        candidate.id: {'score': float(score)}
+        for candidate, score in zip(candidates, best.tolist())
+        if score > candidate.score
+    }
+    written = database.record_match_results(matches, changes)
+    finished = time.perf_counter()
+
+    pairs = len(candidates) * len(jobs)
+    return {
+        'candidates': len(candidates),
+        'jobs': len(jobs),
+        'pairs': pairs,
+        'matches': len(matches),
+        'score_updates': len(changes),
+        'written': written,
+        'load_seconds': loaded - start,
+        'score_seconds': scored - loaded,
+        'write_seconds': finished - scored,
+        'pairs_per_second': pairs / max(scored - loaded, 1e-9),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Score every candidate against every open job and record the matches")
+    parser.add_argument('--threshold', type=float, default=MATCH_THRESHOLD, help="record pairs scoring above this")
+    parser.add_argument('--processes', type=int, default=None, help="worker processes (default: CPU count for large pools)")
+    parser.add_argument('--block-rows', type=int, default=BLOCK_ROWS, help="candidates scored per block")
+    args = parser.parse_args()
+
+    database.setup_database()
+    report = match_all(args.threshold, args.processes, args.block_rows)
+    print(f"Scored {report['candidates']} candidates x {report['jobs']} open jobs = {report['pairs']} pairs")
+    print(f"Load {report['load_seconds']:.2f}s, score {report['score_seconds']:.2f}s "
+          f"({report['pairs_per_second']:,.0f} pairs/s), write {report['write_seconds']:.2f}s")
+    print(f"{report['matches']} matches, {report['score_updates']} candidate scores raised")
+    if not report['written']:
+        print("Writing the results failed; nothing was recorded")
+
+if __name__ == '__main__':
+    main()
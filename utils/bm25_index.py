@@ -0,0 +1,227 @@
+import os
+import re
+import hashlib
+import threading
+from array import array
+from collections import Counter
+import numpy as np
+from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS
+
+# Words plus the punctuation that is part of skill names: c++, c#, node.js
+TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9+#]+)*")
+# Compact the postings once this share of the rows belongs to removed candidates
+MAX_DEAD_RATIO = 0.25
+
+def tokenize(text):
+    """Lower-case keyword tokens of a text, without English stop words"""
+    return [token for token in TOKEN_PATTERN.findall(str(text).lower()) if token not in ENGLISH_STOP_WORDS]
+
+def candidate_document(candidate):
+    """Text of a candidate indexed for keyword search"""
+    return f"{candidate.get('skills', '')}\n{candidate.get('resume_summary', '')}"
+
+def _document_hash(text):
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+class BM25Index:
+    """Inverted index over candidate skills and resume summaries, scored with Okapi BM25.
+
+    Each term maps to growable arrays of (row, term frequency) postings, so
+    a query only touches the rows that contain its terms and the scoring is
+    a handful of vectorized numpy operations per term. A changed candidate
+    gets a new row; the old row and the rows of removed candidates are
+    masked out until ``compact`` drops them from the postings.
+
+    ``save`` writes everything to one .npz file; ``load`` reads it back.
+    """
+
+    def __init__(self, path=None, k1=1.2, b=0.75):
+        self.path = path
+        self.k1 = k1
+        self.b = b
+        self.postings = {}         # term -> (array('i') rows, array('H') term frequencies)
+        self.lengths = array('f')  # row -> document length in tokens
+        self.alive = bytearray()   # row -> 1 while the row is current
+        self.row_ids = []          # row -> candidate id, None for dead rows
+        self.rows = {}             # candidate id -> row
+        self.hashes = {}           # candidate id -> hash of the indexed text
+        self.total_length = 0.0
+        self._norms = None
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __contains__(self, candidate_id):
+        return str(candidate_id) in self.rows
+
+    def _add(self, candidate_id, text, text_hash):
+        tokens = tokenize(text)
+        row = len(self.row_ids)
+        self.row_ids.append(candidate_id)
+        self.rows[candidate_id] = row
+        self.hashes[candidate_id] = text_hash
+        self.lengths.append(len(tokens))
+        self.alive.append(1)
+        self.total_length += len(tokens)
+        for term, count in Counter(tokens).items():
+            postings = self.postings.get(term)
+            if postings is None:
+                postings = self.postings[term] = (array('i'), array('H'))
+            postings[0].append(row)
+            postings[1].append(min(count, 65535))
+
+    def _remove(self, candidate_id):
+        row = self.rows.pop(candidate_id, None)
+        if row is None:
+            return False
+        self.hashes.pop(candidate_id, None)
+        self.row_ids[row] = None
+        self.alive[row] = 0
+        self.total_length -= self.lengths[row]
+        return True
+
+    def update(self, candidates=(), removed_ids=()):
+        """Index new or edited candidates and drop ``removed_ids``; unchanged candidates are skipped.
+
+        Returns True if any row was added or removed.
+        """
+        with self._lock:
+            changed = False
+            for candidate_id in removed_ids:
+                changed |= self._remove(str(candidate_id))
+            for candidate in candidates:
+                candidate_id = str(candidate['id'])
+                text = candidate_document(candidate)
+                text_hash = _document_hash(text)
+                if self.hashes.get(candidate_id) == text_hash:
+                    continue
+                self._remove(candidate_id)
+                self._add(candidate_id, text, text_hash)
+                changed = True
+            if not changed:
+                return False
+            self._norms = None
+            if len(self.row_ids) - len(self.rows) > MAX_DEAD_RATIO * max(1, len(self.row_ids)):
+                self.compact()
+            return True
+
+    def sync(self, candidates):
+        """Make the index hold exactly ``candidates``; returns True if anything changed"""
+        with self._lock:
+            current = {str(candidate['id']) for candidate in candidates}
+            return self.update(candidates, [candidate_id for candidate_id in self.rows if candidate_id not in current])
+
+    def compact(self):
+        """Renumber the live rows and drop dead rows from every posting list"""
+        with self._lock:
+            alive = np.frombuffer(self.alive, dtype=np.uint8).astype(bool)
+            mapping = np.full(len(alive), -1, dtype=np.int32)
+            mapping[alive] = np.arange(int(alive.sum()), dtype=np.int32)
+
+            postings = {}
+            for term, (rows, counts) in self.postings.items():
+                rows = np.frombuffer(rows, dtype=np.int32)
+                keep = alive[rows]
+                if keep.any():
+                    postings[term] = (
+                        array('i', mapping[rows[keep]].tobytes()),
+                        array('H', np.frombuffer(counts, dtype=np.uint16)[keep].tobytes()),
+                    )
+            self.postings = postings
+            self.lengths = array('f', np.frombuffer(self.lengths, dtype=np.float32)[alive].tobytes())
+            self.row_ids = [candidate_id for candidate_id in self.row_ids if candidate_id is not None]
+            self.rows = {candidate_id: row for row, candidate_id in enumerate(self.row_ids)}
+            self.alive = bytearray(b'\x01' * len(self.row_ids))
+            self._norms = None
+
+    def _length_norms(self):
+        # k1 * (1 - b + b * length / average length), cached until the index changes
+        if self._norms is None:
+            average = self.total_length / max(1, len(self.rows)) or 1.0
+            lengths = np.frombuffer(self.lengths, dtype=np.float32)
+            self._norms = self.k1 * (1 - self.b + self.b * lengths / average)
+        return self._norms
+
+    def scores(self, text):
+        """BM25 score of ``text`` against every row (dead rows score 0)"""
+        with self._lock:
+            scores = np.zeros(len(self.row_ids), dtype=np.float32)
+            if not self.rows:
+                return scores
+            norms = self._length_norms()
+            count = len(self.rows)
+            for term in set(tokenize(text)):
+                postings = self.postings.get(term)
+                if postings is None:
+                    continue
+                rows = np.frombuffer(postings[0], dtype=np.int32)
+                frequencies = np.frombuffer(postings[1], dtype=np.uint16).astype(np.float32)
+                idf = np.log1p((count - len(rows) + 0.5) / (len(rows) + 0.5))
+                scores[rows] += idf * frequencies * (self.k1 + 1) / (frequencies + norms[rows])
+            if len(self.rows) < len(self.row_ids):
+                scores[np.frombuffer(self.alive, dtype=np.uint8) == 0] = 0
+            return scores
+
+    def top_k(self, text, k=10):
+        """Return up to ``k`` (candidate_id, bm25_score) pairs with a positive score, best first"""
+        with self._lock:
+            scores = self.scores(text)
+            rows = np.flatnonzero(scores > 0)
+            if k is not None and k < len(rows):
+                rows = rows[np.argpartition(-scores[rows], k - 1)[:k]]
+            rows = rows[np.argsort(-scores[rows], kind='stable')]
+            return [(self.row_ids[row], float(scores[row])) for row in rows]
+
+    def save(self, path=None):
+        """Write the index to an .npz file atomically; dead rows are kept, masked by ``alive``"""
+        path = path or self.path
+        with self._lock:
+            terms = list(self.postings)
+            offsets = np.zeros(len(terms) + 1, dtype=np.int64)
+            offsets[1:] = np.cumsum([len(self.postings[term][0]) for term in terms])
+            directory = os.path.dirname(path)
+            if directory and not os.path.exists(directory):
+                os.makedirs(directory)
+
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                np.savez(
+                    f,
+                    terms=np.array(terms, dtype=str),
+                    offsets=offsets,
+                    rows=np.concatenate([np.frombuffer(self.postings[term][0], dtype=np.int32) for term in terms] or [np.zeros(0, np.int32)]),
+                    frequencies=np.concatenate([np.frombuffer(self.postings[term][1], dtype=np.uint16) for term in terms] or [np.zeros(0, np.uint16)]),
+                    lengths=np.frombuffer(self.lengths, dtype=np.float32),
+                    ids=np.array([candidate_id or '' for candidate_id in self.row_ids], dtype=str),
+                    hashes=np.array([self.hashes.get(candidate_id, '') for candidate_id in self.row_ids], dtype=str),
+                    alive=np.frombuffer(self.alive, dtype=np.uint8),
+                    params=np.array([self.k1, self.b]),
+                )
+            os.replace(tmp_path, path)
+            self.path = path
+
+    @classmethod
+    def load(cls, path):
+        """Read an index written by ``save``"""
+        with np.load(path, allow_pickle=False) as data:
+            k1, b = data['params'].tolist()
+            instance = cls(path, k1=k1, b=b)
+            offsets, rows, frequencies = data['offsets'], data['rows'], data['frequencies']
+            for position, term in enumerate(data['terms'].tolist()):
+                start, end = offsets[position], offsets[position + 1]
+                instance.postings[term] = (array('i', rows[start:end].tobytes()), array('H', frequencies[start:end].tobytes()))
+            lengths = data['lengths']
+            # Files written before the alive mask was saved hold live rows only
+            alive = data['alive'].astype(bool) if 'alive' in data.files else np.ones(len(lengths), dtype=bool)
+            instance.lengths = array('f', lengths.tobytes())
+            instance.row_ids = [candidate_id if live else None for candidate_id, live in zip(data['ids'].tolist(), alive.tolist())]
+            instance.rows = {candidate_id: row for row, candidate_id in enumerate(instance.row_ids) if candidate_id is not None}
+            instance.hashes = {
+                candidate_id: text_hash
+                for candidate_id, text_hash in zip(instance.row_ids, data['hashes'].tolist())
+                if candidate_id is not None
+            }
+            instance.alive = bytearray(alive.astype(np.uint8).tobytes())
+            instance.total_length = float(lengths[alive].sum())
+        return instance
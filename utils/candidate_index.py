@@ -0,0 +1,252 @@
+import os
+import json
+import threading
+import numpy as np
+
+try:
+    import faiss
+except ImportError:
+    faiss = None
+
+# Pool sizes at which the index switches from exact search to HNSW, and from HNSW to IVF
+FLAT_MAX = 10000
+HNSW_MAX = 500000
+# Rebuild once deleted-but-still-indexed vectors make up this share of the index
+MAX_TOMBSTONE_RATIO = 0.2
+# Vectors used to train the IVF coarse quantizer
+IVF_TRAINING_SIZE = 100000
+
+def choose_kind(count):
+    """Index type for a pool of ``count`` candidates: 'flat', 'hnsw' or 'ivf'"""
+    if count < FLAT_MAX:
+        return 'flat'
+    if count < HNSW_MAX:
+        return 'hnsw'
+    return 'ivf'
+
+def _normalize(vectors):
+    vectors = np.array(vectors, dtype=np.float32, ndmin=2)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return np.ascontiguousarray(vectors / norms)
+
+class CandidateIndex:
+    """FAISS index of candidate embeddings for cosine top-k search.
+
+    Vectors are normalized and searched by inner product. The index type is
+    chosen by pool size (see ``choose_kind``): exact flat search for small
+    pools, HNSW for medium ones and IVF for very large ones. Candidates are
+    added, updated and removed by id; HNSW cannot delete, so removed vectors
+    are skipped at search time until ``needs_rebuild`` says the index should
+    be built again.
+
+    ``save`` writes the FAISS index and a JSON sidecar with the id mapping;
+    ``load`` memory-maps the index file and only reads it into memory when
+    the first change arrives.
+    """
+
+    def __init__(self, path=None, ef_search=64, nprobe=16):
+        if faiss is None:
+            raise RuntimeError("faiss is required for CandidateIndex")
+        self.path = path
+        self.ef_search = ef_search
+        self.nprobe = nprobe
+        self.kind = None
+        self.dimension = None
+        self.index = None
+        self.ids = {}          # FAISS label -> candidate id
+        self.labels = {}       # candidate id -> FAISS label
+        self.hashes = {}       # candidate id -> hash of the embedded text
+        self.tombstones = set()
+        self.next_label = 0
+        self.mmapped = False
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self.labels)
+
+    def __contains__(self, candidate_id):
+        return str(candidate_id) in self.labels
+
+    def _new_index(self, kind, vectors):
+        dimension = vectors.shape[1]
+        if kind == 'flat':
+            return faiss.IndexIDMap2(faiss.IndexFlatIP(dimension))
+        if kind == 'hnsw':
+            hnsw = faiss.IndexHNSWFlat(dimension, 32, faiss.METRIC_INNER_PRODUCT)
+            hnsw.hnsw.efConstruction = 80
+            return faiss.IndexIDMap2(hnsw)
+
+        # IVF: about 4 * sqrt(n) lists, with at least 39 training points per list
+        training = vectors
+        if len(training) > IVF_TRAINING_SIZE:
+            rows = np.random.default_rng(0).choice(len(training), IVF_TRAINING_SIZE, replace=False)
+            training = vectors[rows]
+        nlist = max(1, min(int(4 * np.sqrt(len(vectors))), len(training) // 39))
+        quantizer = faiss.IndexFlatIP(dimension)
+        ivf = faiss.IndexIVFFlat(quantizer, dimension, nlist, faiss.METRIC_INNER_PRODUCT)
+        ivf.train(training)
+        return ivf
+
+    def build(self, items, kind=None):
+        """Replace the whole index with ``(candidate_id, embedding, text_hash)`` items"""
+        items = [item for item in items if item[1] is not None]
+        with self._lock:
+            self.ids, self.labels, self.hashes = {}, {}, {}
+            self.tombstones = set()
+            self.next_label = 0
+            self.mmapped = False
+            if not items:
+                self.index, self.kind, self.dimension = None, None, None
+                return
+
+            vectors = _normalize([vector for _, vector, _ in items])
+            self.kind = kind or choose_kind(len(items))
+            self.dimension = vectors.shape[1]
+            self.index = self._new_index(self.kind, vectors)
+            self._add(items, vectors)
+
+    def _add(self, items, vectors):
+        labels = np.arange(self.next_label, self.next_label + len(items), dtype=np.int64)
+        self.next_label += len(items)
+        self.index.add_with_ids(vectors, labels)
+        for label, (candidate_id, _, text_hash) in zip(labels.tolist(), items):
+            candidate_id = str(candidate_id)
+            self.ids[label] = candidate_id
+            self.labels[candidate_id] = label
+            self.hashes[candidate_id] = text_hash
+
+    def _writable(self):
+        """Swap a memory-mapped (read-only) index for an in-memory copy"""
+        if self.mmapped:
+            self.index = faiss.read_index(self.path)
+            self.mmapped = False
+
+    def _drop_labels(self, labels):
+        for label in labels:
+            self.ids.pop(label, None)
+        try:
+            self.index.remove_ids(np.array(labels, dtype=np.int64))
+        except RuntimeError:
+            # HNSW cannot delete; hide the vectors until the next rebuild
+            self.tombstones.update(labels)
+
+    def upsert(self, items):
+        """Add or replace ``(candidate_id, embedding, text_hash)`` items"""
+        items = [item for item in items if item[1] is not None]
+        if not items:
+            return
+        with self._lock:
+            if self.index is None:
+                self.build(items)
+                return
+            vectors = _normalize([vector for _, vector, _ in items])
+            if vectors.shape[1] != self.dimension:
+                raise ValueError(f"embedding size {vectors.shape[1]} does not match the index ({self.dimension})")
+
+            self._writable()
+            stale = [self.labels.pop(str(candidate_id)) for candidate_id, _, _ in items if str(candidate_id) in self.labels]
+            self._drop_labels(stale)
+            self._add(items, vectors)
+
+    def remove(self, candidate_ids):
+        """Remove candidates from the index"""
+        with self._lock:
+            labels = []
+            for candidate_id in candidate_ids:
+                label = self.labels.pop(str(candidate_id), None)
+                if label is not None:
+                    self.hashes.pop(str(candidate_id), None)
+                    labels.append(label)
+            if labels:
+                self._writable()
+                self._drop_labels(labels)
+
+    def needs_rebuild(self, count=None):
+        """True if the pool outgrew the index type or too many deleted vectors are left in it"""
+        count = len(self.labels) if count is None else count
+        if self.index is None:
+            return count > 0
+        if choose_kind(count) != self.kind:
+            return True
+        return len(self.tombstones) > MAX_TOMBSTONE_RATIO * max(1, self.index.ntotal)
+
+    def _apply_search_params(self, k):
+        if self.kind == 'hnsw':
+            faiss.downcast_index(self.index.index).hnsw.efSearch = max(self.ef_search, k)
+        elif self.kind == 'ivf':
+            self.index.nprobe = self.nprobe
+
+    def top_k(self, query, k=10, threshold=None):
+        """Return up to ``k`` (candidate_id, similarity) pairs, best first; ``k=None`` means all"""
+        with self._lock:
+            if self.index is None or not self.labels:
+                return []
+            k = len(self.labels) if k is None else min(k, len(self.labels))
+            fetch = min(self.index.ntotal, k + len(self.tombstones))
+            self._apply_search_params(fetch)
+            scores, labels = self.index.search(_normalize(query), fetch)
+
+            results = []
+            for score, label in zip(scores[0].tolist(), labels[0].tolist()):
+                if label < 0 or label in self.tombstones:
+                    continue
+                if threshold is not None and score < threshold:
+                    break
+                results.append((self.ids[label], score))
+                if len(results) == k:
+                    break
+            return results
+
+    def save(self, path=None):
+        """Write the index and its id mapping atomically"""
+        path = path or self.path
+        with self._lock:
+            directory = os.path.dirname(path)
+            if directory and not os.path.exists(directory):
+                os.makedirs(directory)
+
+            meta = {
+                'kind': self.kind,
+                'dimension': self.dimension,
+                'next_label': self.next_label,
+                'tombstones': sorted(self.tombstones),
+                'candidates': [[label, candidate_id, self.hashes.get(candidate_id, '')]
+                               for candidate_id, label in self.labels.items()],
+            }
+            if self.index is not None:
+                tmp_path = f"{path}.{os.getpid()}.tmp"
+                faiss.write_index(self.index, tmp_path)
+                os.replace(tmp_path, path)
+            elif os.path.exists(path):
+                os.remove(path)
+
+            tmp_path = f"{path}.meta.{os.getpid()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(meta, f)
+            os.replace(tmp_path, f"{path}.meta.json")
+            self.path = path
+
+    @classmethod
+    def load(cls, path, **kwargs):
+        """Open a saved index, memory-mapping the vectors where FAISS supports it"""
+        instance = cls(path, **kwargs)
+        with open(f"{path}.meta.json", encoding='utf-8') as f:
+            meta = json.load(f)
+
+        instance.kind = meta['kind']
+        instance.dimension = meta['dimension']
+        instance.next_label = meta['next_label']
+        instance.tombstones = set(meta['tombstones'])
+        for label, candidate_id, text_hash in meta['candidates']:
+            instance.ids[label] = candidate_id
+            instance.labels[candidate_id] = label
+            instance.hashes[candidate_id] = text_hash
+
+        if instance.kind is not None:
+            try:
+                instance.index = faiss.read_index(path, faiss.IO_FLAG_MMAP)
+                instance.mmapped = True
+            except RuntimeError:
+                instance.index = faiss.read_index(path)
+        return instance
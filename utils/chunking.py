@@ -0,0 +1,64 @@
+import os
+import re
+
+# Words per chunk; about 350 model tokens, well inside the embedding model's context
+CHUNK_WORDS = int(os.environ.get('TALENT_CHUNK_WORDS', '256'))
+# Words repeated between consecutive windows when a section is split
+CHUNK_OVERLAP = int(os.environ.get('TALENT_CHUNK_OVERLAP', '32'))
+
+# Resume section titles that start a new chunk
+SECTION_TITLES = (
+    'summary', 'profile', 'objective', 'about me', 'experience', 'work experience',
+    'professional experience', 'employment history', 'education', 'skills',
+    'technical skills', 'projects', 'certifications', 'awards', 'publications',
+    'languages', 'interests', 'volunteer experience', 'references',
+)
+_TITLE_PATTERN = re.compile(r"^(?:%s)\s*:?$" % '|'.join(re.escape(title) for title in SECTION_TITLES), re.IGNORECASE)
+
+def _is_heading(line):
+    """A known section title, or a short line in capitals such as 'WORK HISTORY'"""
+    line = line.strip()
+    if not line or len(line.split()) > 5:
+        return False
+    return bool(_TITLE_PATTERN.match(line)) or (line.isupper() and any(c.isalpha() for c in line))
+
+def split_sections(text):
+    """Split text into sections at heading lines, each as a list of words"""
+    sections = [[]]
+    for line in str(text).splitlines():
+        if _is_heading(line) and sections[-1]:
+            sections.append([])
+        sections[-1].extend(line.split())
+    return [words for words in sections if words]
+
+def _windows(words, size, overlap):
+    step = max(1, size - overlap)
+    for start in range(0, len(words), step):
+        yield words[start:start + size]
+        if start + size >= len(words):
+            break
+
+def chunk_text(text, max_words=CHUNK_WORDS, overlap=CHUNK_OVERLAP):
+    """Split a long text into chunks of at most ``max_words`` words.
+
+    Sections are kept whole where they fit, and consecutive small sections
+    are packed into one chunk. A section longer than ``max_words`` is cut
+    into windows that overlap by ``overlap`` words. Text that fits in one
+    chunk comes back as a single chunk with its whitespace collapsed.
+    """
+    chunks = []
+    current = []
+    for words in split_sections(text):
+        if len(words) > max_words:
+            if current:
+                chunks.append(current)
+                current = []
+            chunks.extend(_windows(words, max_words, overlap))
+        elif len(current) + len(words) > max_words:
+            chunks.append(current)
+            current = list(words)
+        else:
+            current.extend(words)
+    if current:
+        chunks.append(current)
+    return [' '.join(words) for words in chunks]
@@ -1,10 +1,1074 @@
 import os
+import heapq
+import threading
+from collections import deque, namedtuple
+from datetime import datetime
+from types import MappingProxyType
+import numpy as np
 import pandas as pd
 import json
+from utils.storage import TABLE_COLUMNS, TEXT_COLUMNS, CsvBackend, SqliteBackend, write_snapshot, read_snapshot, snapshot_to_records
+from utils.export import stream_export
+from utils.records import Candidate, Job, fit_score_matrix
 
 # Paths to CSV files
 CANDIDATES_FILE = 'data/candidates.csv'
 JOBS_FILE = 'data/jobs.csv'
+MATCHES_FILE = 'data/matches.csv'
+
+# Storage backend selection: "csv" (default) or "sqlite"
+DB_BACKEND = os.environ.get('TALENT_DB_BACKEND', 'csv').lower()
+SQLITE_FILE = os.environ.get('TALENT_SQLITE_FILE', 'data/talent.db')
+
+# Arrow snapshots mirroring the CSV files for fast, memory-mapped loading ("" disables them)
+SNAPSHOT_DIR = os.environ.get('TALENT_SNAPSHOT_DIR', 'data/snapshots')
+
+def _normalize_id(value):
+    # A lone id read back as a float ('2.0') means the id 2
+    if value.endswith('.0') and value[:-2].isdigit():
+        return value[:-2]
+    return value
+
+def split_ids(value):
+    """Split a comma-joined id list such as '1, 3' into a list of id strings"""
+    if value is None or value == '':
+        return []
+    return [_normalize_id(part.strip()) for part in str(value).split(',') if part.strip()]
+
+def create_backend(name=None):
+    """Create the storage backend selected by ``name`` or TALENT_DB_BACKEND"""
+    name = (name or DB_BACKEND).lower()
+    if name == 'sqlite':
+        return SqliteBackend(SQLITE_FILE)
+    if name != 'csv':
+        print(f"Unknown database backend '{name}', falling back to CSV")
+    return CsvBackend(
+        {'candidates': CANDIDATES_FILE, 'jobs': JOBS_FILE, 'matches': MATCHES_FILE},
+        snapshot_dir=SNAPSHOT_DIR or None
+    )
+
+backend = create_backend()
+
+# One row change: position in the feed, table, 'insert'/'update'/'delete', row id,
+# new values of the changed fields and their previous values. A 'reset' event
+# (id None) means the table was dropped without a diff and derived data must be rebuilt.
+ChangeEvent = namedtuple('ChangeEvent', ['version', 'table', 'op', 'id', 'fields', 'previous'])
+
+class ChangeFeed:
+    """Process-wide stream of row-level changes to the tables.
+
+    Tables publish an event for every row they insert, update or delete,
+    whether the write came from this process or was found when reloading
+    after another process wrote. Subscribers are called synchronously in the
+    writing thread, so they should only update their own state. The last
+    ``history`` events are also kept for consumers that poll with ``since``.
+    """
+
+    def __init__(self, history=10000):
+        self._lock = threading.Lock()
+        self._version = 0
+        self._log = deque(maxlen=history)
+        self._subscribers = {}
+        self._next_token = 0
+
+    @property
+    def version(self):
+        """Version of the latest event, 0 before the first one"""
+        return self._version
+
+    def subscribe(self, callback, tables=None):
+        """Call ``callback(event)`` for every change to ``tables`` (all tables if None); returns a token"""
+        with self._lock:
+            self._next_token += 1
+            self._subscribers[self._next_token] = (callback, set(tables) if tables else None)
+            return self._next_token
+
+    def unsubscribe(self, token):
+        """Stop the subscription with the given token"""
+        with self._lock:
+            self._subscribers.pop(token, None)
+
+    def has_subscribers(self, table):
+        with self._lock:
+            return any(tables is None or table in tables for _, tables in self._subscribers.values())
+
+    def publish(self, table, changes):
+        """Record ``(op, id, fields, previous)`` changes of one table and notify subscribers"""
+        if not changes:
+            return
+        with self._lock:
+            events = []
+            for op, record_id, fields, previous in changes:
+                self._version += 1
+                events.append(ChangeEvent(self._version, table, op, record_id, fields, previous))
+            self._log.extend(events)
+            callbacks = [callback for callback, tables in self._subscribers.values() if tables is None or table in tables]
+
+        for event in events:
+            for callback in callbacks:
+                try:
+                    callback(event)
+                except Exception as e:
+                    print(f"Error in change subscriber: {e}")
+
+    def since(self, version, tables=None):
+        """Return the events after ``version``, or None if some of them are no longer kept"""
+        with self._lock:
+            oldest = self._log[0].version if self._log else self._version + 1
+            if version < oldest - 1:
+                return None
+            return [
+                event for event in self._log
+                if event.version > version and (tables is None or event.table in tables)
+            ]
+
+change_feed = ChangeFeed()
+
+def _diff_records(old_by_id, records):
+    """Return the (op, id, fields, previous) changes that turn ``old_by_id`` into ``records``"""
+    changes = []
+    seen = set()
+    for record in records:
+        record_id = str(record['id'])
+        seen.add(record_id)
+        old = old_by_id.get(record_id)
+        if old is None:
+            changes.append(('insert', record['id'], dict(record), {}))
+        elif old != record:
+            fields = {key: value for key, value in record.items() if old.get(key, '') != value}
+            if fields:
+                changes.append(('update', record['id'], fields, {key: old.get(key, '') for key in fields}))
+    for record_id, old in old_by_id.items():
+        if record_id not in seen:
+            changes.append(('delete', old['id'], {}, dict(old)))
+    return changes
+
+def _sort_key(value):
+    """Order numbers numerically before text, which is ordered case-insensitively"""
+    try:
+        return (0, float(value), '')
+    except (TypeError, ValueError):
+        return (1, 0.0, str(value).lower())
+
+class Table:
+    """Process-wide in-memory copy of one table with hash indexes.
+
+    The table is read from the storage backend once and kept together with an
+    id index and one index per field in ``indexed_fields``. Fields in
+    ``multi_valued_fields`` hold comma-joined id lists (e.g. ``matched_jobs``)
+    and are indexed per element. ``search_fields`` are the fields ``query``
+    looks in for free-text search. With a ``record_type`` the table also hands
+    out typed records built from each row once and rebuilt only when the row
+    changes.
+
+    Every read first asks the backend for the table's version (file mtime and
+    size for CSV, a change counter for SQLite) and only reloads when it moved,
+    so writes from other sessions or processes are picked up while warm reads
+    do no parsing at all. ``hits`` and ``misses`` count the outcome.
+
+    Writes are applied to the in-memory copy only when the backend reports
+    that nobody else wrote since it was loaded; otherwise the copy is marked
+    stale and reloaded on the next read. Every change, including those found
+    by diffing a reload against the previous copy, is published on
+    ``change_feed``.
+    """
+
+    def __init__(self, name, indexed_fields=(), multi_valued_fields=(), search_fields=(), record_type=None):
+        self.name = name
+        self.record_type = record_type
+        self.indexed_fields = tuple(indexed_fields)
+        self.multi_valued_fields = tuple(multi_valued_fields)
+        self.search_fields = tuple(search_fields)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.RLock()
+        self._version = None
+        self._records = None
+        self._positions = {}
+        self._by_id = {}
+        self._indexes = {}
+        self._snapshot = None
+        self._max_id = 0
+        self._search_text = {}
+        self._typed = {}
+
+    def _load(self):
+        """Read the table from the backend and rebuild every index"""
+        records = backend.read(self.name)
+
+        self._records = records
+        self._positions = {}
+        self._by_id = {}
+        self._indexes = {field: {} for field in self.indexed_fields + self.multi_valued_fields}
+        self._snapshot = None
+        self._max_id = 0
+        self._search_text = {}
+        self._typed = {}
+        for position, record in enumerate(records):
+            self._add(position, record)
+
+    def _add(self, position, record):
+        record_id = str(record['id'])
+        self._positions[record_id] = position
+        self._by_id[record_id] = record
+        self._index(record)
+        self._search_text.pop(record_id, None)
+        self._typed.pop(record_id, None)
+        try:
+            self._max_id = max(self._max_id, int(record_id))
+        except ValueError:
+            pass
+
+    def _index_keys(self, record):
+        """Yield the (field, key) pairs under which a record is indexed"""
+        for field in self.indexed_fields:
+            yield field, record.get(field, '')
+        for field in self.multi_valued_fields:
+            for value in split_ids(record.get(field, '')):
+                yield field, value
+
+    def _index(self, record):
+        record_id = str(record['id'])
+        for field, key in self._index_keys(record):
+            self._indexes[field].setdefault(key, {})[record_id] = record
+
+    def _unindex(self, record):
+        record_id = str(record['id'])
+        for field, key in self._index_keys(record):
+            bucket = self._indexes[field].get(key)
+            if bucket is not None:
+                bucket.pop(record_id, None)
+                if not bucket:
+                    del self._indexes[field][key]
+
+    def _ensure_loaded(self):
+        """Reload the table if the backend reports a different version"""
+        with self._lock:
+            version = backend.version(self.name)
+            if self._records is not None and version == self._version:
+                self.hits += 1
+                return
+            self.misses += 1
+            previous = self._by_id if self._records is not None and change_feed.has_subscribers(self.name) else None
+            self._load()
+            self._version = version
+            if previous is not None:
+                change_feed.publish(self.name, _diff_records(previous, self._records))
+
+    def refresh(self):
+        """Reload now if the backend moved, publishing what changed"""
+        with self._lock:
+            self._ensure_loaded()
+
+    def resync(self):
+        """Reload after a write that bypassed the in-memory copy, publishing what changed"""
+        with self._lock:
+            self._version = None
+            self._ensure_loaded()
+
+    def invalidate(self):
+        """Drop the in-memory copy so the next read reloads the file"""
+        with self._lock:
+            if self._records is not None:
+                change_feed.publish(self.name, [('reset', None, {}, {})])
+            self._version = None
+            self._records = None
+            self._positions = {}
+            self._by_id = {}
+            self._indexes = {}
+            self._snapshot = None
+
+    def snapshot(self):
+        """Return the current records as a tuple of read-only mappings.
+
+        The same tuple is handed out until the table changes, so repeated
+        reads cost nothing. Later writes never alter a snapshot already
+        returned.
+        """
+        with self._lock:
+            self._ensure_loaded()
+            if self._snapshot is None:
+                self._snapshot = tuple(MappingProxyType(record) for record in self._records)
+            return self._snapshot
+
+    def all(self):
+        """Return copies of every record in file order"""
+        with self._lock:
+            self._ensure_loaded()
+            return [dict(record) for record in self._records]
+
+    def project(self, columns):
+        """Return only the given columns of every record.
+
+        Served from memory when the table is loaded and current; otherwise
+        only those columns are read from the backend and nothing is cached.
+        """
+        with self._lock:
+            if self._records is not None and backend.version(self.name) == self._version:
+                self.hits += 1
+                return [{column: record.get(column, '') for column in columns} for record in self._records]
+        return [
+            {column: record.get(column, '') for column in columns}
+            for record in backend.read(self.name, columns)
+        ]
+
+    def get(self, record_id):
+        """Return a copy of the record with the given id, or None"""
+        with self._lock:
+            self._ensure_loaded()
+            record = self._by_id.get(str(record_id))
+            return dict(record) if record is not None else None
+
+    def lookup(self, field, value):
+        """Return copies of the records whose indexed ``field`` equals ``value``"""
+        with self._lock:
+            self._ensure_loaded()
+            if field in self.multi_valued_fields:
+                value = str(value)
+            return [dict(record) for record in self._indexes[field].get(value, {}).values()]
+
+    def _typed_record(self, record):
+        record_id = str(record['id'])
+        typed = self._typed.get(record_id)
+        if typed is None:
+            typed = self._typed[record_id] = self.record_type(record)
+        return typed
+
+    def typed(self, ids=None):
+        """Return typed records in file order, or for the given ids (unknown ids are skipped)"""
+        with self._lock:
+            self._ensure_loaded()
+            if ids is None:
+                records = self._records
+            else:
+                records = (self._by_id.get(str(record_id)) for record_id in ids)
+            return [self._typed_record(record) for record in records if record is not None]
+
+    def distinct(self, field):
+        """Return the sorted distinct values of an indexed field"""
+        with self._lock:
+            self._ensure_loaded()
+            return sorted(self._indexes[field], key=str)
+
+    def _text(self, record):
+        """Lower-cased search text of a record, cached until the record changes"""
+        record_id = str(record['id'])
+        text = self._search_text.get(record_id)
+        if text is None:
+            text = '\n'.join(str(record.get(field, '')) for field in self.search_fields).lower()
+            self._search_text[record_id] = text
+        return text
+
+    def query(self, where=None, ids=None, text=None, sort=None, offset=0, limit=None, columns=None):
+        """Return one page of matching records and the total number of matches.
+
+        ``where`` maps indexed fields to a value or a list of values and is
+        answered from the indexes, ``ids`` restricts the result to those
+        record ids, and ``text`` is a case-insensitive substring looked up in
+        ``search_fields``. ``sort`` names a field, prefixed with ``-`` for
+        descending order; without it records keep file order. Only the
+        records on the page are copied (projected to ``columns`` if given).
+        """
+        with self._lock:
+            self._ensure_loaded()
+
+            selected = None
+            for field, values in (where or {}).items():
+                if not isinstance(values, (list, tuple, set)):
+                    values = [values]
+                matched = set()
+                for value in values:
+                    key = str(value) if field in self.multi_valued_fields else value
+                    matched.update(self._indexes[field].get(key, {}))
+                selected = matched if selected is None else selected & matched
+            if ids is not None:
+                ids = {str(record_id) for record_id in ids} & self._by_id.keys()
+                selected = ids if selected is None else selected & ids
+
+            if selected is None:
+                records = self._records
+            else:
+                records = [self._by_id[record_id] for record_id in sorted(selected, key=self._positions.get)]
+
+            if text:
+                needle = text.lower()
+                records = [record for record in records if needle in self._text(record)]
+
+            total = len(records)
+            end = offset + limit if limit is not None else None
+            if sort:
+                field = sort.lstrip('-')
+                descending = sort.startswith('-')
+                key = lambda record: _sort_key(record.get(field, ''))
+                if end is not None and end < total:
+                    # Only the records up to the end of the page need ordering
+                    records = (heapq.nlargest if descending else heapq.nsmallest)(end, records, key=key)
+                else:
+                    records = sorted(records, key=key, reverse=descending)
+
+            page = records[offset:end]
+            if columns is not None:
+                return [{column: record.get(column, '') for column in columns} for record in page], total
+            return [dict(record) for record in page], total
+
+    def max_id(self):
+        """Return the highest numeric id in the table, or 0 when it is empty"""
+        with self._lock:
+            self._ensure_loaded()
+            return self._max_id
+
+    def allocate_ids(self, count):
+        """Reserve ``count`` new ids from the backend's persistent sequence; returns the first"""
+        with self._lock:
+            self._ensure_loaded()
+            return backend.allocate_ids(self.name, count, floor=self._max_id)
+
+    def stats(self):
+        """Return the cache hit/miss counters and the number of cached rows"""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'rows': len(self._records) if self._records is not None else 0,
+            }
+
+    def replace(self, records):
+        """Persist a new full list of records, writing only what changed where the backend allows it"""
+        with self._lock:
+            self._ensure_loaded()
+            new_ids = set()
+            changed = []
+            for record in records:
+                record_id = str(record['id'])
+                new_ids.add(record_id)
+                if self._by_id.get(record_id) != record:
+                    changed.append(record)
+            removed_ids = [record_id for record_id in self._by_id if record_id not in new_ids]
+
+            if changed or removed_ids:
+                backend.apply_changes(self.name, records, changed, removed_ids)
+                self.resync()
+
+    def _advance(self, versions):
+        """Adopt the version after our own write, or mark the copy stale if someone else wrote first.
+
+        Returns True when the in-memory copy may be updated in place. A stale
+        copy is kept so the reload can publish the differences.
+        """
+        before, after = versions
+        if before != self._version:
+            self._version = None
+            return False
+        self._version = after
+        return True
+
+    def insert(self, records):
+        """Persist new records in one batch and add them to the in-memory copy"""
+        with self._lock:
+            self._ensure_loaded()
+            if not self._advance(backend.insert(self.name, records)):
+                return
+
+            columns = list(self._records[0]) if self._records else []
+            events = []
+            for record in records:
+                record = {**{column: '' for column in columns}, **record}
+                self._records.append(record)
+                self._add(len(self._records) - 1, record)
+                events.append(('insert', record['id'], dict(record), {}))
+            self._snapshot = None
+            change_feed.publish(self.name, events)
+
+    def patch(self, changes):
+        """Apply ``{id: {field: value}}`` to existing records.
+
+        Only the affected rows are written and re-indexed. Patched rows are
+        replaced by new dictionaries rather than modified, so snapshots taken
+        earlier keep their content. Returns the ids that were patched.
+        """
+        with self._lock:
+            self._ensure_loaded()
+            changes = {
+                str(record_id): dict(fields)
+                for record_id, fields in changes.items()
+                if fields and str(record_id) in self._by_id
+            }
+            if not changes:
+                return []
+            self._apply_patch(changes, backend.update(self.name, changes))
+            return list(changes)
+
+    def _apply_patch(self, changes, versions):
+        """Mirror a patch written by the backend in memory, unless another writer got in first"""
+        with self._lock:
+            if not self._advance(versions):
+                return
+
+            events = []
+            for record_id, fields in changes.items():
+                old_record = self._by_id[record_id]
+                changed_fields = {key: value for key, value in fields.items() if old_record.get(key, '') != value}
+                if changed_fields:
+                    previous = {key: old_record.get(key, '') for key in changed_fields}
+                    events.append(('update', old_record['id'], changed_fields, previous))
+                record = {**old_record, **fields}
+                self._unindex(old_record)
+                self._by_id[record_id] = record
+                self._records[self._positions[record_id]] = record
+                self._index(record)
+                self._search_text.pop(record_id, None)
+                self._typed.pop(record_id, None)
+            self._snapshot = None
+            change_feed.publish(self.name, events)
+
+class FieldCounter:
+    """Number of rows per value of one field, kept current from the change feed.
+
+    Counted once from the table on first use, then adjusted per change event.
+    With ``split`` the field holds a comma-separated list and every element
+    is counted (e.g. skills).
+    """
+
+    def __init__(self, table, field, split=False):
+        self.table = table
+        self.field = field
+        self.split = split
+        self._lock = threading.Lock()
+        self._counts = None
+        change_feed.subscribe(self._on_change, tables=(table.name,))
+
+    def _values(self, value):
+        if not self.split:
+            return [value]
+        return [part.strip() for part in str(value).split(',') if part.strip()]
+
+    def _adjust(self, value, delta):
+        for key in self._values(value):
+            count = self._counts.get(key, 0) + delta
+            if count > 0:
+                self._counts[key] = count
+            else:
+                self._counts.pop(key, None)
+
+    def _on_change(self, event):
+        with self._lock:
+            if self._counts is None:
+                return
+            if event.op == 'reset':
+                self._counts = None
+                return
+            if event.op == 'delete' or (event.op == 'update' and self.field in event.fields):
+                self._adjust(event.previous.get(self.field, ''), -1)
+            if event.op in ('insert', 'update') and self.field in event.fields:
+                self._adjust(event.fields[self.field], 1)
+
+    def counts(self):
+        """Return ``{value: count}``"""
+        with self.table._lock:
+            # Picks up writes from other processes as change events
+            self.table.refresh()
+            with self._lock:
+                if self._counts is None:
+                    self._counts = {}
+                    for record in self.table._records:
+                        self._adjust(record.get(self.field, ''), 1)
+                return dict(self._counts)
+
+def _without_id(fields):
+    return {key: value for key, value in fields.items() if key != 'id'}
+
+class ScoreStore:
+    """Fit score of every (open job, candidate) pair, kept current from the change feed.
+
+    Scores live in one dense float32 matrix with a row per open job and a
+    column per candidate, computed in vectorized blocks by
+    ``records.fit_score_matrix``. Changed candidates recompute only their
+    columns and changed jobs only their rows; deleted candidates and closed
+    jobs free their slot. The matrix is built on first use and again after
+    a 'reset' event.
+
+    Change events only queue ids; they are applied on the next read, after
+    which ``top_candidates`` is a partial sort of one row.
+    """
+
+    def __init__(self, candidates, jobs, open_statuses=('Open',)):
+        self.candidates = candidates
+        self.jobs = jobs
+        self.open_statuses = tuple(open_statuses)
+        self._lock = threading.Lock()
+        self._pending_lock = threading.Lock()
+        self._reset = True
+        self._pending_candidates = set()
+        self._pending_jobs = set()
+        self._scores = np.full((0, 0), -np.inf, dtype=np.float32)
+        self._job_ids, self._job_rows, self._job_records, self._free_rows = [], {}, [], []
+        self._candidate_ids, self._candidate_columns, self._free_columns = [], {}, []
+        change_feed.subscribe(self._on_change, tables=(candidates.name, jobs.name))
+
+    def _on_change(self, event):
+        with self._pending_lock:
+            if event.op == 'reset':
+                self._reset = True
+            elif event.table == self.candidates.name:
+                self._pending_candidates.add(str(event.id))
+            else:
+                self._pending_jobs.add(str(event.id))
+
+    def _open_job_records(self, ids=None):
+        """Typed records of the open jobs, all of them or among ``ids``"""
+        open_ids = [
+            str(job['id']) for status in self.open_statuses for job in self.jobs.lookup('status', status)
+            if ids is None or str(job['id']) in ids
+        ]
+        return self.jobs.typed(open_ids)
+
+    def _resize(self, rows, columns):
+        """Grow the matrix to at least ``rows`` x ``columns``, doubling to keep appends cheap"""
+        old_rows, old_columns = self._scores.shape
+        if rows <= old_rows and columns <= old_columns:
+            return
+        new_rows = max(rows, old_rows * 2 if rows > old_rows else old_rows)
+        new_columns = max(columns, old_columns * 2 if columns > old_columns else old_columns)
+        scores = np.full((new_rows, new_columns), -np.inf, dtype=np.float32)
+        scores[:old_rows, :old_columns] = self._scores
+        self._scores = scores
+
+    def _build(self):
+        candidates = self.candidates.typed()
+        jobs = self._open_job_records()
+        self._job_ids = [str(job.id) for job in jobs]
+        self._job_rows = {job_id: row for row, job_id in enumerate(self._job_ids)}
+        self._job_records = list(jobs)
+        self._free_rows = []
+        self._candidate_ids = [str(candidate.id) for candidate in candidates]
+        self._candidate_columns = {candidate_id: column for column, candidate_id in enumerate(self._candidate_ids)}
+        self._free_columns = []
+        self._scores = np.ascontiguousarray(fit_score_matrix(candidates, jobs).T)
+
+    def _set_jobs(self, jobs):
+        """Apply ``{job_id: Job or None}``; None frees the job's row, other jobs get their row re-scored"""
+        rows = []
+        for job_id, job in jobs.items():
+            row = self._job_rows.get(job_id)
+            if job is None:
+                if row is not None:
+                    del self._job_rows[job_id]
+                    self._job_ids[row] = None
+                    self._job_records[row] = None
+                    self._scores[row] = -np.inf
+                    self._free_rows.append(row)
+                continue
+            if row is None:
+                if self._free_rows:
+                    row = self._free_rows.pop()
+                else:
+                    row = len(self._job_ids)
+                    self._job_ids.append(None)
+                    self._job_records.append(None)
+                    self._resize(row + 1, self._scores.shape[1])
+                self._job_rows[job_id] = row
+                self._job_ids[row] = job_id
+            self._job_records[row] = job
+            rows.append(row)
+        if not rows:
+            return
+
+        # Candidates inserted since the pending ids were taken get their column, scored
+        # against every open job, when their own insert event is applied
+        candidates = [
+            candidate for candidate in self.candidates.typed()
+            if str(candidate.id) in self._candidate_columns
+        ]
+        columns = np.array([self._candidate_columns[str(candidate.id)] for candidate in candidates], dtype=np.intp)
+        scores = fit_score_matrix(candidates, [self._job_records[row] for row in rows])
+        for position, row in enumerate(rows):
+            self._scores[row] = -np.inf
+            self._scores[row, columns] = scores[:, position]
+
+    def _set_candidates(self, candidates):
+        """Apply ``{candidate_id: Candidate or None}``; None frees the column, others get it re-scored"""
+        columns = []
+        records = []
+        for candidate_id, candidate in candidates.items():
+            column = self._candidate_columns.get(candidate_id)
+            if candidate is None:
+                if column is not None:
+                    del self._candidate_columns[candidate_id]
+                    self._candidate_ids[column] = None
+                    self._scores[:, column] = -np.inf
+                    self._free_columns.append(column)
+                continue
+            if column is None:
+                if self._free_columns:
+                    column = self._free_columns.pop()
+                else:
+                    column = len(self._candidate_ids)
+                    self._candidate_ids.append(None)
+                    self._resize(self._scores.shape[0], column + 1)
+                self._candidate_columns[candidate_id] = column
+                self._candidate_ids[column] = candidate_id
+            columns.append(column)
+            records.append(candidate)
+        rows = [row for row, job in enumerate(self._job_records) if job is not None]
+        if not records or not rows:
+            return
+
+        scores = fit_score_matrix(records, [self._job_records[row] for row in rows])
+        self._scores[np.ix_(rows, columns)] = scores.T
+
+    def _ensure_current(self):
+        # Picks up writes from other processes as change events
+        self.candidates.refresh()
+        self.jobs.refresh()
+        with self._pending_lock:
+            reset, candidate_ids, job_ids = self._reset, self._pending_candidates, self._pending_jobs
+            self._reset, self._pending_candidates, self._pending_jobs = False, set(), set()
+
+        try:
+            if reset:
+                self._build()
+                return
+            # Candidates first, so re-scored job rows see every current column
+            if candidate_ids:
+                candidates = {str(candidate.id): candidate for candidate in self.candidates.typed(candidate_ids)}
+                self._set_candidates({candidate_id: candidates.get(candidate_id) for candidate_id in candidate_ids})
+            if job_ids:
+                jobs = {str(job.id): job for job in self._open_job_records(job_ids)}
+                self._set_jobs({job_id: jobs.get(job_id) for job_id in job_ids})
+        except Exception:
+            # Keep the ids so the next read applies them again instead of serving stale scores
+            with self._pending_lock:
+                self._reset = self._reset or reset
+                self._pending_candidates |= candidate_ids
+                self._pending_jobs |= job_ids
+            raise
+
+    def _top(self, scores, ids, k):
+        columns = np.flatnonzero(scores > -np.inf)
+        if k is not None and k < len(columns):
+            columns = columns[np.argpartition(-scores[columns], k - 1)[:k]]
+        columns = columns[np.argsort(-scores[columns], kind='stable')]
+        # fit_score rounds to two decimals; undo the float32 widening
+        return [(ids[column], round(float(scores[column]), 2)) for column in columns]
+
+    def top_candidates(self, job_id, k=10):
+        """Return the ``k`` best (candidate_id, fit score) pairs for an open job, best first"""
+        with self._lock:
+            self._ensure_current()
+            row = self._job_rows.get(str(job_id))
+            if row is None:
+                return []
+            return self._top(self._scores[row, :len(self._candidate_ids)], self._candidate_ids, k)
+
+    def score(self, candidate_id, job_id):
+        """Stored fit score of one pair, or None if the candidate or open job is unknown"""
+        with self._lock:
+            self._ensure_current()
+            row = self._job_rows.get(str(job_id))
+            column = self._candidate_columns.get(str(candidate_id))
+            if row is None or column is None:
+                return None
+            return round(float(self._scores[row, column]), 2)
+
+class MatchTable:
+    """In-memory candidate<->job match relation indexed in both directions.
+
+    Each match is a (candidate_id, job_id, score, matched_at) row. The first
+    load seeds the relation from the legacy ``matched_jobs`` column when the
+    backend has none yet. Every change also rewrites ``matched_jobs`` on the
+    affected candidates, so that column stays a compatible export.
+
+    Changes are published on ``change_feed`` as table ``matches`` with
+    ``(candidate_id, job_id)`` ids, and the matches of a deleted candidate or
+    job are dropped when its delete event arrives.
+    """
+
+    def __init__(self, candidates):
+        self.candidates = candidates
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.RLock()
+        self._version = None
+        self._by_candidate = None
+        self._by_job = {}
+        self._deleted = deque()
+
+    def _seed_rows(self, candidates=None):
+        """Build match rows from the matched_jobs column of every candidate, or of ``candidates``"""
+        rows = []
+        for candidate in self.candidates.snapshot() if candidates is None else candidates:
+            for job_id in split_ids(candidate.get('matched_jobs', '')):
+                rows.append({
+                    'candidate_id': str(candidate['id']),
+                    'job_id': job_id,
+                    'score': float(candidate.get('score') or 0),
+                    'matched_at': '',
+                })
+        return rows
+
+    def _ensure_loaded(self):
+        with self._lock:
+            version = backend.version('matches')
+            if self._by_candidate is not None and version == self._version:
+                self.hits += 1
+                if self._deleted:
+                    self._drop_deleted()
+                return
+            self.misses += 1
+
+            rows = backend.read_matches()
+            if rows is None:
+                rows = self._seed_rows()
+                backend.write_matches(rows)
+                version = backend.version('matches')
+
+            previous = None
+            if self._by_candidate is not None and change_feed.has_subscribers('matches'):
+                previous = {
+                    str((row['candidate_id'], row['job_id'])): dict(row, id=(row['candidate_id'], row['job_id']))
+                    for bucket in self._by_candidate.values() for row in bucket.values()
+                }
+
+            self._by_candidate = {}
+            self._by_job = {}
+            for row in rows:
+                self._add(row)
+            self._version = version
+
+            if previous is not None:
+                current = [dict(row, id=(row['candidate_id'], row['job_id'])) for row in rows]
+                change_feed.publish('matches', [
+                    (op, pair, _without_id(fields), _without_id(old))
+                    for op, pair, fields, old in _diff_records(previous, current)
+                ])
+            if self._deleted:
+                self._drop_deleted()
+
+    def _add(self, row):
+        self._by_candidate.setdefault(row['candidate_id'], {})[row['job_id']] = row
+        self._by_job.setdefault(row['job_id'], {})[row['candidate_id']] = row
+
+    def _remove(self, candidate_id, job_id):
+        for index, outer, inner in ((self._by_candidate, candidate_id, job_id), (self._by_job, job_id, candidate_id)):
+            bucket = index.get(outer)
+            if bucket is not None:
+                bucket.pop(inner, None)
+                if not bucket:
+                    del index[outer]
+
+    def invalidate(self):
+        """Drop the in-memory copy so the next read reloads it"""
+        with self._lock:
+            self._version = None
+            self._by_candidate = None
+            self._by_job = {}
+            self._deleted.clear()
+
+    def _advance(self, versions):
+        """Adopt the version after our own write, or mark the copy stale if someone else wrote first"""
+        before, after = versions
+        if before != self._version:
+            self._version = None
+            return False
+        self._version = after
+        return True
+
+    def on_change(self, event):
+        """Queue the matches of a deleted candidate or job for removal.
+
+        Runs under the candidates/jobs table lock, so the removal itself
+        happens on the next access to the match table.
+        """
+        if event.op == 'delete':
+            self._deleted.append((event.table, str(event.id)))
+
+    def _drop_deleted(self):
+        pairs = []
+        while self._deleted:
+            table, record_id = self._deleted.popleft()
+            if table == 'candidates':
+                pairs.extend((record_id, job_id) for job_id in self._by_candidate.get(record_id, {}))
+            else:
+                pairs.extend((candidate_id, record_id) for candidate_id in self._by_job.get(record_id, {}))
+        if pairs:
+            self.remove(pairs)
+
+    def for_job(self, job_id):
+        """Return copies of the matches of one job"""
+        with self._lock:
+            self._ensure_loaded()
+            return [dict(row) for row in self._by_job.get(str(job_id), {}).values()]
+
+    def for_candidate(self, candidate_id):
+        """Return copies of the matches of one candidate"""
+        with self._lock:
+            self._ensure_loaded()
+            return [dict(row) for row in self._by_candidate.get(str(candidate_id), {}).values()]
+
+    def stats(self):
+        """Return the cache hit/miss counters and the number of cached rows"""
+        with self._lock:
+            rows = sum(len(bucket) for bucket in self._by_candidate.values()) if self._by_candidate else 0
+            return {'hits': self.hits, 'misses': self.misses, 'rows': rows}
+
+    def _sync_candidates(self, candidate_ids):
+        """Rewrite the matched_jobs export column of the given candidates"""
+        self._ensure_loaded()
+        changes = {}
+        for candidate_id in candidate_ids:
+            matched_jobs = ', '.join(self._by_candidate.get(candidate_id, {}))
+            candidate = self.candidates.get(candidate_id)
+            if candidate is not None and str(candidate.get('matched_jobs', '')) != matched_jobs:
+                changes[candidate_id] = {'matched_jobs': matched_jobs}
+        if changes:
+            self.candidates.patch(changes)
+
+    def _upsert_rows(self, matches):
+        """Match rows for ``(candidate_id, job_id, score)`` tuples and the events they will publish"""
+        now = datetime.now().isoformat(timespec='seconds')
+        rows = []
+        events = []
+        for candidate_id, job_id, score in matches:
+            candidate_id, job_id = str(candidate_id), str(job_id)
+            existing = self._by_candidate.get(candidate_id, {}).get(job_id)
+            row = {
+                'candidate_id': candidate_id,
+                'job_id': job_id,
+                'score': float(score),
+                'matched_at': existing['matched_at'] if existing else now,
+            }
+            rows.append(row)
+            if existing is None:
+                events.append(('insert', (candidate_id, job_id), dict(row), {}))
+            elif existing['score'] != row['score']:
+                events.append(('update', (candidate_id, job_id), {'score': row['score']}, {'score': existing['score']}))
+        return rows, events
+
+    def upsert(self, matches):
+        """Insert or update ``(candidate_id, job_id, score)`` matches"""
+        with self._lock:
+            self._ensure_loaded()
+            rows, events = self._upsert_rows(matches)
+            if not rows:
+                return
+
+            if self._advance(backend.upsert_matches(rows)):
+                for row in rows:
+                    self._add(row)
+                change_feed.publish('matches', events)
+            self._sync_candidates({row['candidate_id'] for row in rows})
+
+    def record_results(self, matches, changes):
+        """Upsert matches and apply candidate field ``changes`` in one backend transaction.
+
+        The ``matched_jobs`` export column of every candidate gaining a match
+        is folded into the same write instead of a second patch.
+        """
+        with self._lock:
+            self._ensure_loaded()
+            rows, events = self._upsert_rows(matches)
+            changes = {str(candidate_id): dict(fields) for candidate_id, fields in changes.items() if fields}
+            matched_jobs = {}
+            for row in rows:
+                job_ids = matched_jobs.get(row['candidate_id'])
+                if job_ids is None:
+                    job_ids = matched_jobs[row['candidate_id']] = dict.fromkeys(self._by_candidate.get(row['candidate_id'], {}))
+                job_ids[row['job_id']] = None
+
+            with self.candidates._lock:
+                self.candidates._ensure_loaded()
+                for candidate_id, job_ids in matched_jobs.items():
+                    candidate = self.candidates._by_id.get(candidate_id)
+                    if candidate is not None and str(candidate.get('matched_jobs', '')) != ', '.join(job_ids):
+                        changes.setdefault(candidate_id, {})['matched_jobs'] = ', '.join(job_ids)
+                changes = {
+                    candidate_id: fields for candidate_id, fields in changes.items()
+                    if candidate_id in self.candidates._by_id
+                }
+                if not rows and not changes:
+                    return
+                versions = backend.write_match_results(changes, rows)
+                self.candidates._apply_patch(changes, versions['candidates'])
+            if self._advance(versions['matches']):
+                for row in rows:
+                    self._add(row)
+                change_feed.publish('matches', events)
+
+    def remove(self, pairs):
+        """Remove matches given as (candidate_id, job_id) pairs"""
+        with self._lock:
+            self._ensure_loaded()
+            pairs = [
+                (str(candidate_id), str(job_id)) for candidate_id, job_id in pairs
+                if str(job_id) in self._by_candidate.get(str(candidate_id), {})
+            ]
+            if not pairs:
+                return
+
+            events = [
+                ('delete', (candidate_id, job_id), {}, dict(self._by_candidate[candidate_id][job_id]))
+                for candidate_id, job_id in pairs
+            ]
+            if self._advance(backend.delete_matches(pairs)):
+                for candidate_id, job_id in pairs:
+                    self._remove(candidate_id, job_id)
+                change_feed.publish('matches', events)
+            self._sync_candidates({candidate_id for candidate_id, _ in pairs})
+
+# Shared tables, loaded lazily on first access
+candidates_table = Table(
+    'candidates', indexed_fields=('status',), search_fields=('name', 'skills', 'current_role'), record_type=Candidate
+)
+jobs_table = Table(
+    'jobs', indexed_fields=('status', 'department'), search_fields=('title', 'skills_required'), record_type=Job
+)
+matches_table = MatchTable(candidates_table)
+change_feed.subscribe(matches_table.on_change, tables=('candidates', 'jobs'))
+
+# Dashboard aggregates
+candidate_status_counts = FieldCounter(candidates_table, 'status')
+candidate_skill_counts = FieldCounter(candidates_table, 'skills', split=True)
+
+# Candidate-job fit scores for the open jobs
+score_store = ScoreStore(candidates_table, jobs_table)
+
+def set_backend(new_backend):
+    """Switch the storage backend used by every table"""
+    global backend
+    backend = new_backend
+    candidates_table.invalidate()
+    jobs_table.invalidate()
+    matches_table.invalidate()
+
+def migrate_csv_to_sqlite(sqlite_file=None, candidates_file=None, jobs_file=None, matches_file=None):
+    """Copy the CSV tables into an SQLite database, replacing its content.
+
+    The CSV files are left untouched so the migration can be re-run or rolled
+    back. Returns the number of rows copied per table.
+    """
+    source = CsvBackend({
+        'candidates': candidates_file or CANDIDATES_FILE,
+        'jobs': jobs_file or JOBS_FILE,
+        'matches': matches_file or MATCHES_FILE,
+    })
+    target = SqliteBackend(sqlite_file or SQLITE_FILE)
+
+    counts = {}
+    for table in ('candidates', 'jobs'):
+        records = source.read(table)
+        target.write_all(table, records)
+        counts[table] = target.count(table)
+        if counts[table] != len(records):
+            raise RuntimeError(
+                f"Migration of {table} copied {counts[table]} of {len(records)} rows"
+            )
+
+    # Without a match file yet, the SQLite side seeds itself from matched_jobs
+    matches = source.read_matches()
+    if matches is not None:
+        target.write_matches(matches)
+        counts['matches'] = len(matches)
+    return counts
 
 def setup_database():
     """Ensures the database files exist and are properly formatted"""
@@ -22,24 +1086,54 @@ def setup_database():
     else:
         print("Database files already exist.")
 
-def get_candidates():
-    """Retrieve all candidates from the database"""
+    # First start on SQLite: import the existing CSV data once
+    if isinstance(backend, SqliteBackend) and backend.count('candidates') == 0 and backend.count('jobs') == 0:
+        if os.path.exists(CANDIDATES_FILE) and os.path.exists(JOBS_FILE):
+            print("Migrating CSV data to SQLite...")
+            counts = migrate_csv_to_sqlite(backend.path)
+            print(f"Migrated {counts['candidates']} candidates and {counts['jobs']} jobs.")
+            set_backend(backend)
+
+def get_candidates(columns=None):
+    """Retrieve all candidates from the database, optionally only the given columns"""
     try:
-        df = pd.read_csv(CANDIDATES_FILE)
-        # Convert DataFrame to list of dictionaries
-        candidates = df.fillna('').to_dict('records')
-        return candidates
+        if columns is not None:
+            return candidates_table.project(columns)
+        return candidates_table.all()
     except Exception as e:
         print(f"Error loading candidates: {e}")
         return []
 
-def get_jobs():
-    """Retrieve all jobs from the database"""
+def get_candidates_snapshot():
+    """Retrieve all candidates as a read-only snapshot (no copying on warm reads)"""
+    try:
+        return candidates_table.snapshot()
+    except Exception as e:
+        print(f"Error loading candidates: {e}")
+        return ()
+
+def get_jobs_snapshot():
+    """Retrieve all jobs as a read-only snapshot (no copying on warm reads)"""
+    try:
+        return jobs_table.snapshot()
+    except Exception as e:
+        print(f"Error loading jobs: {e}")
+        return ()
+
+def get_cache_stats():
+    """Return read cache hit/miss counters per table"""
+    return {
+        'candidates': candidates_table.stats(),
+        'jobs': jobs_table.stats(),
+        'matches': matches_table.stats(),
+    }
+
+def get_jobs(columns=None):
+    """Retrieve all jobs from the database, optionally only the given columns"""
     try:
-        df = pd.read_csv(JOBS_FILE)
-        # Convert DataFrame to list of dictionaries
-        jobs = df.fillna('').to_dict('records')
-        return jobs
+        if columns is not None:
+            return jobs_table.project(columns)
+        return jobs_table.all()
     except Exception as e:
         print(f"Error loading jobs: {e}")
         return []
@@ -47,8 +1141,7 @@ def get_jobs():
 def update_candidates(candidates):
     """Update the candidates in the database"""
     try:
-        df = pd.DataFrame(candidates)
-        df.to_csv(CANDIDATES_FILE, index=False)
+        candidates_table.replace(candidates)
         return True
     except Exception as e:
         print(f"Error updating candidates: {e}")
@@ -57,69 +1150,450 @@ def update_candidates(candidates):
 def update_jobs(jobs):
     """Update the jobs in the database"""
     try:
-        df = pd.DataFrame(jobs)
-        df.to_csv(JOBS_FILE, index=False)
+        jobs_table.replace(jobs)
         return True
     except Exception as e:
         print(f"Error updating jobs: {e}")
         return False
 
+def update_candidate_fields(candidate_id, **fields):
+    """Update selected fields of one candidate without rewriting the others"""
+    try:
+        return bool(candidates_table.patch({candidate_id: fields}))
+    except Exception as e:
+        print(f"Error updating candidate {candidate_id}: {e}")
+        return False
+
+def patch_candidates(changes):
+    """Update several candidates at once from a ``{candidate_id: {field: value}}`` mapping"""
+    try:
+        candidates_table.patch(changes)
+        return True
+    except Exception as e:
+        print(f"Error updating candidates: {e}")
+        return False
+
+def query_candidates(status=None, job_id=None, text=None, sort=None, offset=0, limit=50, columns=None):
+    """Return ``(page, total)``: up to ``limit`` candidates from ``offset`` matching every given filter, and the number of matches.
+
+    ``status`` may be one value or a list, ``job_id`` keeps candidates matched
+    to that job, ``text`` searches name, skills and current role, and
+    ``sort`` names a field (``-score`` sorts descending).
+    """
+    try:
+        ids = None
+        if job_id not in (None, ''):
+            ids = [match['candidate_id'] for match in matches_table.for_job(job_id)]
+        where = {'status': status} if status else None
+        return candidates_table.query(where, ids, text, sort, offset, limit, columns)
+    except Exception as e:
+        print(f"Error querying candidates: {e}")
+        return [], 0
+
+def query_jobs(department=None, status=None, text=None, sort=None, offset=0, limit=50, columns=None):
+    """Return ``(page, total)`` for jobs filtered by department, status and title/skills text"""
+    try:
+        where = {}
+        if department:
+            where['department'] = department
+        if status:
+            where['status'] = status
+        return jobs_table.query(where, None, text, sort, offset, limit, columns)
+    except Exception as e:
+        print(f"Error querying jobs: {e}")
+        return [], 0
+
+def subscribe_changes(callback, tables=None):
+    """Call ``callback(event)`` for every ChangeEvent of the given tables; returns a token for unsubscribe_changes"""
+    return change_feed.subscribe(callback, tables)
+
+def unsubscribe_changes(token):
+    """Cancel a subscribe_changes subscription"""
+    change_feed.unsubscribe(token)
+
+def get_changes_since(version, tables=None):
+    """Return ``(events, latest_version)``; events is None when ``version`` is too old and a full reload is needed"""
+    for table in (candidates_table, jobs_table):
+        if tables is None or table.name in tables:
+            table.refresh()
+    return change_feed.since(version, tables), change_feed.version
+
+def get_candidate_status_counts():
+    """Return the number of candidates per status"""
+    try:
+        return candidate_status_counts.counts()
+    except Exception as e:
+        print(f"Error counting candidate statuses: {e}")
+        return {}
+
+def get_candidate_skill_counts():
+    """Return the number of candidates per skill"""
+    try:
+        return candidate_skill_counts.counts()
+    except Exception as e:
+        print(f"Error counting candidate skills: {e}")
+        return {}
+
+def top_candidates(job_id, k=10):
+    """Return the ``k`` best-fitting (candidate_id, score) pairs for an open job"""
+    try:
+        return score_store.top_candidates(job_id, k)
+    except Exception as e:
+        print(f"Error ranking candidates for job: {e}")
+        return []
+
+def get_candidate_statuses():
+    """Return the distinct candidate statuses"""
+    try:
+        return candidates_table.distinct('status')
+    except Exception as e:
+        print(f"Error retrieving candidate statuses: {e}")
+        return []
+
+def get_job_departments():
+    """Return the distinct job departments"""
+    try:
+        return jobs_table.distinct('department')
+    except Exception as e:
+        print(f"Error retrieving job departments: {e}")
+        return []
+
 def get_candidate_by_id(candidate_id):
     """Get a specific candidate by ID"""
-    candidates = get_candidates()
-    candidate = next((c for c in candidates if str(c['id']) == str(candidate_id)), None)
-    return candidate
+    try:
+        return candidates_table.get(candidate_id)
+    except Exception as e:
+        print(f"Error loading candidates: {e}")
+        return None
 
 def get_job_by_id(job_id):
     """Get a specific job by ID"""
-    jobs = get_jobs()
-    job = next((j for j in jobs if str(j['id']) == str(job_id)), None)
-    return job
+    try:
+        return jobs_table.get(job_id)
+    except Exception as e:
+        print(f"Error loading jobs: {e}")
+        return None
+
+def get_candidate_records(ids=None):
+    """Return typed Candidate records for every candidate, or for the given ids"""
+    try:
+        return candidates_table.typed(ids)
+    except Exception as e:
+        print(f"Error loading candidate records: {e}")
+        return []
+
+def get_candidate_records_for_job(job_id):
+    """Return typed Candidate records of the candidates matched to a job"""
+    try:
+        return candidates_table.typed([match['candidate_id'] for match in matches_table.for_job(job_id)])
+    except Exception as e:
+        print(f"Error loading candidate records: {e}")
+        return []
+
+def get_job_record(job_id):
+    """Return the typed Job record with the given id, or None"""
+    try:
+        records = jobs_table.typed([job_id])
+        return records[0] if records else None
+    except Exception as e:
+        print(f"Error loading job record: {e}")
+        return None
 
 def get_candidates_for_job(job_id):
     """Get all candidates matched to a specific job"""
-    candidates = get_candidates()
-    matched_candidates = [
-        c for c in candidates 
-        if 'matched_jobs' in c and c['matched_jobs'] and str(job_id) in c['matched_jobs'].split(', ')
-    ]
-    return matched_candidates
+    try:
+        candidates = (candidates_table.get(match['candidate_id']) for match in matches_table.for_job(job_id))
+        return [c for c in candidates if c is not None]
+    except Exception as e:
+        print(f"Error loading candidates: {e}")
+        return []
+
+def get_jobs_for_candidate(candidate_id):
+    """Get all jobs a specific candidate is matched to"""
+    try:
+        jobs = (jobs_table.get(match['job_id']) for match in matches_table.for_candidate(candidate_id))
+        return [j for j in jobs if j is not None]
+    except Exception as e:
+        print(f"Error loading jobs: {e}")
+        return []
+
+def get_matches_for_job(job_id):
+    """Get the match rows (candidate_id, job_id, score, matched_at) of a job"""
+    try:
+        return matches_table.for_job(job_id)
+    except Exception as e:
+        print(f"Error loading matches: {e}")
+        return []
+
+def get_matches_for_candidate(candidate_id):
+    """Get the match rows (candidate_id, job_id, score, matched_at) of a candidate"""
+    try:
+        return matches_table.for_candidate(candidate_id)
+    except Exception as e:
+        print(f"Error loading matches: {e}")
+        return []
+
+def add_matches(matches):
+    """Record ``(candidate_id, job_id, score)`` matches, updating the score of existing ones"""
+    try:
+        matches_table.upsert(matches)
+        return True
+    except Exception as e:
+        print(f"Error updating matches: {e}")
+        return False
+
+def record_match_results(matches, changes):
+    """Record ``(candidate_id, job_id, score)`` matches and candidate ``{id: {field: value}}`` changes in one write"""
+    try:
+        matches_table.record_results(matches, changes)
+        return True
+    except Exception as e:
+        print(f"Error recording match results: {e}")
+        return False
+
+def add_match(candidate_id, job_id, score):
+    """Record that a candidate matches a job"""
+    return add_matches([(candidate_id, job_id, score)])
+
+def set_candidate_matches(candidate_id, matches):
+    """Replace all matches of a candidate with ``(job_id, score)`` pairs"""
+    try:
+        new_job_ids = {str(job_id) for job_id, _ in matches}
+        stale = [
+            (candidate_id, match['job_id']) for match in matches_table.for_candidate(candidate_id)
+            if match['job_id'] not in new_job_ids
+        ]
+        matches_table.remove(stale)
+        matches_table.upsert([(candidate_id, job_id, score) for job_id, score in matches])
+        return True
+    except Exception as e:
+        print(f"Error updating matches: {e}")
+        return False
 
 def get_candidates_by_status(status):
     """Get all candidates with a specific status"""
-    candidates = get_candidates()
-    filtered_candidates = [c for c in candidates if c.get('status') == status]
-    return filtered_candidates
+    try:
+        return candidates_table.lookup('status', status)
+    except Exception as e:
+        print(f"Error loading candidates: {e}")
+        return []
+
+def _filtered_rows(records, filters):
+    """Yield the records matching every ``{field: value}`` (or ``{field: [values]}``) filter"""
+    conditions = []
+    for field, value in (filters or {}).items():
+        if isinstance(value, (list, tuple, set, frozenset)):
+            conditions.append((field, {str(v) for v in value}))
+        else:
+            conditions.append((field, {str(value)}))
+
+    for record in records:
+        if all(str(record.get(field, '')) in allowed for field, allowed in conditions):
+            yield record
+
+def _export_columns(records, columns):
+    if columns:
+        return list(columns)
+    return list(records[0].keys()) if records else []
+
+def iter_candidates_export(fmt='csv', columns=None, filters=None, chunk_size=5000):
+    """Stream the candidates table as byte chunks in 'csv', 'csv.gz' or 'xlsx' format.
+
+    ``columns`` selects and orders the exported fields. ``filters`` maps
+    fields to a value or list of values; the extra key ``job_id`` keeps only
+    candidates matched to that job.
+    """
+    filters = dict(filters or {})
+    job_id = filters.pop('job_id', None)
+
+    records = candidates_table.snapshot()
+    if job_id is not None:
+        job_ids = job_id if isinstance(job_id, (list, tuple, set)) else [job_id]
+        matched_ids = {match['candidate_id'] for j in job_ids for match in matches_table.for_job(j)}
+        filters['id'] = matched_ids
+
+    return stream_export(_filtered_rows(records, filters), _export_columns(records, columns), fmt, chunk_size)
+
+def iter_jobs_export(fmt='csv', columns=None, filters=None, chunk_size=5000):
+    """Stream the jobs table as byte chunks in 'csv', 'csv.gz' or 'xlsx' format"""
+    records = jobs_table.snapshot()
+    return stream_export(_filtered_rows(records, filters), _export_columns(records, columns), fmt, chunk_size)
 
 def export_candidates_csv():
     """Export candidates data as CSV"""
-    candidates = get_candidates()
-    df = pd.DataFrame(candidates)
-    return df.to_csv(index=False)
+    return b''.join(iter_candidates_export('csv')).decode('utf-8')
 
 def export_jobs_csv():
     """Export jobs data as CSV"""
-    jobs = get_jobs()
-    df = pd.DataFrame(jobs)
-    return df.to_csv(index=False)
+    return b''.join(iter_jobs_export('csv')).decode('utf-8')
+
+def _read_table_file(path):
+    """Read a .csv, .arrow/.feather or .parquet file into a list of records"""
+    if path.endswith('.csv'):
+        # Id lists such as '6' or '1, 3' stay text rather than becoming numbers
+        return pd.read_csv(path, dtype=TEXT_COLUMNS).fillna('').to_dict('records')
+    return snapshot_to_records(read_snapshot(path))
+
+def export_table_file(table_name, path):
+    """Write the candidates or jobs table to a .csv, .arrow/.feather or .parquet file"""
+    table = {'candidates': candidates_table, 'jobs': jobs_table}[table_name]
+    try:
+        records = table.all()
+        if path.endswith('.csv'):
+            pd.DataFrame(records).to_csv(path, index=False)
+        else:
+            write_snapshot(records, path)
+        return True
+    except Exception as e:
+        print(f"Error exporting {table_name}: {e}")
+        return False
+
+def import_table_file(table_name, path):
+    """Replace the candidates or jobs table with a .csv, .arrow/.feather or .parquet file"""
+    table = {'candidates': candidates_table, 'jobs': jobs_table}[table_name]
+    try:
+        records = _read_table_file(path)
+        with matches_table._lock, table._lock:
+            backend.write_all(table_name, records)
+            if table_name == 'candidates':
+                # The match relation follows the imported matched_jobs column
+                backend.write_matches(matches_table._seed_rows(records))
+                matches_table.invalidate()
+            # Derived caches (fit scores, field counts, indexes) rebuild on the reset event
+            table.invalidate()
+        return True
+    except Exception as e:
+        print(f"Error importing {table_name}: {e}")
+        return False
 
 def add_custom_candidate(candidate_data):
     """Add a new candidate to the database"""
-    candidates = get_candidates()
-    
-    # Generate a new ID
-    max_id = max([int(c['id']) for c in candidates]) if candidates else 0
-    candidate_data['id'] = max_id + 1
-    
-    # Set default values
-    if 'status' not in candidate_data:
-        candidate_data['status'] = 'Available'
-    if 'score' not in candidate_data:
-        candidate_data['score'] = 0.0
-    
-    # Add to the candidates list
-    candidates.append(candidate_data)
-    
-    # Update the database
-    success = update_candidates(candidates)
-    return success, candidate_data
+    try:
+        # Generate a new ID
+        candidate_data['id'] = candidates_table.allocate_ids(1)
+        
+        # Set default values
+        if 'status' not in candidate_data:
+            candidate_data['status'] = 'Available'
+        if 'score' not in candidate_data:
+            candidate_data['score'] = 0.0
+        
+        # Insert only the new row
+        candidates_table.insert([candidate_data])
+        return True, candidate_data
+    except Exception as e:
+        print(f"Error adding candidate: {e}")
+        return False, candidate_data
+
+# Fields every imported candidate must have
+REQUIRED_CANDIDATE_FIELDS = ('name', 'email')
+
+def _read_import_rows(source, fmt=None):
+    """Read candidate rows from a list of dicts or a CSV/JSONL path or file object"""
+    if isinstance(source, (list, tuple)):
+        return [dict(row) for row in source]
+
+    name = source if isinstance(source, str) else getattr(source, 'name', '')
+    fmt = (fmt or os.path.splitext(name)[1].lstrip('.')).lower()
+
+    if fmt == 'csv':
+        return pd.read_csv(source, dtype=str, keep_default_na=False).to_dict('records')
+    if fmt in ('jsonl', 'ndjson'):
+        if isinstance(source, str):
+            with open(source, encoding='utf-8') as f:
+                lines = f.read().splitlines()
+        else:
+            content = source.read()
+            lines = (content.decode('utf-8') if isinstance(content, bytes) else content).splitlines()
+        return [json.loads(line) for line in lines if line.strip()]
+    raise ValueError(f"Unsupported import format: {fmt or 'unknown'}")
+
+def validate_candidate(row):
+    """Check a candidate row against the schema; returns (normalized_row, errors)"""
+    errors = []
+    columns = TABLE_COLUMNS['candidates']
+    candidate = {column: row.get(column, '') for column in columns if column != 'id'}
+    for key, value in candidate.items():
+        if value is None or (isinstance(value, float) and value != value):
+            candidate[key] = ''
+        elif isinstance(value, str):
+            candidate[key] = value.strip()
+
+    for field in REQUIRED_CANDIDATE_FIELDS:
+        if not candidate[field]:
+            errors.append(f"missing {field}")
+    if candidate['email'] and '@' not in str(candidate['email']):
+        errors.append(f"invalid email '{candidate['email']}'")
+
+    years = str(candidate['years_experience'])
+    if years and not any(ch.isdigit() for ch in years):
+        errors.append(f"invalid years_experience '{years}'")
+    elif years.isdigit():
+        candidate['years_experience'] = int(years)
+
+    if candidate['score'] in ('', None):
+        candidate['score'] = 0.0
+    else:
+        try:
+            candidate['score'] = float(candidate['score'])
+            if not 0 <= candidate['score'] <= 1:
+                errors.append(f"score {candidate['score']} outside 0-1")
+        except (TypeError, ValueError):
+            errors.append(f"invalid score '{candidate['score']}'")
+
+    if not candidate['status']:
+        candidate['status'] = 'Available'
+    return candidate, errors
+
+def import_candidates(source, fmt=None):
+    """Bulk-import candidates from a CSV/JSONL file (path or file object) or a list of dicts.
+
+    Every row is validated first; valid rows get ids from the persistent
+    sequence in one allocation and are written in a single batch. Invalid
+    rows are skipped and reported as ``(row_number, message)`` in ``errors``.
+    Columns outside the candidate schema are ignored and listed in
+    ``ignored_columns``.
+    """
+    result = {'imported': 0, 'ids': [], 'errors': [], 'ignored_columns': []}
+    try:
+        rows = _read_import_rows(source, fmt)
+    except Exception as e:
+        result['errors'].append((0, f"could not read import: {e}"))
+        return result
+
+    known = set(TABLE_COLUMNS['candidates'])
+    result['ignored_columns'] = sorted({key for row in rows for key in row if key not in known})
+
+    valid = []
+    for row_number, row in enumerate(rows, start=1):
+        candidate, errors = validate_candidate(row)
+        if errors:
+            result['errors'].append((row_number, '; '.join(errors)))
+        else:
+            valid.append(candidate)
+
+    if not valid:
+        return result
+
+    try:
+        first_id = candidates_table.allocate_ids(len(valid))
+        for offset, candidate in enumerate(valid):
+            candidate['id'] = first_id + offset
+        candidates_table.insert(valid)
+
+        # Matches given in the legacy matched_jobs column go to the match relation
+        matches = [
+            (candidate['id'], job_id, candidate['score'])
+            for candidate in valid
+            for job_id in split_ids(candidate['matched_jobs'])
+        ]
+        if matches:
+            matches_table.upsert(matches)
+    except Exception as e:
+        print(f"Error importing candidates: {e}")
+        result['errors'].append((0, f"write failed: {e}"))
+        return result
+
+    result['imported'] = len(valid)
+    result['ids'] = [candidate['id'] for candidate in valid]
+    return result
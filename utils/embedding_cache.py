@@ -0,0 +1,309 @@
+import os
+import re
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+import numpy as np
+from filelock import FileLock
+
+# Rows added to a vector file whenever it runs out of space
+GROWTH_ROWS = 1024
+# Fold the index journal into the index file once it holds more records than
+# there are cached vectors, and at least this many
+JOURNAL_COMPACT_MIN = 1000
+
+def canonical_text(text):
+    """Collapse whitespace so formatting differences do not change the cache key"""
+    return ' '.join(str(text).split())
+
+def text_key(model_name, text):
+    """Content address of a text embedded by a model"""
+    digest = hashlib.sha256(f"{model_name}\0{canonical_text(text)}".encode('utf-8'))
+    return digest.hexdigest()
+
+class _ModelStore:
+    """Vectors of one model: a float32 memmap of shape (capacity, dimension) plus a key -> row index.
+
+    The index keeps the keys in least- to most-recently-used order, which is
+    the eviction order once ``max_entries`` rows are in use. On disk it is a
+    JSON snapshot plus an append-only journal of puts, lookups and growth,
+    like the tables' delta logs: a store appends a few lines, other
+    processes replay only the lines they have not seen yet, and the journal
+    is folded into the snapshot once it outgrows the index.
+    """
+
+    def __init__(self, directory, model_name, max_entries):
+        safe_name = re.sub(r'[^A-Za-z0-9_.-]', '_', model_name)
+        self.vector_path = os.path.join(directory, f"{safe_name}.f32")
+        self.index_path = os.path.join(directory, f"{safe_name}.index.json")
+        self.journal_path = os.path.join(directory, f"{safe_name}.index.jsonl")
+        self.max_entries = max_entries
+        self.file_lock = FileLock(os.path.join(directory, f"{safe_name}.lock"))
+        self.dimension = None
+        self.capacity = 0
+        self.entries = OrderedDict()   # key -> row, least recently used first
+        self.row_keys = {}             # row -> key
+        self.free_rows = set()
+        self.vectors = None
+        self._index_version = None
+        self._journal_offset = 0       # bytes of the journal already applied
+        self._journal_records = 0
+        self._pending = []             # journal records not written yet
+        self._rewrite = False
+
+    def _current_index_version(self):
+        try:
+            stat = os.stat(self.index_path)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def _map_vectors(self):
+        self.vectors = None
+        if self.capacity and self.dimension:
+            self.vectors = np.memmap(self.vector_path, dtype=np.float32, mode='r+', shape=(self.capacity, self.dimension))
+
+    def sync(self):
+        """Catch up with other processes: reload the index file if it was rewritten, then replay new journal records"""
+        version = self._current_index_version()
+        if version != self._index_version:
+            self._load_index(version)
+        if self._index_version is not None:
+            self._replay_journal()
+
+    def _load_index(self, version):
+        self._index_version = version
+        self.entries = OrderedDict()
+        self.row_keys = {}
+        self._journal_offset = 0
+        self._journal_records = 0
+        # Lookups made since the last store lose to the other process's rewrite
+        self._pending = []
+        if version is None:
+            self.dimension, self.capacity, self.free_rows = None, 0, set()
+            self.vectors = None
+            return
+
+        with open(self.index_path, encoding='utf-8') as f:
+            index = json.load(f)
+        self.dimension = index['dimension']
+        self.capacity = index['capacity']
+        self.entries = OrderedDict((key, row) for key, row in index['entries'])
+        self.row_keys = {row: key for key, row in self.entries.items()}
+        self.free_rows = set(range(self.capacity)) - set(self.row_keys)
+        self._map_vectors()
+
+    def _replay_journal(self):
+        try:
+            with open(self.journal_path, 'rb') as f:
+                f.seek(self._journal_offset)
+                data = f.read()
+        except OSError:
+            return
+        # A line without its newline is still being written (or was cut off by a crash)
+        end = data.rfind(b'\n') + 1
+        if not end:
+            return
+        capacity = self.capacity
+        for line in data[:end].splitlines():
+            try:
+                self._apply(json.loads(line))
+            except (ValueError, IndexError, TypeError):
+                continue
+            self._journal_records += 1
+        self._journal_offset += end
+        if self.capacity != capacity:
+            self._map_vectors()
+
+    def _apply(self, record):
+        if record[0] == 'p':
+            self._assign(record[1], record[2])
+        elif record[0] == 't':
+            if record[1] in self.entries:
+                self.entries.move_to_end(record[1])
+        elif record[0] == 'c':
+            self.free_rows.update(range(self.capacity, record[1]))
+            self.capacity = record[1]
+
+    def _assign(self, key, row):
+        """Point ``key`` at ``row`` as the most recently used entry, evicting the row's previous key"""
+        old_row = self.entries.pop(key, None)
+        if old_row is not None and old_row != row:
+            self.row_keys.pop(old_row, None)
+            self.free_rows.add(old_row)
+        old_key = self.row_keys.get(row)
+        if old_key is not None and old_key != key:
+            self.entries.pop(old_key, None)
+        self.free_rows.discard(row)
+        self.row_keys[row] = key
+        self.entries[key] = row
+
+    def _grow(self, rows_needed):
+        new_capacity = min(self.max_entries, max(self.capacity + GROWTH_ROWS, self.capacity + rows_needed))
+        if new_capacity <= self.capacity:
+            return
+        if self.vectors is not None:
+            self.vectors.flush()
+        # Extending the file keeps the existing rows in place
+        with open(self.vector_path, 'ab') as f:
+            f.truncate(new_capacity * self.dimension * 4)
+        self.free_rows.update(range(self.capacity, new_capacity))
+        self.capacity = new_capacity
+        self._pending.append(['c', new_capacity])
+        self._map_vectors()
+
+    def get(self, key):
+        row = self.entries.get(key)
+        if row is None:
+            return None
+        self.entries.move_to_end(key)
+        self._pending.append(['t', key])
+        return np.array(self.vectors[row])
+
+    def put(self, key, vector):
+        vector = np.asarray(vector, dtype=np.float32)
+        if self.dimension is None:
+            self.dimension = int(vector.shape[0])
+        elif vector.shape[0] != self.dimension:
+            # The model changed its output size; start over
+            self.entries.clear()
+            self.row_keys = {}
+            self.free_rows = set()
+            self.capacity = 0
+            self.vectors = None
+            self._pending = []
+            self._rewrite = True
+            self.dimension = int(vector.shape[0])
+            if os.path.exists(self.vector_path):
+                os.remove(self.vector_path)
+
+        row = self.entries.get(key)
+        if row is None:
+            if not self.free_rows:
+                self._grow(1)
+            if self.free_rows:
+                row = self.free_rows.pop()
+            else:
+                # Full: reuse the least recently used row
+                row = next(iter(self.entries.values()))
+        self.vectors[row] = vector
+        self._assign(key, row)
+        self._pending.append(['p', key, row])
+
+    def save(self):
+        """Flush the vectors and append the pending index changes to the journal, compacting when it is due"""
+        if (not self._pending and not self._rewrite) or self.dimension is None:
+            return
+        if self.vectors is not None:
+            self.vectors.flush()
+        due = self._journal_records + len(self._pending) > max(JOURNAL_COMPACT_MIN, len(self.entries))
+        if self._rewrite or self._index_version is None or due:
+            self._compact()
+            return
+
+        data = ''.join(json.dumps(record, separators=(',', ':')) + '\n' for record in self._pending).encode('utf-8')
+        with open(self.journal_path, 'ab') as f:
+            f.write(data)
+            self._journal_offset = f.tell()
+        self._journal_records += len(self._pending)
+        self._pending = []
+
+    def _compact(self):
+        """Atomically rewrite the index file with every entry and empty the journal"""
+        index = {
+            'dimension': self.dimension,
+            'capacity': self.capacity,
+            'entries': list(self.entries.items()),
+        }
+        tmp_path = f"{self.index_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(index, f)
+        os.replace(tmp_path, self.index_path)
+        # Replaying the old journal on top of the new file would end in the same state,
+        # so a crash before this truncation loses nothing
+        with open(self.journal_path, 'wb'):
+            pass
+        self._index_version = self._current_index_version()
+        self._journal_offset = 0
+        self._journal_records = 0
+        self._pending = []
+        self._rewrite = False
+
+class EmbeddingCache:
+    """On-disk embedding cache keyed by (model name, hash of the canonical text).
+
+    Each model's vectors live in a memory-mapped float32 file next to a JSON
+    index and its journal, under ``directory``. At most ``max_entries`` vectors are kept per
+    model; beyond that the least recently used one is overwritten. A file
+    lock per model keeps concurrent processes from handing out the same row.
+    Lookups move entries to the most-recently-used end in memory; that order
+    is written with the next store or ``flush``.
+    """
+
+    def __init__(self, directory='data/embedding_cache', max_entries=100000):
+        self.directory = directory
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._stores = {}
+
+    def _store(self, model_name):
+        store = self._stores.get(model_name)
+        if store is None:
+            os.makedirs(self.directory, exist_ok=True)
+            store = self._stores[model_name] = _ModelStore(self.directory, model_name, self.max_entries)
+        return store
+
+    def get_many(self, model_name, texts):
+        """Return the cached embedding of each text, or None where there is none"""
+        keys = [text_key(model_name, text) for text in texts]
+        with self._lock:
+            store = self._store(model_name)
+            with store.file_lock:
+                store.sync()
+                results = [store.get(key) for key in keys]
+            found = sum(result is not None for result in results)
+            self.hits += found
+            self.misses += len(results) - found
+        return results
+
+    def put_many(self, model_name, texts, vectors):
+        """Store embeddings; None vectors are skipped"""
+        items = [(text_key(model_name, text), vector) for text, vector in zip(texts, vectors) if vector is not None]
+        if not items:
+            return
+        with self._lock:
+            store = self._store(model_name)
+            with store.file_lock:
+                store.sync()
+                for key, vector in items:
+                    store.put(key, vector)
+                store.save()
+
+    def get(self, model_name, text):
+        """Return the cached embedding of one text, or None"""
+        return self.get_many(model_name, [text])[0]
+
+    def put(self, model_name, text, vector):
+        """Store the embedding of one text"""
+        self.put_many(model_name, [text], [vector])
+
+    def flush(self):
+        """Persist the recency order of lookups made since the last store"""
+        with self._lock:
+            for store in self._stores.values():
+                with store.file_lock:
+                    # Lookups are dropped if another process rewrote the index meanwhile
+                    store.sync()
+                    store.save()
+
+    def stats(self):
+        """Return hit/miss counters and the number of cached vectors per model"""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'entries': {name: len(store.entries) for name, store in self._stores.items()},
+            }
@@ -1,21 +1,192 @@
+import os
+import time
+import threading
 import numpy as np
-from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
 from utils.llm import get_embedding_model
+from utils.embedding_cache import EmbeddingCache, text_key
+from utils.candidate_index import CandidateIndex, faiss
+from utils.resume_tfidf import ResumeTfidfModel
+from utils.bm25_index import BM25Index
+from utils.chunking import chunk_text
+
+# Shared embedding model, created on first use rather than at import
+_model = None
+_model_checked_at = None
+_model_lock = threading.Lock()
+# Seconds to wait before asking the model server again after a failed load
+MODEL_RETRY_SECONDS = 30
+
+# Embeddings persisted between runs, keyed by model and text
+EMBEDDING_CACHE_DIR = os.environ.get('TALENT_EMBEDDING_CACHE_DIR', 'data/embedding_cache')
+EMBEDDING_CACHE_SIZE = int(os.environ.get('TALENT_EMBEDDING_CACHE_SIZE', '100000'))
+embedding_cache = EmbeddingCache(EMBEDDING_CACHE_DIR, EMBEDDING_CACHE_SIZE)
+
+# How EmbeddingMatrix keeps vectors in memory: 'float32', 'float16' or 'int8'.
+# The compact types trade speed for memory: their blocks are widened to float32
+# before scoring, so a float16 scan is several times slower than a float32 one
+STORAGE_TYPES = ('float32', 'float16', 'int8')
+EMBEDDING_STORAGE = os.environ.get('TALENT_EMBEDDING_STORAGE', 'float32')
+# Rows normalized, quantized or scored at a time for compact storage
+SCORE_BLOCK_ROWS = 2048
+
+# FAISS index of candidate embeddings, with its id mapping in <file>.meta.json
+CANDIDATE_INDEX_FILE = os.environ.get('TALENT_CANDIDATE_INDEX_FILE', 'data/candidate_index.faiss')
+# BM25 inverted index over candidate skills and resume summaries
+KEYWORD_INDEX_FILE = os.environ.get('TALENT_KEYWORD_INDEX_FILE', 'data/keyword_index.npz')
+# Rank offset in reciprocal rank fusion; 60 is the customary value
+RRF_K = 60
+# How chunk embeddings of a long document are combined: 'mean' or 'max'
+POOLING_TYPES = ('mean', 'max')
+CHUNK_POOLING = os.environ.get('TALENT_CHUNK_POOLING', 'mean')
+
+def get_model():
+    """The shared embedding model, loaded on first call; None while the model server has no embedding model"""
+    global _model, _model_checked_at
+    if _model is not None:
+        return _model
+    with _model_lock:
+        if _model is None and (_model_checked_at is None or time.monotonic() - _model_checked_at >= MODEL_RETRY_SECONDS):
+            try:
+                _model = get_embedding_model()
+            except Exception as e:
+                # e.g. the model server is not running
+                print(f"[Embedding Error] Failed to load embedding model: {e}")
+            _model_checked_at = time.monotonic()
+        return _model
+
+def warm_up_embedding_model(background=True):
+    """Load the embedding model and have the server load its weights before the first real request.
+
+    Runs in a daemon thread unless ``background`` is False; returns the thread.
+    """
+    def load():
+        model = get_model()
+        if model is not None:
+            model.encode_batch(['warm up'])
 
-# Initialize the embedding model
-model = get_embedding_model()
+    if not background:
+        load()
+        return None
+    thread = threading.Thread(target=load, name='embedding-warm-up', daemon=True)
+    thread.start()
+    return thread
 
 def get_embedding(text):
     """Convert text to embedding using our embedding model"""
-    if not text.strip():
+    model = get_model()
+    if model is None or not text.strip():
         return None
     try:
-        return model.encode(text)
+        cached = embedding_cache.get(model.model_name, text)
+        if cached is not None:
+            return cached
+        embedding = model.encode(text)
+        # encode() returns zeros on failure; those are not worth keeping
+        if np.any(embedding):
+            embedding_cache.put(model.model_name, text, embedding)
+        return embedding
     except Exception as e:
         print(f"[Embedding Error] Failed to encode text: {e}")
         return None
 
+def get_embeddings(texts, batch_size=64, concurrency=None):
+    """Convert many texts to embeddings with batched requests; None for blank or failed texts.
+
+    With ``concurrency`` above 1, up to that many batch requests are sent at
+    once through the async pipeline, which keeps a local Ollama busy during
+    bulk backfills.
+    """
+    model = get_model()
+    if model is None:
+        return [None] * len(texts)
+    try:
+        embeddings = embedding_cache.get_many(model.model_name, texts)
+        missing = [index for index, embedding in enumerate(embeddings) if embedding is None and texts[index].strip()]
+        if missing:
+            missing_texts = [texts[index] for index in missing]
+            if concurrency and concurrency > 1:
+                encoded = model.encode_batch_concurrent(missing_texts, batch_size=batch_size, concurrency=concurrency)
+            else:
+                encoded = model.encode_batch(missing_texts, batch_size=batch_size)
+            embedding_cache.put_many(model.model_name, missing_texts, encoded)
+            for index, embedding in zip(missing, encoded):
+                embeddings[index] = embedding
+        return embeddings
+    except Exception as e:
+        print(f"[Embedding Error] Failed to encode batch: {e}")
+        return [None] * len(texts)
+
+def pool_embeddings(vectors, weights=None, pooling=CHUNK_POOLING):
+    """Combine chunk embeddings into one vector.
+
+    Each chunk is L2-normalized first so no chunk dominates through its
+    length. 'mean' averages them, weighted by ``weights`` when given;
+    'max' takes the largest value of each dimension.
+    """
+    if pooling not in POOLING_TYPES:
+        raise ValueError(f"pooling must be one of {POOLING_TYPES}, got {pooling!r}")
+    matrix = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    matrix = matrix / np.where(norms == 0, 1, norms)
+    if pooling == 'max':
+        return matrix.max(axis=0)
+    return np.average(matrix, axis=0, weights=weights).astype(np.float32)
+
+def get_document_embedding(text, pooling=CHUNK_POOLING, batch_size=64):
+    """Embed a text of any length: chunk it, embed the chunks in batches and pool them.
+
+    Chunk embeddings go through the embedding cache like any other text,
+    so embedding the same document again costs no model requests. A text
+    that fits in one chunk gets that chunk's embedding. Returns None when
+    no chunk could be embedded.
+    """
+    chunks = chunk_text(text)
+    if not chunks:
+        return None
+    embedded = [
+        (embedding, len(chunk.split()))
+        for chunk, embedding in zip(chunks, get_embeddings(chunks, batch_size=batch_size))
+        if embedding is not None and np.any(embedding)
+    ]
+    if not embedded:
+        return None
+    if len(embedded) == 1:
+        return embedded[0][0]
+    return pool_embeddings([embedding for embedding, _ in embedded], [words for _, words in embedded], pooling)
+
+def compare_documents(text1, text2, pooling=CHUNK_POOLING):
+    """Cosine similarity of two texts of any length, using chunked document embeddings"""
+    embedding1 = get_document_embedding(text1, pooling)
+    embedding2 = get_document_embedding(text2, pooling)
+    if embedding1 is None or embedding2 is None:
+        return 0.0
+    return float(cosine_similarity(embedding1.reshape(1, -1), embedding2.reshape(1, -1))[0][0])
+
+def candidate_text(candidate):
+    """Text that represents a candidate for embedding"""
+    return f"""
+    {candidate['name']}
+    {candidate['current_role']}
+    {candidate['skills']}
+    {candidate['resume_summary']}
+    {candidate['years_experience']} years experience
+    Education: {candidate['education']}
+    Last company: {candidate['last_company']}
+    """
+
+def job_text(job):
+    """Text that represents a job for embedding"""
+    return f"""
+    {job['title']}
+    {job['department']}
+    {job['description']}
+    Requirements: {job['requirements']}
+    Skills required: {job['skills_required']}
+    Experience required: {job['experience_required']}
+    Education required: {job['education_required']}
+    """
+
 def compare_texts(text1, text2):
     """Compare two text passages and return similarity score"""
     embedding1 = get_embedding(text1)
@@ -30,14 +201,77 @@ def compare_texts(text1, text2):
     similarity = cosine_similarity(embedding1, embedding2)[0][0]
     return similarity
 
-def compare_resume_with_job(candidate, job):
-    resume_text = str(candidate.get('resume_summary', ''))
-    job_description = str(job.get('requirements', ''))
+class _PendingChanges:
+    """Ids of rows changed since the last ``take``, collected from the database change feed.
+
+    Starts out (and falls back to) "reset", meaning the consumer has to
+    rebuild from the full tables instead of applying individual ids.
+    """
 
-    vectorizer = TfidfVectorizer().fit_transform([resume_text, job_description])
-    similarity = cosine_similarity(vectorizer[0:1], vectorizer[1:2])
+    def __init__(self, tables=('candidates',)):
+        self.tables = tables
+        self._lock = threading.Lock()
+        self._reset = True
+        self._ids = {table: set() for table in tables}
+        self._token = None
+
+    def _on_change(self, event):
+        with self._lock:
+            if event.op == 'reset':
+                self._reset = True
+            else:
+                self._ids[event.table].add(str(event.id))
+
+    def take(self):
+        """Return ``(reset, {table: changed ids})`` and start collecting afresh"""
+        from utils import database as db
+
+        if self._token is None:
+            self._token = db.subscribe_changes(self._on_change, tables=self.tables)
+        # Picks up writes from other processes as change events
+        for table in self.tables:
+            getattr(db, f"{table}_table").refresh()
+        with self._lock:
+            reset, ids = self._reset, self._ids
+            self._reset = False
+            self._ids = {table: set() for table in self.tables}
+        return reset, ids
+
+    def mark_reset(self):
+        """Make the next ``take`` ask for a full rebuild, e.g. after a failed update"""
+        with self._lock:
+            self._reset = True
+
+def _load_candidates(candidate_ids):
+    """Split changed ids into the current records and the ids that no longer exist"""
+    from utils import database as db
+
+    records = {candidate_id: db.get_candidate_by_id(candidate_id) for candidate_id in candidate_ids}
+    return (
+        [record for record in records.values() if record is not None],
+        [candidate_id for candidate_id, record in records.items() if record is None],
+    )
+
+_resume_tfidf = ResumeTfidfModel()
+_resume_tfidf_lock = threading.Lock()
+_resume_tfidf_changes = _PendingChanges(('candidates', 'jobs'))
+
+def get_resume_tfidf():
+    """Process-wide ResumeTfidfModel fitted on all candidates and jobs and kept current via the change feed"""
+    from utils import database as db
+
+    with _resume_tfidf_lock:
+        reset, changed = _resume_tfidf_changes.take()
+        if not reset:
+            records, removed = _load_candidates(changed['candidates'])
+            _resume_tfidf.update(records, removed, job_changes=len(changed['jobs']))
+        if reset or _resume_tfidf.needs_refit():
+            _resume_tfidf.fit(db.get_candidates(), db.get_jobs())
+        return _resume_tfidf
 
-    score = similarity[0][0]
+def compare_resume_with_job(candidate, job):
+    """TF-IDF cosine similarity of a candidate's resume summary and a job's requirements"""
+    score = get_resume_tfidf().similarity(candidate, job)
     result = {
         'score': score,
         'candidate': candidate,
@@ -48,21 +282,15 @@ def compare_resume_with_job(candidate, job):
     }
     return result
 
-def create_candidate_embeddings(candidates):
-    embeddings = {}
+def score_resumes_for_job(job):
+    """Return ``{candidate_id: similarity}`` of every candidate's resume against the job, in one sparse product"""
+    return get_resume_tfidf().score_all(job)
 
-    for candidate in candidates:
-        candidate_text = f"""
-        {candidate['name']}
-        {candidate['current_role']}
-        {candidate['skills']}
-        {candidate['resume_summary']}
-        {candidate['years_experience']} years experience
-        Education: {candidate['education']}
-        Last company: {candidate['last_company']}
-        """
+def create_candidate_embeddings(candidates, batch_size=64, concurrency=None):
+    embeddings = {}
 
-        embedding = get_embedding(candidate_text)
+    vectors = get_embeddings([candidate_text(candidate) for candidate in candidates], batch_size, concurrency)
+    for candidate, embedding in zip(candidates, vectors):
         if embedding is not None:
             embeddings[candidate['id']] = embedding
         else:
@@ -70,21 +298,11 @@ def create_candidate_embeddings(candidates):
 
     return embeddings
 
-def create_job_embeddings(jobs):
+def create_job_embeddings(jobs, batch_size=64, concurrency=None):
     embeddings = {}
 
-    for job in jobs:
-        job_text = f"""
-        {job['title']}
-        {job['department']}
-        {job['description']}
-        Requirements: {job['requirements']}
-        Skills required: {job['skills_required']}
-        Experience required: {job['experience_required']}
-        Education required: {job['education_required']}
-        """
-
-        embedding = get_embedding(job_text)
+    vectors = get_embeddings([job_text(job) for job in jobs], batch_size, concurrency)
+    for job, embedding in zip(jobs, vectors):
         if embedding is not None:
             embeddings[job['id']] = embedding
         else:
@@ -92,83 +310,327 @@ def create_job_embeddings(jobs):
 
     return embeddings
 
-def find_matching_jobs_for_candidate(candidate, job_embeddings, jobs, threshold=0.6):
-    candidate_text = f"""
-    {candidate['name']}
-    {candidate['current_role']}
-    {candidate['skills']}
-    {candidate['resume_summary']}
-    {candidate['years_experience']} years experience
-    Education: {candidate['education']}
-    Last company: {candidate['last_company']}
-    """
-
-    candidate_embedding = get_embedding(candidate_text)
-    if candidate_embedding is None:
-        print(f"[Warning] Skipping candidate ID {candidate['id']} due to missing embedding")
-        return []
+class EmbeddingMatrix:
+    """Embeddings stacked into one row-normalized matrix with an id -> row map.
 
-    candidate_embedding = candidate_embedding.reshape(1, -1)
+    Cosine similarity of a query against every row is then a single
+    matrix-vector product, and the best rows are picked with argpartition
+    instead of sorting everything. Build it once and reuse it across queries.
 
-    matches = []
+    ``storage`` sets how rows are kept: 'float32' (4 bytes per dimension),
+    'float16' (2 bytes) or 'int8' (1 byte plus one float32 scale per row,
+    ``row ~= scale * int8_row``). Compact matrices are scored block by block
+    without ever holding a full float32 copy.
+    """
 
-    for job_id, job_embedding in job_embeddings.items():
-        if job_embedding is None:
-            continue
+    def __init__(self, embeddings=None, storage=None):
+        items = [(key, vector) for key, vector in (embeddings or {}).items() if vector is not None]
+        ids = [key for key, _ in items]
+        if items:
+            matrix = np.vstack([np.asarray(vector, dtype=np.float32).ravel() for _, vector in items])
+        else:
+            matrix = np.zeros((0, 0), dtype=np.float32)
+        self._set(ids, matrix, storage or EMBEDDING_STORAGE)
+
+    @classmethod
+    def from_arrays(cls, ids, matrix, storage=None, copy=True):
+        """Build from a list of ids and an (n, d) array; with ``copy=False`` a float32 array is normalized in place"""
+        matrix = np.array(matrix, dtype=np.float32) if copy else np.asarray(matrix, dtype=np.float32)
+        instance = cls.__new__(cls)
+        instance._set(list(ids), matrix, storage or EMBEDDING_STORAGE)
+        return instance
+
+    def _set(self, ids, matrix, storage):
+        if storage not in STORAGE_TYPES:
+            raise ValueError(f"unknown embedding storage '{storage}', expected one of {STORAGE_TYPES}")
+        self.ids = ids
+        self.rows = {str(key): row for row, key in enumerate(ids)}
+        self.storage = storage
+        self.scales = None
+        if storage == 'float32':
+            self.matrix = matrix
+        else:
+            self.matrix = np.empty(matrix.shape, dtype=np.float16 if storage == 'float16' else np.int8)
+            if storage == 'int8':
+                self.scales = np.ones(len(matrix), dtype=np.float32)
+
+        # Normalize (and quantize) in blocks to bound the extra memory
+        for start in range(0, len(matrix), SCORE_BLOCK_ROWS):
+            block = matrix[start:start + SCORE_BLOCK_ROWS]
+            norms = np.linalg.norm(block, axis=1, keepdims=True)
+            norms[norms == 0] = 1.0
+            block /= norms
+            if storage == 'float16':
+                self.matrix[start:start + len(block)] = block
+            elif storage == 'int8':
+                scales = np.abs(block).max(axis=1) / 127
+                scales[scales == 0] = 1.0
+                self.scales[start:start + len(block)] = scales
+                self.matrix[start:start + len(block)] = np.rint(block / scales[:, None])
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __contains__(self, key):
+        return str(key) in self.rows
+
+    @property
+    def nbytes(self):
+        """Memory held by the vectors"""
+        return self.matrix.nbytes + (self.scales.nbytes if self.scales is not None else 0)
+
+    def vector(self, key):
+        """Normalized embedding stored for an id, as float32"""
+        row = self.rows[str(key)]
+        vector = self.matrix[row].astype(np.float32)
+        return vector * self.scales[row] if self.scales is not None else vector
+
+    def similarities(self, query):
+        """Cosine similarity of ``query`` with every row"""
+        query = np.asarray(query, dtype=np.float32).ravel()
+        norm = np.linalg.norm(query)
+        if not len(self.ids) or norm == 0:
+            return np.zeros(len(self.ids), dtype=np.float32)
+        query = query / norm
+        if self.storage == 'float32':
+            return self.matrix @ query
+
+        scores = np.empty(len(self.ids), dtype=np.float32)
+        for start in range(0, len(self.ids), SCORE_BLOCK_ROWS):
+            block = self.matrix[start:start + SCORE_BLOCK_ROWS]
+            scores[start:start + len(block)] = block.astype(np.float32) @ query
+        if self.scales is not None:
+            scores *= self.scales
+        return scores
+
+    def top_k(self, query, k=10, threshold=None):
+        """Return up to ``k`` (id, similarity) pairs with the highest similarity, best first.
+
+        ``k=None`` returns every row at or above ``threshold``.
+        """
+        scores = self.similarities(query)
+        rows = np.arange(len(scores)) if threshold is None else np.flatnonzero(scores >= threshold)
+        if k is not None and k < len(rows):
+            rows = rows[np.argpartition(-scores[rows], k - 1)[:k]]
+        rows = rows[np.argsort(-scores[rows], kind='stable')]
+        return [(self.ids[row], float(scores[row])) for row in rows]
+
+def _as_matrix(embeddings):
+    # EmbeddingMatrix and CandidateIndex both search with top_k()
+    return EmbeddingMatrix(embeddings) if isinstance(embeddings, dict) else embeddings
+
+def _index_candidates(index, candidates, removed_ids=(), full=False, batch_size=64):
+    model = get_model()
+    texts = {str(candidate['id']): candidate_text(candidate) for candidate in candidates}
+    hashes = {candidate_id: text_key(model.model_name, text) for candidate_id, text in texts.items()}
+    if full:
+        removed_ids = [candidate_id for candidate_id in index.labels if candidate_id not in texts]
+    rebuild = full and index.needs_rebuild(len(texts))
+    changed = [
+        candidate_id for candidate_id, text_hash in hashes.items()
+        if rebuild or index.hashes.get(candidate_id) != text_hash
+    ]
+    if not changed and not removed_ids:
+        return
+
+    vectors = get_embeddings([texts[candidate_id] for candidate_id in changed], batch_size)
+    items = [(candidate_id, vector, hashes[candidate_id]) for candidate_id, vector in zip(changed, vectors)]
+    index.remove(removed_ids)
+    try:
+        if rebuild:
+            index.build(items)
+        else:
+            index.upsert(items)
+    except ValueError:
+        # The embedding model changed size; only a full rebuild can fix that
+        if full:
+            index.build(items)
+        else:
+            raise
+    index.save()
 
-        job_embedding = job_embedding.reshape(1, -1)
-        similarity = cosine_similarity(candidate_embedding, job_embedding)[0][0]
+def sync_candidate_index(index, candidates, batch_size=64):
+    """Make ``index`` hold exactly ``candidates``: embed new or edited ones, drop the rest, rebuild if needed, save"""
+    _index_candidates(index, candidates, full=True, batch_size=batch_size)
 
-        if similarity >= threshold:
-            job = next((j for j in jobs if str(j['id']) == str(job_id)), None)
-            if job:
-                matches.append({
-                    "job_id": job_id,
-                    "title": job['title'],
-                    "score": round(similarity, 2)
-                })
+def update_candidate_index(index, candidates, removed_ids=(), batch_size=64):
+    """Add or re-embed ``candidates`` and remove ``removed_ids`` without looking at the rest of the pool"""
+    _index_candidates(index, candidates, removed_ids, batch_size=batch_size)
 
-    matches.sort(key=lambda x: x['score'], reverse=True)
+_candidate_index = None
+_candidate_index_lock = threading.Lock()
+_candidate_index_changes = _PendingChanges()
 
-    return matches
+def get_candidate_index():
+    """Process-wide CandidateIndex kept in step with the candidates table; None without faiss or a model.
 
-def find_matching_candidates_for_job(job, candidate_embeddings, candidates, threshold=0.6):
-    job_text = f"""
-    {job['title']}
-    {job['department']}
-    {job['description']}
-    Requirements: {job['requirements']}
-    Skills required: {job['skills_required']}
-    Experience required: {job['experience_required']}
-    Education required: {job['education_required']}
+    The saved index is memory-mapped on first use and checked against the
+    whole table once; after that only candidates reported on the change
+    feed are re-embedded.
     """
-
-    job_embedding = get_embedding(job_text)
-    if job_embedding is None:
-        print(f"[Warning] Skipping job ID {job['id']} due to missing embedding")
+    global _candidate_index
+    if faiss is None or get_model() is None:
+        return None
+    from utils import database as db
+
+    with _candidate_index_lock:
+        if _candidate_index is None:
+            if os.path.exists(f"{CANDIDATE_INDEX_FILE}.meta.json"):
+                try:
+                    _candidate_index = CandidateIndex.load(CANDIDATE_INDEX_FILE)
+                except Exception as e:
+                    print(f"[Index Error] Failed to load candidate index, rebuilding: {e}")
+            if _candidate_index is None:
+                _candidate_index = CandidateIndex(CANDIDATE_INDEX_FILE)
+
+        reset, changed = _candidate_index_changes.take()
+        try:
+            if not reset and changed['candidates']:
+                update_candidate_index(_candidate_index, *_load_candidates(changed['candidates']))
+            if reset or _candidate_index.needs_rebuild():
+                sync_candidate_index(_candidate_index, db.get_candidates())
+        except Exception as e:
+            print(f"[Index Error] Failed to update candidate index: {e}")
+            _candidate_index_changes.mark_reset()
+        return _candidate_index
+
+_keyword_index = None
+_keyword_index_lock = threading.Lock()
+_keyword_index_changes = _PendingChanges()
+
+def get_keyword_index():
+    """Process-wide BM25Index over candidate skills and resume summaries, kept current via the change feed"""
+    global _keyword_index
+    from utils import database as db
+
+    with _keyword_index_lock:
+        if _keyword_index is None:
+            if os.path.exists(KEYWORD_INDEX_FILE):
+                try:
+                    _keyword_index = BM25Index.load(KEYWORD_INDEX_FILE)
+                except Exception as e:
+                    print(f"[Index Error] Failed to load keyword index, rebuilding: {e}")
+            if _keyword_index is None:
+                _keyword_index = BM25Index(KEYWORD_INDEX_FILE)
+
+        reset, changed = _keyword_index_changes.take()
+        try:
+            # Field edits such as status or score leave the indexed text alone; only real changes are saved
+            if reset:
+                if _keyword_index.sync(db.get_candidates()):
+                    _keyword_index.save()
+            elif changed['candidates']:
+                if _keyword_index.update(*_load_candidates(changed['candidates'])):
+                    _keyword_index.save()
+        except Exception as e:
+            print(f"[Index Error] Failed to update keyword index: {e}")
+            _keyword_index_changes.mark_reset()
+        return _keyword_index
+
+def reciprocal_rank_fusion(rankings, k=RRF_K):
+    """Fuse ranked id lists into ``[(id, score)]``, best first, where each list adds 1 / (k + rank)"""
+    scores = {}
+    for ranking in rankings:
+        for rank, key in enumerate(ranking, start=1):
+            scores[key] = scores.get(key, 0.0) + 1.0 / (k + rank)
+    return sorted(scores.items(), key=lambda item: item[1], reverse=True)
+
+def hybrid_top_k(query_text, query_embedding, dense_index, keyword_index, k=10, threshold=None, pool=None):
+    """Fuse dense and BM25 retrieval with reciprocal rank fusion.
+
+    Each side contributes its best ``pool`` hits (dense ones at or above
+    ``threshold``). Returns up to ``k`` tuples ``(id, score, similarity,
+    keyword_score)`` best first, where ``score`` is the fused score scaled
+    so that ranking first on both sides gives 1.0, and similarity or
+    keyword_score is None when that side did not return the id.
+    """
+    pool = pool or max(100, 5 * (k or 0))
+    dense_hits = []
+    if dense_index is not None and query_embedding is not None:
+        dense_hits = [(str(key), score) for key, score in dense_index.top_k(query_embedding, pool, threshold)]
+    keyword_hits = [(str(key), score) for key, score in keyword_index.top_k(query_text, pool)]
+
+    similarities = dict(dense_hits)
+    keyword_scores = dict(keyword_hits)
+    fused = reciprocal_rank_fusion([[key for key, _ in dense_hits], [key for key, _ in keyword_hits]])
+    best = 2.0 / (RRF_K + 1)
+    return [
+        (key, score / best, similarities.get(key), keyword_scores.get(key))
+        for key, score in fused[:k]
+    ]
+
+def find_matching_jobs_for_candidate(candidate, job_embeddings, jobs, threshold=0.6, top_k=None):
+    """Jobs whose embedding is at least ``threshold`` similar to the candidate, best first.
+
+    ``job_embeddings`` is a {job_id: embedding} dict or an EmbeddingMatrix.
+    """
+    candidate_embedding = get_embedding(candidate_text(candidate))
+    if candidate_embedding is None:
+        print(f"[Warning] Skipping candidate ID {candidate['id']} due to missing embedding")
         return []
 
-    job_embedding = job_embedding.reshape(1, -1)
+    jobs_by_id = {str(job['id']): job for job in jobs}
 
     matches = []
+    for job_id, similarity in _as_matrix(job_embeddings).top_k(candidate_embedding, top_k, threshold):
+        job = jobs_by_id.get(str(job_id))
+        if job:
+            matches.append({
+                "job_id": job['id'],
+                "title": job['title'],
+                "score": round(similarity, 2)
+            })
 
-    for candidate_id, candidate_embedding in candidate_embeddings.items():
-        if candidate_embedding is None:
-            continue
+    return matches
+
+def find_matching_candidates_for_job(job, candidate_embeddings, candidates, threshold=0.6, top_k=None, keyword_index=None):
+    """Candidates whose embedding is at least ``threshold`` similar to the job, best first.
 
-        candidate_embedding = candidate_embedding.reshape(1, -1)
-        similarity = cosine_similarity(job_embedding, candidate_embedding)[0][0]
+    ``candidate_embeddings`` is a {candidate_id: embedding} dict, an
+    EmbeddingMatrix (exact search; pass the same one to repeated calls to
+    avoid rebuilding it) or a CandidateIndex such as ``get_candidate_index()``
+    for approximate search on large pools, which needs ``top_k`` to stay
+    sub-linear.
 
-        if similarity >= threshold:
-            candidate = next((c for c in candidates if str(c['id']) == str(candidate_id)), None)
+    With a ``keyword_index`` (see ``get_keyword_index()``) the dense hits
+    are fused with BM25 hits on the job's skills and requirements, so exact
+    skill names count even when the embedding blurs them. ``score`` is then
+    the fused score, and each match also carries ``similarity`` and
+    ``keyword_score`` (None where that side did not find the candidate).
+    """
+    job_embedding = get_embedding(job_text(job))
+    candidates_by_id = {str(candidate['id']): candidate for candidate in candidates}
+
+    if keyword_index is not None:
+        query = f"{job.get('skills_required', '')}\n{job.get('requirements', '')}\n{job.get('title', '')}"
+        dense = _as_matrix(candidate_embeddings) if job_embedding is not None else None
+        matches = []
+        for candidate_id, score, similarity, keyword_score in hybrid_top_k(query, job_embedding, dense, keyword_index, top_k or 100, threshold):
+            candidate = candidates_by_id.get(candidate_id)
             if candidate:
                 matches.append({
-                    "candidate_id": candidate_id,
+                    "candidate_id": candidate['id'],
                     "name": candidate['name'],
                     "current_role": candidate['current_role'],
-                    "score": round(similarity, 2)
+                    "score": round(score, 2),
+                    "similarity": None if similarity is None else round(similarity, 2),
+                    "keyword_score": None if keyword_score is None else round(keyword_score, 2)
                 })
+        return matches
 
-    matches.sort(key=lambda x: x['score'], reverse=True)
+    if job_embedding is None:
+        print(f"[Warning] Skipping job ID {job['id']} due to missing embedding")
+        return []
+
+    matches = []
+    for candidate_id, similarity in _as_matrix(candidate_embeddings).top_k(job_embedding, top_k, threshold):
+        candidate = candidates_by_id.get(str(candidate_id))
+        if candidate:
+            matches.append({
+                "candidate_id": candidate['id'],
+                "name": candidate['name'],
+                "current_role": candidate['current_role'],
+                "score": round(similarity, 2)
+            })
 
     return matches
@@ -0,0 +1,97 @@
+import io
+import csv
+import zlib
+import tempfile
+
+# Supported export formats: file extension and MIME type
+EXPORT_FORMATS = {
+    'csv': ('csv', 'text/csv'),
+    'csv.gz': ('csv.gz', 'application/gzip'),
+    'xlsx': ('xlsx', 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'),
+}
+
+# Size of the byte chunks yielded when streaming a finished file
+FILE_CHUNK_SIZE = 1024 * 1024
+
+def _batches(rows, chunk_size):
+    """Group an iterable of rows into lists of at most chunk_size rows"""
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= chunk_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+def stream_csv(rows, columns, chunk_size=5000):
+    """Yield a CSV file as UTF-8 byte chunks, one chunk per chunk_size rows"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator='\n')
+    writer.writerow(columns)
+    yield buffer.getvalue().encode('utf-8')
+
+    for batch in _batches(rows, chunk_size):
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows([row.get(column, '') for column in columns] for row in batch)
+        yield buffer.getvalue().encode('utf-8')
+
+def stream_csv_gzip(rows, columns, chunk_size=5000):
+    """Yield a gzip-compressed CSV file as byte chunks"""
+    # wbits=31 selects the gzip container
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    for chunk in stream_csv(rows, columns, chunk_size):
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+def stream_xlsx(rows, columns, sheet_title='Export'):
+    """Yield an Excel workbook as byte chunks.
+
+    openpyxl's write-only mode streams rows to a temporary file instead of
+    building the sheet in memory; the finished file is then read back in
+    fixed-size chunks.
+    """
+    from openpyxl import Workbook
+    from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet(sheet_title)
+    sheet.append(columns)
+    for row in rows:
+        values = []
+        for column in columns:
+            value = row.get(column, '')
+            if isinstance(value, str):
+                value = ILLEGAL_CHARACTERS_RE.sub('', value)
+            values.append(value)
+        sheet.append(values)
+
+    with tempfile.TemporaryFile() as f:
+        workbook.save(f)
+        f.seek(0)
+        while True:
+            chunk = f.read(FILE_CHUNK_SIZE)
+            if not chunk:
+                break
+            yield chunk
+
+def stream_export(rows, columns, fmt='csv', chunk_size=5000):
+    """Yield rows in the given format ('csv', 'csv.gz' or 'xlsx') as byte chunks"""
+    if fmt == 'csv':
+        return stream_csv(rows, columns, chunk_size)
+    if fmt == 'csv.gz':
+        return stream_csv_gzip(rows, columns, chunk_size)
+    if fmt == 'xlsx':
+        return stream_xlsx(rows, columns)
+    raise ValueError(f"Unsupported export format: {fmt}")
+
+def spool_export(chunks, max_memory=8 * 1024 * 1024):
+    """Write byte chunks to a temporary file (kept in memory while small) and rewind it"""
+    spool = tempfile.SpooledTemporaryFile(max_size=max_memory)
+    for chunk in chunks:
+        spool.write(chunk)
+    spool.seek(0)
+    return spool
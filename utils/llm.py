@@ -1,7 +1,11 @@
 import os
+import random
+import asyncio
+import threading
+import concurrent.futures
 import ollama
 import numpy as np
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from ollama import ResponseError
 import logging
 
@@ -9,12 +13,18 @@ import logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Embedding requests kept in flight at once by the async pipeline
+EMBED_CONCURRENCY = int(os.environ.get('TALENT_EMBED_CONCURRENCY', '4'))
+# Seconds between background checks that the shared LLM clients' models are still installed
+LLM_HEALTH_CHECK_SECONDS = float(os.environ.get('TALENT_LLM_HEALTH_CHECK_SECONDS', '60'))
+
 class OllamaLLM:
     """Ollama-based language model implementation"""
     
-    def __init__(self, model_name: str = 'mistral'):
+    def __init__(self, model_name: str = 'mistral', verify: bool = True):
         self.model_name = model_name
-        self._verify_model_availability()
+        if verify:
+            self._verify_model_availability()
 
     def _verify_model_availability(self):
         """Check if the specified model is available locally"""
@@ -105,10 +115,137 @@ class OllamaEmbeddingModel:
         """
         try:
             response = ollama.embeddings(model=self.model_name, prompt=text)
-            return np.array(response['embedding'])
+            return np.array(response['embedding'], dtype=np.float32)
         except Exception as e:
             logger.error(f"Embedding error: {str(e)}")
-            return np.zeros(self.dimension)
+            return np.zeros(self.dimension, dtype=np.float32)
+
+    def encode_batch(self, texts: List[str], batch_size: int = 64) -> List[Optional[np.ndarray]]:
+        """
+        Generate embeddings for many texts with one request per batch
+        
+        Uses the multi-input embed endpoint. If a batch request fails, its
+        texts are embedded one at a time so a single bad input only loses
+        its own embedding.
+        
+        Args:
+            texts: Input texts to embed
+            batch_size: Maximum number of texts sent in one request
+            
+        Returns:
+            Embeddings in input order, None for blank texts and texts that failed
+        """
+        results: List[Optional[np.ndarray]] = [None] * len(texts)
+        pending = [index for index, text in enumerate(texts) if text and text.strip()]
+
+        for start in range(0, len(pending), batch_size):
+            indexes = pending[start:start + batch_size]
+            batch = [texts[index] for index in indexes]
+            try:
+                response = ollama.embed(model=self.model_name, input=batch)
+                embeddings = response['embeddings']
+                if len(embeddings) != len(batch):
+                    raise ValueError(f"expected {len(batch)} embeddings, got {len(embeddings)}")
+                for index, embedding in zip(indexes, embeddings):
+                    results[index] = np.array(embedding, dtype=np.float32)
+            except Exception as e:
+                logger.warning(f"Batch embedding error, retrying {len(batch)} texts one by one: {str(e)}")
+                for index, text in zip(indexes, batch):
+                    try:
+                        response = ollama.embed(model=self.model_name, input=text)
+                        results[index] = np.array(response['embeddings'][0], dtype=np.float32)
+                    except Exception as item_error:
+                        logger.error(f"Embedding error for text {index}: {str(item_error)}")
+
+        return results
+
+    async def _embed_with_retry(self, client, semaphore, texts, retries: int, backoff: float):
+        """Embed texts with one request, retrying with exponential backoff; the semaphore is released while waiting"""
+        for attempt in range(retries + 1):
+            try:
+                async with semaphore:
+                    response = await client.embed(model=self.model_name, input=texts)
+                embeddings = response['embeddings']
+                if len(embeddings) != len(texts):
+                    raise ValueError(f"expected {len(texts)} embeddings, got {len(embeddings)}")
+                return embeddings
+            except Exception as e:
+                # Client errors such as a bad input will not go away by retrying
+                status = getattr(e, 'status_code', None)
+                if attempt == retries or (isinstance(e, ResponseError) and status is not None and 400 <= status < 500 and status != 429):
+                    raise
+                await asyncio.sleep(backoff * (2 ** attempt) * (1 + random.random()))
+
+    async def encode_batch_async(self, texts: List[str], batch_size: int = 64, concurrency: int = EMBED_CONCURRENCY,
+                                 retries: int = 3, backoff: float = 0.5) -> List[Optional[np.ndarray]]:
+        """
+        Generate embeddings for many texts with several batch requests in flight
+        
+        All requests share one AsyncClient, at most ``concurrency`` of them run
+        at a time, and failed requests are retried with exponential backoff.
+        A batch that still fails is embedded one text at a time, as in
+        encode_batch.
+        
+        Args:
+            texts: Input texts to embed
+            batch_size: Maximum number of texts sent in one request
+            concurrency: Maximum number of requests in flight
+            retries: Retries per request after the first attempt
+            backoff: Delay before the first retry in seconds, doubled each time
+            
+        Returns:
+            Embeddings in input order, None for blank texts and texts that failed
+        """
+        results: List[Optional[np.ndarray]] = [None] * len(texts)
+        pending = [index for index, text in enumerate(texts) if text and text.strip()]
+        client = ollama.AsyncClient()
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        async def embed_item(index):
+            try:
+                embeddings = await self._embed_with_retry(client, semaphore, [texts[index]], retries, backoff)
+                results[index] = np.array(embeddings[0], dtype=np.float32)
+            except Exception as e:
+                logger.error(f"Embedding error for text {index}: {str(e)}")
+
+        async def embed_batch(indexes):
+            try:
+                embeddings = await self._embed_with_retry(client, semaphore, [texts[index] for index in indexes], retries, backoff)
+                for index, embedding in zip(indexes, embeddings):
+                    results[index] = np.array(embedding, dtype=np.float32)
+            except Exception as e:
+                logger.warning(f"Batch embedding error, retrying {len(indexes)} texts one by one: {str(e)}")
+                await asyncio.gather(*(embed_item(index) for index in indexes))
+
+        await asyncio.gather(*(
+            embed_batch(pending[start:start + batch_size])
+            for start in range(0, len(pending), batch_size)
+        ))
+        return results
+
+    def encode_batch_concurrent(self, texts: List[str], batch_size: int = 64,
+                                concurrency: int = EMBED_CONCURRENCY) -> List[Optional[np.ndarray]]:
+        """
+        Blocking wrapper around encode_batch_async
+        
+        Runs the pipeline on a fresh event loop, or on a worker thread when
+        the caller is already inside one.
+        
+        Args:
+            texts: Input texts to embed
+            batch_size: Maximum number of texts sent in one request
+            concurrency: Maximum number of requests in flight
+            
+        Returns:
+            Embeddings in input order, None for blank texts and texts that failed
+        """
+        coroutine = self.encode_batch_async(texts, batch_size=batch_size, concurrency=concurrency)
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(coroutine)
+        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(asyncio.run, coroutine).result()
 
 class FallbackLLM:
     """Fallback LLM for when Ollama is unavailable"""
@@ -119,21 +256,135 @@ class FallbackLLM:
     async def generate_async(self, prompts: List[str], **kwargs) -> List[str]:
         return ["Our AI service is currently unavailable. Please try again later."]
 
-def get_llm(model_name: str = 'mistral') -> OllamaLLM:
+class SharedLLM:
+    """Registry handle for one model, safe to keep for the life of a session
+    
+    Each call goes to the model's OllamaLLM while the latest health check
+    passed, and to the registry's FallbackLLM otherwise, so holders follow
+    the model going down and coming back.
     """
-    Get configured Ollama LLM instance with fallback
+    
+    def __init__(self, registry: 'LLMRegistry', model_name: str):
+        self.registry = registry
+        self.model_name = model_name
+
+    @property
+    def available(self) -> bool:
+        return self.registry.is_available(self.model_name)
+
+    def current(self):
+        """The client calls are delegated to right now"""
+        return self.registry.client(self.model_name)
+
+    def generate(self, prompts: List[str], **kwargs) -> List[str]:
+        return self.current().generate(prompts, **kwargs)
+
+    async def generate_async(self, prompts: List[str], **kwargs) -> List[str]:
+        return await self.current().generate_async(prompts, **kwargs)
+
+class LLMRegistry:
+    """Process-wide Ollama LLM clients, one per model name
+    
+    The first request for a model creates its client and checks once that
+    the model is installed. After that, a daemon thread re-checks every
+    model every ``interval`` seconds, so requests never wait on
+    verification. ``get`` returns a SharedLLM handle that uses the real
+    client while the model is available and the shared FallbackLLM while
+    it is not.
+    """
+    
+    def __init__(self, interval: float = LLM_HEALTH_CHECK_SECONDS):
+        self.interval = interval
+        self.fallback = FallbackLLM()
+        self._lock = threading.Lock()
+        self._clients: Dict[str, OllamaLLM] = {}
+        self._available: Dict[str, bool] = {}
+        self._handles: Dict[str, SharedLLM] = {}
+        self._stop = threading.Event()
+        self._checker: Optional[threading.Thread] = None
+
+    def _check(self, client: OllamaLLM) -> bool:
+        try:
+            ollama.show(client.model_name)
+            return True
+        except Exception as e:
+            # A missing model raises ResponseError, an unreachable server a connection error
+            logger.debug(f"Health check of {client.model_name} failed: {str(e)}")
+            return False
+
+    def get(self, model_name: str = 'mistral') -> SharedLLM:
+        """
+        Get the shared handle of a model, checking the model on first use
+        
+        Args:
+            model_name: Name of Ollama model to use
+            
+        Returns:
+            Handle that follows the model's health
+        """
+        if model_name not in self._handles:
+            with self._lock:
+                if model_name not in self._handles:
+                    client = OllamaLLM(model_name, verify=False)
+                    self._clients[model_name] = client
+                    self._available[model_name] = self._check(client)
+                    if self._available[model_name]:
+                        logger.info(f"Successfully loaded model: {model_name}")
+                    else:
+                        logger.error(f"Failed to load LLM {model_name}, using the fallback until it is available")
+                    self._handles[model_name] = SharedLLM(self, model_name)
+                    self._start_checker()
+        return self._handles[model_name]
+
+    def is_available(self, model_name: str) -> bool:
+        """Result of the latest check of a model"""
+        return self._available.get(model_name, False)
+
+    def client(self, model_name: str):
+        """The model's OllamaLLM while it is available, else the fallback"""
+        return self._clients[model_name] if self.is_available(model_name) else self.fallback
+
+    def _start_checker(self):
+        if self._checker is None or not self._checker.is_alive():
+            self._stop.clear()
+            self._checker = threading.Thread(target=self._run_checks, name='llm-health-check', daemon=True)
+            self._checker.start()
+
+    def _run_checks(self):
+        while not self._stop.wait(self.interval):
+            self.check_all()
+
+    def check_all(self) -> Dict[str, bool]:
+        """Re-check every model now and return ``{model_name: available}``"""
+        with self._lock:
+            clients = dict(self._clients)
+        for model_name, client in clients.items():
+            available = self._check(client)
+            if available and not self._available.get(model_name):
+                logger.info(f"Model {model_name} is available again")
+            elif not available and self._available.get(model_name):
+                logger.warning(f"Model {model_name} is no longer available, using the fallback")
+            self._available[model_name] = available
+        return dict(self._available)
+
+    def stop(self):
+        """Stop the background health checks"""
+        self._stop.set()
+
+# Shared by every caller in the process
+llm_registry = LLMRegistry()
+
+def get_llm(model_name: str = 'mistral') -> SharedLLM:
+    """
+    Get the process-wide Ollama LLM handle with fallback
     
     Args:
         model_name: Name of Ollama model to use
         
     Returns:
-        Configured LLM instance
+        Shared LLM handle, switching to the fallback while the model is down
     """
-    try:
-        return OllamaLLM(model_name)
-    except RuntimeError as e:
-        logger.error(f"Failed to load LLM: {str(e)}")
-        return FallbackLLM()
+    return llm_registry.get(model_name)
 
 def get_embedding_model(model_name: str = 'nomic-embed-text') -> OllamaEmbeddingModel:
     """
@@ -0,0 +1,159 @@
+import re
+import numpy as np
+import scipy.sparse as sp
+
+# Years assumed when a candidate's experience has no number in it
+DEFAULT_YEARS = 1
+# Experience range assumed when a job does not state one
+DEFAULT_MAX_EXPERIENCE = 10
+# Candidates scored at a time by fit_score_matrix; a block holds rows x jobs float64 scores
+FIT_BLOCK_ROWS = 4096
+
+def parse_years(value):
+    """Parse years of experience such as 5, '5' or '5 years' into an int"""
+    text = str(value)
+    if text.isdigit():
+        return int(text)
+    # Extract digits from strings like "5 years"
+    digits = re.findall(r'\d+', text)
+    return int(digits[0]) if digits else DEFAULT_YEARS
+
+def parse_experience_range(value):
+    """Parse a requirement such as '3-5 years' or '5 years' into (min_years, max_years)"""
+    text = str(value)
+    # A range like "3-5"
+    if '-' in text:
+        low, high = text.split('-')[:2]
+        min_digits = re.findall(r'\d+', low)
+        max_digits = re.findall(r'\d+', high)
+        return (
+            int(min_digits[0]) if min_digits else 0,
+            int(max_digits[0]) if max_digits else DEFAULT_MAX_EXPERIENCE,
+        )
+    # A single value like "5 years", with a reasonable range above it
+    digits = re.findall(r'\d+', text)
+    if digits:
+        return int(digits[0]), int(digits[0]) + 2
+    return 0, DEFAULT_MAX_EXPERIENCE
+
+def tokenize_skills(value):
+    """Split a comma-separated skill list into a set of lower-case words"""
+    return frozenset(str(value).lower().replace(',', '').split())
+
+def _float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+class Candidate:
+    """Read-only view of a candidate row with the fields scoring needs already parsed.
+
+    ``years`` is the parsed experience and ``skill_set`` the tokenized skills;
+    the raw strings are kept for display.
+    """
+
+    __slots__ = ('id', 'name', 'current_role', 'skills', 'years_experience', 'status', 'score', 'years', 'skill_set')
+
+    def __init__(self, row):
+        self.id = row['id']
+        self.name = row.get('name', '')
+        self.current_role = row.get('current_role', '')
+        self.skills = row.get('skills', '')
+        self.years_experience = row.get('years_experience', '')
+        self.status = row.get('status', '')
+        self.score = _float(row.get('score', 0))
+        self.years = parse_years(self.years_experience)
+        self.skill_set = tokenize_skills(self.skills)
+
+    def __repr__(self):
+        return f"Candidate(id={self.id!r}, name={self.name!r})"
+
+class Job:
+    """Read-only view of a job row with parsed experience bounds and tokenized skills"""
+
+    __slots__ = ('id', 'title', 'skills_required', 'experience_required', 'min_experience', 'max_experience', 'skill_set')
+
+    def __init__(self, row):
+        self.id = row['id']
+        self.title = row.get('title', '')
+        self.skills_required = row.get('skills_required', '')
+        self.experience_required = row.get('experience_required', '')
+        self.min_experience, self.max_experience = parse_experience_range(self.experience_required)
+        self.skill_set = tokenize_skills(self.skills_required)
+
+    def __repr__(self):
+        return f"Job(id={self.id!r}, title={self.title!r})"
+
+def skill_match(candidate, job):
+    """Fraction of the job's skill words the candidate has"""
+    if not job.skill_set:
+        return 0
+    return len(job.skill_set & candidate.skill_set) / len(job.skill_set)
+
+def experience_match(candidate, job):
+    """1.0 inside the job's experience range, 0.8 above it and at most 0.5 below it"""
+    if candidate.years < job.min_experience:
+        return 0.5 * (candidate.years / job.min_experience) if job.min_experience > 0 else 0.5
+    if candidate.years > job.max_experience:
+        return 0.8  # Overqualified but still good
+    return 1.0
+
+def fit_score(candidate, job):
+    """Weighted skill (70%) and experience (30%) match, rounded to two decimals"""
+    return round(skill_match(candidate, job) * 0.7 + experience_match(candidate, job) * 0.3, 2)
+
+def _skill_matrix(skill_sets, vocabulary):
+    """Binary rows x vocabulary matrix; words outside the vocabulary are dropped"""
+    columns = [[vocabulary[word] for word in skill_set if word in vocabulary] for skill_set in skill_sets]
+    indptr = np.zeros(len(columns) + 1, dtype=np.int64)
+    indptr[1:] = np.cumsum([len(row) for row in columns])
+    indices = np.fromiter((column for row in columns for column in row), dtype=np.int32, count=int(indptr[-1]))
+    data = np.ones(len(indices), dtype=np.float64)
+    return sp.csr_matrix((data, indices, indptr), shape=(len(columns), len(vocabulary)))
+
+class JobMatrix:
+    """Jobs prepared for scoring candidates in blocks with fit_score's formula: skill matrix and experience bounds"""
+
+    def __init__(self, jobs):
+        self.ids = [str(job.id) for job in jobs]
+        vocabulary = {}
+        for job in jobs:
+            for word in job.skill_set:
+                vocabulary.setdefault(word, len(vocabulary))
+        self.vocabulary = vocabulary
+        # Transposed once so each block is a single sparse product
+        self.skills_t = _skill_matrix([job.skill_set for job in jobs], vocabulary).T.tocsc()
+        self.skill_counts = np.array([len(job.skill_set) for job in jobs], dtype=np.float64)
+        self.min_experience = np.array([job.min_experience for job in jobs], dtype=np.float64)
+        self.max_experience = np.array([job.max_experience for job in jobs], dtype=np.float64)
+
+    def scores(self, skill_sets, years):
+        """candidates x jobs fit scores, equal to ``records.fit_score`` for every pair"""
+        overlap = (_skill_matrix(skill_sets, self.vocabulary) @ self.skills_t).toarray()
+        with np.errstate(divide='ignore', invalid='ignore'):
+            skill = np.where(self.skill_counts > 0, overlap / self.skill_counts, 0.0)
+            years = np.asarray(years, dtype=np.float64)[:, None]
+            below = np.where(self.min_experience > 0, 0.5 * (years / self.min_experience), 0.5)
+        experience = np.where(years < self.min_experience, below, np.where(years > self.max_experience, 0.8, 1.0))
+        raw = (skill * 0.7 + experience * 0.3).ravel()
+        scores = np.round(raw, 2)
+        # np.round scales by 100 first, which can tip a value next to a half the other
+        # way; round those with Python's round, as fit_score does
+        scaled = raw * 100
+        near_half = np.flatnonzero(np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6)
+        if len(near_half):
+            values, inverse = np.unique(raw[near_half], return_inverse=True)
+            scores[near_half] = np.array([round(value, 2) for value in values.tolist()])[inverse]
+        return scores.reshape(overlap.shape)
+
+def fit_score_matrix(candidates, jobs, block_rows=FIT_BLOCK_ROWS):
+    """candidates x jobs float32 matrix of ``fit_score``, computed a block of candidates at a time"""
+    matrix = JobMatrix(jobs)
+    scores = np.empty((len(candidates), len(jobs)), dtype=np.float32)
+    for start in range(0, len(candidates), block_rows):
+        block = candidates[start:start + block_rows]
+        scores[start:start + len(block)] = matrix.scores(
+            [candidate.skill_set for candidate in block], [candidate.years for candidate in block]
+        )
+    return scores
@@ -0,0 +1,146 @@
+import threading
+import scipy.sparse as sp
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+# Refit the vocabulary and IDF once this share of the fitted corpus has changed
+REFIT_RATIO = 0.25
+
+def resume_text(candidate):
+    """Text of a candidate compared against job requirements"""
+    return str(candidate.get('resume_summary', ''))
+
+def requirements_text(job):
+    """Text of a job compared against resumes"""
+    return str(job.get('requirements', ''))
+
+class ResumeTfidfModel:
+    """TF-IDF vectorizer fitted on the whole candidate and job corpus, plus the candidate matrix.
+
+    Every candidate's resume is kept as an L2-normalized row of one sparse
+    matrix, so cosine similarity with a job is a dot product and scoring a
+    job against all candidates is a single sparse matrix-vector product.
+    Changed candidates are transformed with the fitted vocabulary and
+    appended; their old row (and rows of deleted candidates) is masked out.
+    Once ``REFIT_RATIO`` of the corpus has changed, ``needs_refit`` tells
+    the owner to call ``fit`` again so the IDF weights stay representative.
+    """
+
+    def __init__(self):
+        self.vectorizer = None
+        self.matrix = None
+        self.row_ids = []      # row -> candidate id, None for dead rows
+        self.rows = {}         # candidate id -> row
+        self.texts = {}        # candidate id -> text of its row
+        self._pending = []     # (candidate id, row vector) not yet stacked into the matrix
+        self.fitted_size = 0
+        self.changes = 0
+        self._lock = threading.RLock()
+
+    def fit(self, candidates, jobs):
+        """Fit the vocabulary on all resumes and job requirements and vectorize every candidate"""
+        with self._lock:
+            texts = {str(candidate['id']): resume_text(candidate) for candidate in candidates}
+            self.vectorizer = TfidfVectorizer()
+            corpus = list(texts.values()) + [requirements_text(job) for job in jobs]
+            try:
+                self.vectorizer.fit(corpus)
+            except ValueError:
+                # Nothing but stop words or blanks to learn from
+                self.vectorizer = None
+            self.texts = {}
+            self.rows = {}
+            self.row_ids = []
+            self._pending = []
+            self.matrix = None
+            self.fitted_size = len(corpus)
+            self.changes = 0
+            if self.vectorizer is not None:
+                self.matrix = self.vectorizer.transform(list(texts.values())).tocsr()
+                self.row_ids = list(texts)
+                self.rows = {candidate_id: row for row, candidate_id in enumerate(self.row_ids)}
+                self.texts = texts
+
+    @property
+    def fitted(self):
+        return self.vectorizer is not None
+
+    def needs_refit(self):
+        return self.changes > REFIT_RATIO * max(1, self.fitted_size)
+
+    def transform(self, texts):
+        """L2-normalized TF-IDF rows for texts, using the fitted vocabulary"""
+        return self.vectorizer.transform(texts)
+
+    def update(self, candidates=(), removed_ids=(), job_changes=0):
+        """Re-vectorize changed candidates, drop removed ones and count job edits toward a refit"""
+        with self._lock:
+            self.changes += job_changes
+            for candidate_id in removed_ids:
+                if str(candidate_id) in self.texts:
+                    self._drop(str(candidate_id))
+                    self.changes += 1
+
+            changed = []
+            for candidate in candidates:
+                candidate_id = str(candidate['id'])
+                text = resume_text(candidate)
+                if self.texts.get(candidate_id) != text:
+                    changed.append((candidate_id, text))
+            if not changed or not self.fitted:
+                return
+
+            vectors = self.transform([text for _, text in changed])
+            for position, (candidate_id, text) in enumerate(changed):
+                self._drop(candidate_id)
+                self._pending.append((candidate_id, vectors[position]))
+                self.texts[candidate_id] = text
+                self.changes += 1
+
+    def _drop(self, candidate_id):
+        row = self.rows.pop(candidate_id, None)
+        self.texts.pop(candidate_id, None)
+        if row is not None:
+            self.row_ids[row] = None
+        self._pending = [(pending_id, vector) for pending_id, vector in self._pending if pending_id != candidate_id]
+
+    def _stack_pending(self):
+        if not self._pending:
+            return
+        start = len(self.row_ids)
+        self.matrix = sp.vstack([self.matrix] + [vector for _, vector in self._pending], format='csr')
+        for offset, (candidate_id, _) in enumerate(self._pending):
+            self.row_ids.append(candidate_id)
+            self.rows[candidate_id] = start + offset
+        self._pending = []
+
+    def candidate_vector(self, candidate):
+        """Cached row of a candidate, or a fresh transform when the cached text is stale"""
+        candidate_id = str(candidate['id'])
+        text = resume_text(candidate)
+        with self._lock:
+            if self.texts.get(candidate_id) == text:
+                self._stack_pending()
+                row = self.rows.get(candidate_id)
+                if row is not None:
+                    return self.matrix[row]
+        return self.transform([text])
+
+    def similarity(self, candidate, job):
+        """Cosine similarity of a candidate's resume and a job's requirements"""
+        if not self.fitted:
+            return 0.0
+        job_vector = self.transform([requirements_text(job)])
+        return float(self.candidate_vector(candidate).multiply(job_vector).sum())
+
+    def score_all(self, job):
+        """Return ``{candidate_id: similarity}`` for every vectorized candidate"""
+        with self._lock:
+            if not self.fitted or self.matrix is None:
+                return {}
+            self._stack_pending()
+            scores = (self.matrix @ self.transform([requirements_text(job)]).T).toarray().ravel()
+            return {
+                candidate_id: float(score)
+                for candidate_id, score in zip(self.row_ids, scores)
+                if candidate_id is not None
+            }
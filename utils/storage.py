@@ -0,0 +1,758 @@
+import os
+import csv
+import json
+import sqlite3
+import threading
+from contextlib import contextmanager
+import pandas as pd
+from filelock import FileLock
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+# Column layout of each table, in CSV header order
+TABLE_COLUMNS = {
+    'candidates': [
+        'id', 'name', 'email', 'phone', 'location', 'current_role', 'years_experience',
+        'skills', 'education', 'last_company', 'resume_summary', 'status', 'matched_jobs', 'score'
+    ],
+    'jobs': [
+        'id', 'title', 'department', 'location', 'type', 'description', 'requirements',
+        'responsibilities', 'skills_required', 'experience_required', 'education_required',
+        'salary_range', 'status'
+    ],
+}
+
+# Columns read as text even when every value looks like a number: id lists such as '2' or '1, 3'
+TEXT_COLUMNS = {'matched_jobs': str}
+
+# Columns of the candidate<->job match relation, keyed by (candidate_id, job_id)
+MATCH_COLUMNS = ['candidate_id', 'job_id', 'score', 'matched_at']
+
+# Seconds to wait for another process's file lock before giving up
+LOCK_TIMEOUT = 60
+
+# SQLite column types; anything not listed is stored as TEXT
+SQLITE_COLUMN_TYPES = {
+    'id': 'INTEGER PRIMARY KEY',
+    'years_experience': 'NUMERIC',
+    'score': 'REAL',
+}
+
+# Secondary indexes created on each SQLite table
+SQLITE_INDEXES = {
+    'candidates': ['status', 'email'],
+    'jobs': ['status'],
+}
+
+def _quote(identifier):
+    """Quote a column or table name for use in SQL"""
+    return '"' + str(identifier).replace('"', '""') + '"'
+
+def _json_default(value):
+    """Convert numpy scalars and other non-JSON values when writing delta entries"""
+    if hasattr(value, 'item'):
+        return value.item()
+    return str(value)
+
+def _file_version(path):
+    """Return (mtime_ns, size) of a file, or None if it does not exist"""
+    try:
+        stat = os.stat(path)
+        return (stat.st_mtime_ns, stat.st_size)
+    except FileNotFoundError:
+        return None
+
+def _replace_file(path, write):
+    """Write a file atomically: ``write(tmp_path)`` fills a temporary file that is then renamed over ``path``"""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        write(tmp_path)
+        with open(tmp_path, 'rb') as f:
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+def _dataframe_to_arrow(df):
+    try:
+        return pa.Table.from_pandas(df, preserve_index=False)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        # Numbers with blanks become nullable floats, as read_csv would parse them;
+        # columns mixing numbers and text (e.g. "5 years") are stored as strings
+        df = df.copy()
+        for column in df.columns:
+            if column in TEXT_COLUMNS:
+                df[column] = df[column].astype('string')
+            elif df[column].dtype == object:
+                values = df[column].replace('', None)
+                numeric = pd.to_numeric(values, errors='coerce')
+                if numeric.notna().sum() == values.notna().sum():
+                    df[column] = numeric
+                else:
+                    df[column] = df[column].astype('string')
+        return pa.Table.from_pandas(df, preserve_index=False)
+
+def write_snapshot(rows, path, metadata=None):
+    """Write rows (records or a DataFrame) to a columnar snapshot file.
+
+    ``.parquet`` files are written as Parquet, anything else as an
+    uncompressed Arrow IPC file, which can be memory-mapped without copying.
+    """
+    if pa is None:
+        raise RuntimeError("pyarrow is required for snapshot files")
+
+    df = rows if isinstance(rows, pd.DataFrame) else pd.DataFrame(list(rows))
+    table = _dataframe_to_arrow(df)
+    if metadata is not None:
+        table = table.replace_schema_metadata({b'talent': json.dumps(metadata).encode('utf-8')})
+
+    directory = os.path.dirname(path)
+    if directory and not os.path.exists(directory):
+        os.makedirs(directory)
+
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    if path.endswith('.parquet'):
+        pq.write_table(table, tmp_path)
+    else:
+        with pa.OSFile(tmp_path, 'wb') as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+    os.replace(tmp_path, path)
+
+def read_snapshot(path, columns=None):
+    """Memory-map a snapshot file and return it as an Arrow table, optionally projected"""
+    if pa is None:
+        raise RuntimeError("pyarrow is required for snapshot files")
+
+    if path.endswith('.parquet'):
+        if columns is not None:
+            available = pq.read_schema(path).names
+            columns = [c for c in columns if c in available]
+        return pq.read_table(path, columns=columns, memory_map=True)
+
+    table = pa.ipc.open_file(pa.memory_map(path, 'r')).read_all()
+    if columns is not None:
+        table = table.select([c for c in columns if c in table.schema.names])
+    return table
+
+def snapshot_metadata(path):
+    """Return the metadata stored with a snapshot file, without reading its data"""
+    if path.endswith('.parquet'):
+        schema = pq.read_schema(path)
+    else:
+        schema = pa.ipc.open_file(pa.memory_map(path, 'r')).schema
+    raw = (schema.metadata or {}).get(b'talent')
+    return json.loads(raw) if raw else {}
+
+def snapshot_to_records(table):
+    """Convert an Arrow table to a list of dictionaries, with '' for missing values"""
+    return table.to_pandas().fillna('').to_dict('records')
+
+class CsvBackend:
+    """Stores every table as a CSV file plus an append-only delta log.
+
+    Field updates are appended to ``<table>.delta.jsonl`` next to the CSV
+    instead of rewriting it, and replayed on read. Once the log holds
+    ``compact_threshold`` entries a background thread folds it into the CSV.
+    Replaying an entry twice is harmless, so a crash between rewriting the CSV
+    and truncating the log loses nothing. Inserts are appended to the CSV when
+    the new rows fit the existing header.
+
+    With a ``snapshot_dir`` (and pyarrow installed) each CSV is mirrored to an
+    Arrow file tagged with the CSV's mtime and size. Reads memory-map that file
+    instead of parsing the CSV while the tag still matches, and column
+    projections only touch the requested columns.
+
+    Every read and write of a table holds ``<table>.lock`` next to its CSV,
+    so sessions in other processes see either the state before or after a
+    write. Whole-file rewrites go to a temporary file that is renamed into
+    place, and full-table replacements are merged row by row into the current
+    file rather than overwriting rows other writers changed meanwhile.
+    Writes return the table version before and after, taken under the lock.
+    """
+
+    name = 'csv'
+
+    def __init__(self, files, compact_threshold=500, snapshot_dir=None):
+        self.files = dict(files)
+        self.compact_threshold = compact_threshold
+        self.snapshot_dir = snapshot_dir if pa is not None else None
+        self._lock = threading.RLock()
+        self._delta_counts = {}
+        self._compacting = set()
+        self._file_locks = {
+            table: FileLock(os.path.splitext(path)[0] + '.lock', timeout=LOCK_TIMEOUT)
+            for table, path in self.files.items()
+        }
+
+    @contextmanager
+    def locked(self, table):
+        """Hold the table's lock against other threads and other processes"""
+        with self._lock, self._file_locks[table]:
+            yield
+
+    def version(self, table):
+        """Return a token that changes whenever the table's files change"""
+        return (_file_version(self.files[table]), _file_version(self.delta_file(table)))
+
+    def snapshot_file(self, table):
+        """Path of the Arrow snapshot mirroring a table, or None when snapshots are off"""
+        if not self.snapshot_dir:
+            return None
+        return os.path.join(self.snapshot_dir, f"{table}.arrow")
+
+    def _fresh_snapshot(self, table):
+        """Return the snapshot path if it mirrors the current CSV file"""
+        path = self.snapshot_file(table)
+        if not path or not os.path.exists(path):
+            return None
+        try:
+            source_version = snapshot_metadata(path).get('source_version')
+        except Exception:
+            return None
+        current = _file_version(self.files[table])
+        return path if current is not None and source_version == list(current) else None
+
+    def _write_snapshot(self, table, df):
+        path = self.snapshot_file(table)
+        if not path:
+            return
+        try:
+            write_snapshot(df, path, {'source_version': list(_file_version(self.files[table]))})
+        except Exception as e:
+            print(f"Error writing snapshot for {table}: {e}")
+
+    def _read_base(self, table, columns=None):
+        """Load the table without its delta log, from the snapshot when it is current"""
+        snapshot = self._fresh_snapshot(table)
+        if snapshot:
+            df = read_snapshot(snapshot, columns).to_pandas()
+        elif columns is not None:
+            df = pd.read_csv(self.files[table], usecols=lambda c: c in columns, dtype=TEXT_COLUMNS)
+        else:
+            df = pd.read_csv(self.files[table], dtype=TEXT_COLUMNS)
+            self._write_snapshot(table, df)
+        return df.fillna('').to_dict('records'), list(df.columns)
+
+    def sequence_file(self, table):
+        """Path of the file holding the last id handed out for a table"""
+        return os.path.splitext(self.files[table])[0] + '.seq'
+
+    def allocate_ids(self, table, count, floor=0):
+        """Reserve ``count`` consecutive ids above both the stored sequence and ``floor``.
+
+        Returns the first reserved id. The sequence file is created from the
+        table's highest id on first use.
+        """
+        path = self.sequence_file(table)
+        with self.locked(table):
+            if os.path.exists(path):
+                with open(path, encoding='utf-8') as f:
+                    last_id = int(f.read().strip() or 0)
+            else:
+                ids = [record['id'] for record in self.read(table, columns=['id'])]
+                last_id = max((int(record_id) for record_id in ids), default=0)
+
+            first_id = max(last_id, floor) + 1
+
+            def write(tmp_path):
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    f.write(str(first_id + count - 1))
+            _replace_file(path, write)
+        return first_id
+
+    def delta_file(self, table):
+        """Path of the delta log belonging to a table"""
+        return os.path.splitext(self.files[table])[0] + '.delta.jsonl'
+
+    def _read_delta(self, table):
+        path = self.delta_file(table)
+        if not os.path.exists(path):
+            return []
+        entries = []
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entries.append(json.loads(line))
+                except ValueError:
+                    # A torn last line from an interrupted append
+                    continue
+        return entries
+
+    def read(self, table, columns=None):
+        """Return every row of a table as a list of dictionaries.
+
+        ``columns`` restricts the result to those fields (``id`` is always
+        read so the delta log can be applied).
+        """
+        if columns is not None:
+            columns = ['id'] + [c for c in columns if c != 'id']
+
+        with self.locked(table):
+            records, present = self._read_base(table, columns)
+            entries = self._read_delta(table)
+            if columns is None:
+                self._delta_counts[table] = len(entries)
+
+        if entries:
+            by_id = {str(record['id']): record for record in records}
+            for entry in entries:
+                record = by_id.get(str(entry['id']))
+                if record is None:
+                    continue
+                fields = entry['fields']
+                if columns is not None:
+                    fields = {key: value for key, value in fields.items() if key in columns}
+                for key in fields:
+                    if key not in present:
+                        present.append(key)
+                record.update(fields)
+            for record in records:
+                for column in present:
+                    record.setdefault(column, '')
+        return records
+
+    def write_all(self, table, records):
+        """Replace the content of a table and drop its delta log"""
+        with self.locked(table):
+            df = pd.DataFrame(records)
+            _replace_file(self.files[table], lambda tmp_path: df.to_csv(tmp_path, index=False))
+            self._write_snapshot(table, df)
+            delta = self.delta_file(table)
+            if os.path.exists(delta):
+                os.remove(delta)
+            self._delta_counts[table] = 0
+
+    def compact(self, table):
+        """Fold the delta log of a table back into its CSV file"""
+        with self.locked(table):
+            if os.path.exists(self.delta_file(table)):
+                self.write_all(table, self.read(table))
+
+    def _compact_in_background(self, table):
+        with self._lock:
+            if table in self._compacting:
+                return
+            self._compacting.add(table)
+
+        def run():
+            try:
+                self.compact(table)
+            except Exception as e:
+                print(f"Error compacting {table}: {e}")
+            finally:
+                with self._lock:
+                    self._compacting.discard(table)
+
+        threading.Thread(target=run, name=f"compact-{table}", daemon=True).start()
+
+    def apply_changes(self, table, records, changed, removed_ids):
+        """Merge changed and removed rows into the current file and rewrite it.
+
+        Rows that were not changed keep whatever is on disk now, so changes
+        other writers made to them since ``records`` was read survive.
+        """
+        with self.locked(table):
+            changed_by_id = {str(record['id']): record for record in changed}
+            removed = {str(record_id) for record_id in removed_ids}
+            merged = [
+                changed_by_id.pop(str(record['id']), record)
+                for record in self.read(table) if str(record['id']) not in removed
+            ]
+            merged.extend(changed_by_id.values())
+            self.write_all(table, merged)
+
+    def insert(self, table, records):
+        """Append new rows, rewriting the file only if they bring new columns"""
+        path = self.files[table]
+        with self.locked(table):
+            before = self.version(table)
+            with open(path, newline='', encoding='utf-8') as f:
+                header = next(csv.reader(f), [])
+
+            if not header or any(key not in header for record in records for key in record):
+                self.write_all(table, self.read(table) + list(records))
+            else:
+                with open(path, 'a', newline='', encoding='utf-8') as f:
+                    writer = csv.DictWriter(f, fieldnames=header, lineterminator='\n')
+                    writer.writerows(records)
+                    f.flush()
+                    os.fsync(f.fileno())
+            return before, self.version(table)
+
+    def update(self, table, changes):
+        """Append ``{id: {field: value}}`` updates to the delta log"""
+        lines = [
+            json.dumps({'id': record_id, 'fields': fields}, default=_json_default) + '\n'
+            for record_id, fields in changes.items() if fields
+        ]
+        with self.locked(table):
+            before = self.version(table)
+            if not lines:
+                return before, before
+
+            with open(self.delta_file(table), 'a', encoding='utf-8') as f:
+                f.writelines(lines)
+                f.flush()
+                os.fsync(f.fileno())
+            after = self.version(table)
+            self._delta_counts[table] = self._delta_counts.get(table, 0) + len(lines)
+            needs_compaction = self._delta_counts[table] >= self.compact_threshold
+
+        if needs_compaction:
+            self._compact_in_background(table)
+        return before, after
+
+    def read_matches(self):
+        """Return every match row, or None if the match file was never created.
+
+        The file is append-only; the last row for a (candidate_id, job_id)
+        pair wins and rows with an empty score are deletions.
+        """
+        path = self.files['matches']
+        with self.locked('matches'):
+            if not os.path.exists(path):
+                return None
+            df = pd.read_csv(path, dtype={'candidate_id': str, 'job_id': str, 'matched_at': str})
+
+        matches = {}
+        for row in df.to_dict('records'):
+            key = (row['candidate_id'], row['job_id'])
+            if pd.isna(row['score']):
+                matches.pop(key, None)
+            else:
+                matches[key] = {
+                    'candidate_id': row['candidate_id'],
+                    'job_id': row['job_id'],
+                    'score': float(row['score']),
+                    'matched_at': '' if pd.isna(row['matched_at']) else row['matched_at'],
+                }
+        self._delta_counts['matches'] = len(df) - len(matches)
+        return list(matches.values())
+
+    def _append_matches(self, rows):
+        path = self.files['matches']
+        with self.locked('matches'):
+            before = self.version('matches')
+            new_file = not os.path.exists(path)
+            with open(path, 'a', newline='', encoding='utf-8') as f:
+                writer = csv.DictWriter(f, fieldnames=MATCH_COLUMNS, lineterminator='\n')
+                if new_file:
+                    writer.writeheader()
+                writer.writerows(rows)
+                f.flush()
+                os.fsync(f.fileno())
+
+            # Superseded and deleted rows pile up; rewrite once there are enough
+            self._delta_counts['matches'] = self._delta_counts.get('matches', 0) + len(rows)
+            if self._delta_counts['matches'] >= self.compact_threshold:
+                self.write_matches(self.read_matches() or [])
+            return before, self.version('matches')
+
+    def write_matches(self, rows):
+        """Replace the whole match relation"""
+        df = pd.DataFrame(list(rows), columns=MATCH_COLUMNS)
+        with self.locked('matches'):
+            _replace_file(self.files['matches'], lambda tmp_path: df.to_csv(tmp_path, index=False))
+            self._delta_counts['matches'] = 0
+
+    def upsert_matches(self, rows):
+        """Insert or update match rows"""
+        if rows:
+            return self._append_matches([{column: row.get(column, '') for column in MATCH_COLUMNS} for row in rows])
+
+    def delete_matches(self, pairs):
+        """Delete matches given as (candidate_id, job_id) pairs"""
+        if pairs:
+            return self._append_matches([
+                {'candidate_id': candidate_id, 'job_id': job_id, 'score': '', 'matched_at': ''}
+                for candidate_id, job_id in pairs
+            ])
+
+    def write_match_results(self, changes, rows):
+        """Apply candidate ``{id: {field: value}}`` updates and upsert match rows under both table locks.
+
+        Other sessions wait on the locks, so they see either none or all of
+        the write. The two files still cannot be replaced atomically together:
+        a crash after the match rows are appended but before the candidate
+        delta leaves the scores as they were, which rerunning the batch
+        repairs. Returns ``{'candidates': (before, after), 'matches': (before,
+        after)}``.
+        """
+        with self.locked('candidates'), self.locked('matches'):
+            before = self.version('matches')
+            matches = self.upsert_matches(rows) or (before, before)
+            return {'candidates': self.update('candidates', changes), 'matches': matches}
+
+class SqliteBackend:
+    """Stores every table in one SQLite database running in WAL mode.
+
+    Each thread gets its own connection. Updates and inserts touch only the
+    affected rows, and readers are never blocked by a writer. SQLite
+    serializes writers itself; writes return the table's change counter
+    before and after, read inside the write transaction.
+    """
+
+    name = 'sqlite'
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        self._schema_lock = threading.Lock()
+        self._schema_ready = False
+
+    def _connect(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            directory = os.path.dirname(self.path)
+            if directory and not os.path.exists(directory):
+                os.makedirs(directory)
+
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.row_factory = sqlite3.Row
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+
+            with self._schema_lock:
+                if not self._schema_ready:
+                    self._create_schema(conn)
+                    self._schema_ready = True
+        return conn
+
+    def _create_schema(self, conn):
+        """Create the tables and indexes if they do not exist yet"""
+        with conn:
+            # Change counter per table, bumped inside every write transaction
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS _meta (name TEXT PRIMARY KEY, version INTEGER NOT NULL DEFAULT 0)"
+            )
+            # Last id handed out per table
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS _sequences (name TEXT PRIMARY KEY, last_id INTEGER NOT NULL)"
+            )
+            for table, columns in TABLE_COLUMNS.items():
+                column_defs = ', '.join(
+                    f"{_quote(column)} {SQLITE_COLUMN_TYPES.get(column, 'TEXT')}" for column in columns
+                )
+                conn.execute(f"CREATE TABLE IF NOT EXISTS {_quote(table)} ({column_defs})")
+                for column in SQLITE_INDEXES.get(table, []):
+                    conn.execute(
+                        f"CREATE INDEX IF NOT EXISTS {_quote(f'idx_{table}_{column}')} "
+                        f"ON {_quote(table)} ({_quote(column)})"
+                    )
+
+            # The primary key serves candidate -> jobs, the extra index job -> candidates
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS matches ("
+                "candidate_id INTEGER NOT NULL, job_id INTEGER NOT NULL, score REAL, matched_at TEXT, "
+                "PRIMARY KEY (candidate_id, job_id))"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_matches_job_id ON matches (job_id, candidate_id)")
+
+    def _columns(self, conn, table):
+        return [row['name'] for row in conn.execute(f"PRAGMA table_info({_quote(table)})")]
+
+    def _ensure_columns(self, conn, table, records):
+        """Add any column present in ``records`` but missing from the table"""
+        existing = self._columns(conn, table)
+        for record in records:
+            for key in record:
+                if key not in existing:
+                    conn.execute(f"ALTER TABLE {_quote(table)} ADD COLUMN {_quote(key)} TEXT")
+                    existing.append(key)
+        return existing
+
+    def _bump_version(self, conn, table):
+        """Increment the table's change counter; returns (old, new)"""
+        conn.execute(
+            "INSERT INTO _meta (name, version) VALUES (?, 1) "
+            "ON CONFLICT(name) DO UPDATE SET version = version + 1",
+            (table,)
+        )
+        # The transaction now holds the write lock, so nobody else moved the counter
+        version = conn.execute("SELECT version FROM _meta WHERE name = ?", (table,)).fetchone()[0]
+        return version - 1, version
+
+    def allocate_ids(self, table, count, floor=0):
+        """Reserve ``count`` consecutive ids above both the stored sequence and ``floor``"""
+        conn = self._connect()
+        # IMMEDIATE takes the write lock up front so two processes cannot read the same value
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            row = conn.execute("SELECT last_id FROM _sequences WHERE name = ?", (table,)).fetchone()
+            if row:
+                last_id = row['last_id']
+            else:
+                last_id = conn.execute(f"SELECT COALESCE(MAX(id), 0) FROM {_quote(table)}").fetchone()[0]
+
+            first_id = max(last_id, floor) + 1
+            conn.execute(
+                "INSERT INTO _sequences (name, last_id) VALUES (?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET last_id = excluded.last_id",
+                (table, first_id + count - 1)
+            )
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        return first_id
+
+    def version(self, table):
+        """Return the table's change counter"""
+        conn = self._connect()
+        row = conn.execute("SELECT version FROM _meta WHERE name = ?", (table,)).fetchone()
+        return row['version'] if row else 0
+
+    def _upsert(self, conn, table, records):
+        columns = self._ensure_columns(conn, table, records)
+        column_list = ', '.join(_quote(c) for c in columns)
+        placeholders = ', '.join('?' for _ in columns)
+        assignments = ', '.join(f"{_quote(c)} = excluded.{_quote(c)}" for c in columns if c != 'id')
+        conn.executemany(
+            f"INSERT INTO {_quote(table)} ({column_list}) VALUES ({placeholders}) "
+            f"ON CONFLICT(id) DO UPDATE SET {assignments}",
+            [tuple(record.get(c) for c in columns) for record in records]
+        )
+
+    def read(self, table, columns=None):
+        """Return every row of a table as a list of dictionaries, optionally only some columns"""
+        conn = self._connect()
+        if columns is None:
+            selected = '*'
+        else:
+            existing = self._columns(conn, table)
+            selected = ', '.join(_quote(c) for c in columns if c in existing)
+        rows = conn.execute(f"SELECT {selected} FROM {_quote(table)} ORDER BY id")
+        return [{key: ('' if row[key] is None else row[key]) for key in row.keys()} for row in rows]
+
+    def write_all(self, table, records):
+        """Replace the content of a table in a single transaction"""
+        conn = self._connect()
+        with conn:
+            conn.execute(f"DELETE FROM {_quote(table)}")
+            if records:
+                self._upsert(conn, table, records)
+            self._bump_version(conn, table)
+
+    def apply_changes(self, table, records, changed, removed_ids):
+        """Write only the rows that changed and delete the removed ones"""
+        conn = self._connect()
+        with conn:
+            if changed:
+                self._upsert(conn, table, changed)
+            if removed_ids:
+                conn.executemany(
+                    f"DELETE FROM {_quote(table)} WHERE id = ?",
+                    [(record_id,) for record_id in removed_ids]
+                )
+            self._bump_version(conn, table)
+
+    def insert(self, table, records):
+        """Insert new rows"""
+        conn = self._connect()
+        with conn:
+            columns = self._ensure_columns(conn, table, records)
+            column_list = ', '.join(_quote(c) for c in columns)
+            placeholders = ', '.join('?' for _ in columns)
+            conn.executemany(
+                f"INSERT INTO {_quote(table)} ({column_list}) VALUES ({placeholders})",
+                [tuple(record.get(c) for c in columns) for record in records]
+            )
+            return self._bump_version(conn, table)
+
+    def _update(self, conn, table, changes):
+        self._ensure_columns(conn, table, changes.values())
+        for record_id, fields in changes.items():
+            if not fields:
+                continue
+            assignments = ', '.join(f"{_quote(c)} = ?" for c in fields)
+            conn.execute(
+                f"UPDATE {_quote(table)} SET {assignments} WHERE id = ?",
+                list(fields.values()) + [record_id]
+            )
+
+    def update(self, table, changes):
+        """Apply ``{id: {field: value}}`` updates with one UPDATE per row"""
+        conn = self._connect()
+        with conn:
+            self._update(conn, table, changes)
+            return self._bump_version(conn, table)
+
+    def count(self, table):
+        """Return the number of rows in a table"""
+        conn = self._connect()
+        return conn.execute(f"SELECT COUNT(*) FROM {_quote(table)}").fetchone()[0]
+
+    def read_matches(self):
+        """Return every match row, or None if the relation was never initialised"""
+        conn = self._connect()
+        if conn.execute("SELECT 1 FROM _meta WHERE name = 'matches'").fetchone() is None:
+            return None
+        rows = conn.execute("SELECT candidate_id, job_id, score, matched_at FROM matches ORDER BY rowid")
+        return [
+            {
+                'candidate_id': str(row['candidate_id']),
+                'job_id': str(row['job_id']),
+                'score': row['score'],
+                'matched_at': row['matched_at'] or '',
+            }
+            for row in rows
+        ]
+
+    def write_matches(self, rows):
+        """Replace the whole match relation"""
+        conn = self._connect()
+        with conn:
+            conn.execute("DELETE FROM matches")
+            self._upsert_matches(conn, rows)
+            self._bump_version(conn, 'matches')
+
+    def _upsert_matches(self, conn, rows):
+        conn.executemany(
+            "INSERT INTO matches (candidate_id, job_id, score, matched_at) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT(candidate_id, job_id) DO UPDATE SET score = excluded.score, matched_at = excluded.matched_at",
+            [(row['candidate_id'], row['job_id'], row.get('score'), row.get('matched_at', '')) for row in rows]
+        )
+
+    def upsert_matches(self, rows):
+        """Insert or update match rows"""
+        if not rows:
+            return
+        conn = self._connect()
+        with conn:
+            self._upsert_matches(conn, rows)
+            return self._bump_version(conn, 'matches')
+
+    def write_match_results(self, changes, rows):
+        """Apply candidate ``{id: {field: value}}`` updates and upsert match rows in one transaction.
+
+        Returns ``{'candidates': (before, after), 'matches': (before, after)}``.
+        """
+        conn = self._connect()
+        with conn:
+            self._update(conn, 'candidates', changes)
+            self._upsert_matches(conn, rows)
+            return {
+                'candidates': self._bump_version(conn, 'candidates'),
+                'matches': self._bump_version(conn, 'matches'),
+            }
+
+    def delete_matches(self, pairs):
+        """Delete matches given as (candidate_id, job_id) pairs"""
+        if not pairs:
+            return
+        conn = self._connect()
+        with conn:
+            conn.executemany("DELETE FROM matches WHERE candidate_id = ? AND job_id = ?", list(pairs))
+            return self._bump_version(conn, 'matches')